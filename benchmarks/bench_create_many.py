@@ -0,0 +1,42 @@
+"""
+Сравнение BaseCRUDService.create в цикле с BaseCRUDService.create_many.
+
+Запуск: python -m benchmarks.bench_create_many --rows 50000 --url sqlite:///bench.db
+"""
+import argparse
+
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from .common import make_service, users_rows, timer, print_results
+
+
+def run(url: str, rows: int, batch_size: int) -> dict:
+    results = {}
+
+    service = make_service(url)
+    with timer(results, "create (цикл)"):
+        with service.session_scope() as session:
+            crud = BaseCRUDService(session, Users)
+            for row in users_rows(rows):
+                crud.create(**row)
+
+    service = make_service(url)
+    with timer(results, f"create_many ({batch_size})"):
+        with service.session_scope() as session:
+            BaseCRUDService(session, Users).create_many(users_rows(rows), batch_size=batch_size)
+
+    service = make_service(url)
+    with timer(results, f"create_many ({batch_size}, ids)"):
+        with service.session_scope() as session:
+            BaseCRUDService(session, Users).create_many(users_rows(rows), batch_size=batch_size, return_ids=True)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="sqlite:///:memory:")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    print_results(run(args.url, args.rows, args.batch_size), args.rows)
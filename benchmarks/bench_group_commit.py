@@ -0,0 +1,68 @@
+"""
+Создание напоминаний из --threads потоков, по одному на «запрос»: отдельный session_scope и commit
+на каждое напоминание против GroupCommitWriter, собирающего записи в общие транзакции.
+
+Замер выполняется на файловой SQLite, где каждый commit — fsync. Для варианта с session_scope число потоков
+не должно превышать размер пула соединений движка (по умолчанию 5 + 10).
+
+Запуск: python -m benchmarks.bench_group_commit --threads 16 --writes 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.data_base.group_commit import GroupCommitWriter
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.service_model.reminders_service import RemindersService
+from .common import make_service, users_rows
+
+EVENT_DATE = datetime(2025, 1, 1, 12, 0)
+
+
+def create_reminder(i):
+    return lambda session: RemindersService(session).create(
+        user_id=1, task_description=f"Задача {i}", event_date=EVENT_DATE, remind_before=15)
+
+
+def run(write, threads: int, writes: int) -> float:
+    """Выполняет writes записей из threads потоков и возвращает время в секундах."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda i: write(create_reminder(i)), range(writes)))
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--max-batch", type=int, default=100)
+    parser.add_argument("--max-delay", type=float, default=0.005)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        for name in ("session_scope на запрос", "GroupCommitWriter"):
+            service = make_service(f"sqlite:///{os.path.join(directory, f'{len(results)}.db')}")
+            with service.session_scope() as session:
+                BaseCRUDService(session, Users).create_many(users_rows(1))
+
+            if name == "GroupCommitWriter":
+                with GroupCommitWriter(service, args.max_batch, args.max_delay) as writer:
+                    elapsed = run(writer.write, args.threads, args.writes)
+                commits = writer.stats()["batches"]
+            else:
+                def write(operation):
+                    with service.session_scope() as session:
+                        operation(session)
+                elapsed = run(write, args.threads, args.writes)
+                commits = args.writes
+            results[name] = (elapsed, commits)
+
+    print(f"{'вариант':<24} {'время, с':>9} {'записей/с':>10} {'commit':>7}")
+    for name, (elapsed, commits) in results.items():
+        print(f"{name:<24} {elapsed:9.2f} {args.writes / elapsed:10.0f} {commits:7d}")
@@ -0,0 +1,61 @@
+"""
+Пропускная способность DataTransfer: загрузка пользователей из CSV и JSON Lines и выгрузка обратно
+в файловую SQLite.
+
+Пиковая память процесса (ru_maxrss) выводится после каждого этапа: при потоковой обработке она
+не растёт вместе с количеством строк.
+
+Запуск: python -m benchmarks.bench_import_export --rows 1000000
+"""
+import argparse
+import csv
+import json
+import os
+import resource
+import tempfile
+import time
+
+from src.data_base.data_transfer import DataTransfer
+from src.data_base.model import Users
+from .common import make_service
+
+
+def write_source(path: str, file_format: str, rows: int) -> None:
+    """Пишет файл пользователей построчно, не создавая список строк в памяти."""
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(["nickname", "name", "surname"])
+            writer.writerows((f"user{i}", "Иван", "Иванов") for i in range(rows))
+            return
+        for i in range(rows):
+            file.write(json.dumps({"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"},
+                                  ensure_ascii=False) + "\n")
+
+
+def peak_memory_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--formats", nargs="+", choices=["csv", "jsonl"], default=["csv", "jsonl"])
+    args = parser.parse_args()
+
+    print(f"{'этап':<14} {'время, с':>9} {'строк/с':>10} {'пик памяти, МБ':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format in args.formats:
+            source = os.path.join(directory, f"users.{file_format}")
+            write_source(source, file_format, args.rows)
+            transfer = DataTransfer(make_service(f"sqlite:///{os.path.join(directory, file_format + '.db')}"),
+                                    batch_size=args.batch_size)
+
+            for stage, run in ((f"import {file_format}", lambda: transfer.import_file(Users, source, file_format)),
+                               (f"export {file_format}", lambda: transfer.export_file(
+                                   Users, os.path.join(directory, f"export.{file_format}"), file_format))):
+                started = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - started
+                print(f"{stage:<14} {elapsed:9.2f} {args.rows / elapsed:10.0f} {peak_memory_mb():15.1f}")
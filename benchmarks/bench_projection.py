@@ -0,0 +1,65 @@
+"""
+Время и пиковая память BaseCRUDService.read на большом результате: объекты модели против выборки
+столбцов id и nickname в виде Row, словарей и dataclass.
+
+Память считается через tracemalloc на всём результате, пока он жив (включая identity map сессии для объектов).
+
+Запуск: python -m benchmarks.bench_projection --rows 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from .common import make_service, users_rows
+
+VARIANTS = {
+    "объекты модели": {},
+    "columns, row": {"columns": ["id", "nickname"], "shape": "row"},
+    "columns, dict": {"columns": ["id", "nickname"], "shape": "dict"},
+    "columns, dataclass": {"columns": ["id", "nickname"], "shape": "dataclass"},
+}
+
+
+def measure(service, kwargs: dict) -> tuple[float, float]:
+    """Возвращает время чтения в секундах и пиковую память в МБ."""
+    gc.collect()
+    with service.session_scope(commit=False) as session:
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = BaseCRUDService(session, Users).read(**kwargs)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del rows
+    return elapsed, peak / 2 ** 20
+
+
+def measure_time(service, kwargs: dict, repeats: int) -> float:
+    """Возвращает лучшее время чтения из repeats прогонов без tracemalloc, который замедляет выделение памяти."""
+    best = float("inf")
+    for _ in range(repeats):
+        with service.session_scope(commit=False) as session:
+            started = time.perf_counter()
+            BaseCRUDService(session, Users).read(**kwargs)
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    service = make_service()
+    with service.session_scope() as session:
+        BaseCRUDService(session, Users).create_many(users_rows(args.rows))
+
+    print(f"{'вариант':<20} {'время, с':>9} {'пик памяти, МБ':>15}")
+    for name, kwargs in VARIANTS.items():
+        _, peak = measure(service, kwargs)
+        elapsed = measure_time(service, kwargs, args.repeats)
+        print(f"{name:<20} {elapsed:9.3f} {peak:15.1f}")
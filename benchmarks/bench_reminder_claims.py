@@ -0,0 +1,82 @@
+"""
+Пропускная способность рассылки напоминаний в зависимости от количества процессов-обработчиков.
+
+Каждый обработчик арендует пачку через RemindersService.claim_due, имитирует отправку задержкой
+--send-ms на напоминание и подтверждает пачку через ack.
+
+Запуск: python -m benchmarks.bench_reminder_claims --reminders 2000 --workers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.data_base.configuration import DataBaseConfig
+from src.data_base.data_base_service import DataBaseService
+from src.data_base.engine import DatabaseEngine
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.service_model.reminders_service import RemindersService
+from src.data_base.table_manager import TableManager
+
+NOW = datetime(2025, 1, 1, 12, 0)
+
+
+def _service(url: str) -> DataBaseService:
+    config = DataBaseConfig(url=url, sqlite_performance=True)
+    return DataBaseService(config, DatabaseEngine.from_config(config).get_engine())
+
+
+def _seed(url: str, count: int) -> None:
+    TableManager(DatabaseEngine(url).get_engine()).create_tables()
+    with _service(url).session_scope() as session:
+        user = BaseCRUDService(session, Users).create(nickname="user", name="Иван", surname="Иванов")
+        session.flush()
+        RemindersService(session).create_many(
+            {"user_id": user.id, "task_description": f"Задача {i}", "event_date": NOW, "remind_before": 5}
+            for i in range(count))
+
+
+def _worker(url: str, worker_id: str, batch_size: int, send_ms: float) -> int:
+    service = _service(url)
+    dispatched = 0
+    while True:
+        with service.session_scope() as session:
+            claimed = [reminder.id for reminder in
+                       RemindersService(session).claim_due(worker_id, NOW, limit=batch_size)]
+        if not claimed:
+            return dispatched
+        time.sleep(send_ms / 1000 * len(claimed))
+        with service.session_scope() as session:
+            dispatched += RemindersService(session).ack(worker_id, claimed, NOW + timedelta(seconds=1))
+
+
+def run(reminders: int, workers: int, batch_size: int, send_ms: float) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'claims.db')}"
+        _seed(url, reminders)
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers) as pool:
+            # Прогрев процессов, чтобы время запуска интерпретатора не входило в замер.
+            pool.map(time.sleep, [0] * workers)
+            started = time.perf_counter()
+            dispatched = sum(pool.starmap(_worker, [(url, f"worker-{i}", batch_size, send_ms)
+                                                    for i in range(workers)]))
+            elapsed = time.perf_counter() - started
+    assert dispatched == reminders, f"Отправлено {dispatched} из {reminders}"
+    return reminders / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--send-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        throughput = run(args.reminders, workers, args.batch_size, args.send_ms)
+        print(f"обработчиков: {workers:<3} напоминаний/с: {throughput:8.0f}")
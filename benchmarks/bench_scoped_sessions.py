@@ -0,0 +1,58 @@
+"""
+Пропускная способность запросов через DataBaseService.request_scope при росте числа потоков:
+каждый «запрос» читает пользователя по nickname и, с долей --write-ratio, обновляет его.
+
+Замер выполняется на файловой SQLite; размер пула подбирается по числу потоков.
+
+Запуск: python -m benchmarks.bench_scoped_sessions --requests 5000 --threads 1 2 4 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.data_base.configuration import DataBaseConfig
+from src.data_base.data_base_service import DataBaseService
+from src.data_base.engine import DatabaseEngine
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.table_manager import TableManager
+from .common import users_rows
+
+
+def handle_request(db_service: DataBaseService, users: int, write: bool) -> None:
+    with db_service.request_scope():
+        crud = BaseCRUDService(db_service.current_session(), Users)
+        nickname = f"user{random.randrange(users)}"
+        crud.read(filters=[Users.nickname == nickname])
+        if write:
+            crud.update([Users.nickname == nickname], {"name": "Пётр"})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--write-ratio", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"{'потоков':>7} {'время, с':>9} {'запросов/с':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in args.threads:
+            config = DataBaseConfig(url=f"sqlite:///{os.path.join(directory, f'{threads}.db')}",
+                                    pool_size=threads, sqlite_busy_timeout=30000)
+            engine = DatabaseEngine.from_config(config).get_engine()
+            TableManager(engine).create_tables()
+            db_service = DataBaseService(config, engine)
+            with db_service.session_scope() as session:
+                BaseCRUDService(session, Users).create_many(users_rows(args.users))
+
+            writes = [random.random() < args.write_ratio for _ in range(args.requests)]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(lambda write: handle_request(db_service, args.users, write), writes))
+            elapsed = time.perf_counter() - started
+            print(f"{threads:7d} {elapsed:9.2f} {args.requests / elapsed:11.0f}")
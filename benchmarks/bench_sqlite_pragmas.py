@@ -0,0 +1,79 @@
+"""
+Смешанная нагрузка чтение/запись на файловой SQLite с профилем SQLITE_PERFORMANCE_PRAGMAS и без него.
+
+Запуск: python -m benchmarks.bench_sqlite_pragmas --seconds 5 --readers 4 --writers 2
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from src.data_base.configuration import DataBaseConfig
+from src.data_base.data_base_service import DataBaseService
+from src.data_base.engine import DatabaseEngine, SQLITE_PERFORMANCE_PRAGMAS
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.table_manager import TableManager
+from .common import users_rows
+
+
+def run(path: str, pragmas: dict, seconds: float, readers: int, writers: int) -> dict:
+    config = DataBaseConfig(url=f"sqlite:///{path}")
+    engine = DatabaseEngine(config.url, pool_size=readers + writers, sqlite_pragmas=pragmas).get_engine()
+    TableManager(engine).create_tables()
+    service = DataBaseService(database_config=config, engine=engine)
+    with service.session_scope() as session:
+        BaseCRUDService(session, Users).create_many(users_rows(1000, "seed"))
+
+    counters = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader():
+        done = 0
+        while time.perf_counter() < deadline:
+            with service.session_scope(commit=False) as session:
+                BaseCRUDService(session, Users).read(filters=[Users.name == "Иван"], order_by=Users.id, limit=50)
+            done += 1
+        with lock:
+            counters["reads"] += done
+
+    def writer(index):
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                with service.session_scope() as session:
+                    BaseCRUDService(session, Users).create(nickname=f"w{index}_{done}_{errors}", name="Иван",
+                                                           surname="Иванов")
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counters["writes"] += done
+            counters["errors"] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return counters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    for name, pragmas in (("по умолчанию", None), ("SQLITE_PERFORMANCE_PRAGMAS", SQLITE_PERFORMANCE_PRAGMAS)):
+        with tempfile.TemporaryDirectory() as directory:
+            result = run(os.path.join(directory, "bench.db"), pragmas, args.seconds, args.readers, args.writers)
+        print(f"{name:<28} чтений/с: {result['reads'] / args.seconds:10.0f}  "
+              f"записей/с: {result['writes'] / args.seconds:8.0f}  ошибок: {result['errors']}")
@@ -0,0 +1,76 @@
+"""
+Накладные расходы на вызов BaseCRUDService.read/update/delete: прежняя цепочка session.query(...)
+против запросов select()/update()/delete(), которые использует сервис.
+
+Таблица маленькая, поэтому замер показывает стоимость построения и компиляции запроса, а не работу базы.
+
+Запуск: python -m benchmarks.bench_statement_cache --calls 5000
+"""
+import argparse
+import time
+
+from sqlalchemy import and_, or_
+
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from .common import make_service, users_rows
+
+FILTER_SHAPES = {
+    "равенство": lambda i: [Users.nickname == f"user{i % 100}"],
+    "два условия И": lambda i: [Users.name == "Иван", Users.nickname == f"user{i % 100}"],
+    "три условия ИЛИ": lambda i: [Users.nickname == f"user{i % 100}", Users.name == "Пётр", Users.surname == "Петров"],
+    "IN из 5 значений": lambda i: [Users.nickname.in_([f"user{(i + k) % 100}" for k in range(5)])],
+}
+
+
+def legacy_read(session, filters, use_or=False, order_by=None, limit=None):
+    """Воспроизводит прежнюю реализацию BaseCRUDService.read на session.query."""
+    query = session.query(Users).filter(or_(*filters) if use_or else and_(*filters))
+    if order_by is not None:
+        query = query.order_by(order_by)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def per_call_us(func, calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def run(calls: int) -> list[tuple[str, float, float]]:
+    service = make_service()
+    with service.session_scope() as session:
+        BaseCRUDService(session, Users).create_many(users_rows(100))
+
+    results = []
+    with service.session_scope(commit=False) as session:
+        crud = BaseCRUDService(session, Users)
+        for name, shape in FILTER_SHAPES.items():
+            use_or = name.endswith("ИЛИ")
+            before = per_call_us(lambda i: legacy_read(session, shape(i), use_or, Users.id, 10), calls)
+            after = per_call_us(lambda i: crud.read(shape(i), use_or, Users.id, 10), calls)
+            results.append((f"read: {name}", before, after))
+
+        before = per_call_us(lambda i: session.query(Users).filter(Users.nickname == f"user{i % 100}")
+                             .update({"name": "Иван"}, synchronize_session="fetch"), calls)
+        after = per_call_us(lambda i: crud.update([Users.nickname == f"user{i % 100}"], {"name": "Иван"}), calls)
+        results.append(("update: равенство", before, after))
+
+        before = per_call_us(lambda i: session.query(Users).filter_by(nickname=f"missing{i}")
+                             .delete(synchronize_session="fetch"), calls)
+        after = per_call_us(lambda i: crud.delete(nickname=f"missing{i}"), calls)
+        results.append(("delete: filter_by", before, after))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'запрос':<26} {'query(), мкс':>14} {'select(), мкс':>14}")
+    for name, before, after in run(args.calls):
+        print(f"{name:<26} {before:14.1f} {after:14.1f}")
@@ -0,0 +1,40 @@
+"""
+Синхронизация пользователей, половина которых уже есть в базе: чтение и create/update по одному
+против BaseCRUDService.upsert_many.
+
+Запуск: python -m benchmarks.bench_upsert --rows 20000
+"""
+import argparse
+
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from .common import make_service, users_rows, timer, print_results
+
+
+def sync_one_by_one(session, rows: list[dict]) -> None:
+    """Прежний способ: поиск по nickname, затем обновление найденной записи или создание новой."""
+    crud = BaseCRUDService(session, Users)
+    for row in rows:
+        if crud.read(filters=[Users.nickname == row["nickname"]]):
+            crud.update([Users.nickname == row["nickname"]], {"name": row["name"], "surname": row["surname"]})
+        else:
+            crud.create(**row)
+            session.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    rows = [{**row, "name": "Пётр"} for row in users_rows(args.rows)]
+    results = {}
+    for name, sync in (("read + create/update", sync_one_by_one),
+                       ("upsert_many", lambda session, data: BaseCRUDService(session, Users).upsert_many(data))):
+        service = make_service()
+        with service.session_scope() as session:
+            BaseCRUDService(session, Users).create_many(users_rows(args.rows // 2))
+        with timer(results, name), service.session_scope() as session:
+            sync(session, rows)
+
+    print_results(results, args.rows)
@@ -0,0 +1,46 @@
+import time
+from contextlib import contextmanager
+
+from src.data_base.configuration import DataBaseConfig
+from src.data_base.data_base_service import DataBaseService
+from src.data_base.engine import DatabaseEngine
+from src.data_base.table_manager import TableManager
+
+
+def make_service(url: str = "sqlite:///:memory:") -> DataBaseService:
+    """
+    Создаёт DataBaseService с чистыми таблицами для замеров.
+
+    :param url: URL базы данных. По умолчанию SQLite в памяти.
+    """
+    config = DataBaseConfig(url=url)
+    engine = DatabaseEngine(config.url, config.echo).get_engine()
+    table_manager = TableManager(engine)
+    table_manager.drop_tables()
+    table_manager.create_tables()
+    return DataBaseService(database_config=config, engine=engine)
+
+
+def users_rows(count: int, prefix: str = "user") -> list[dict]:
+    """Генерирует данные пользователей с уникальными никнеймами."""
+    return [{"nickname": f"{prefix}{i}", "name": "Иван", "surname": "Иванов"} for i in range(count)]
+
+
+@contextmanager
+def timer(results: dict, name: str):
+    """Записывает в results[name] время выполнения блока в секундах."""
+    started = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - started
+
+
+def print_results(results: dict, rows: int) -> None:
+    """Выводит время и количество строк в секунду для каждого замера."""
+    for name, elapsed in results.items():
+        print(f"{name:<30} {elapsed:8.3f} s  {rows / elapsed:12.0f} rows/s")
+
+
+def percentile(sorted_samples: list[float], quantile: float) -> float:
+    """Возвращает перцентиль отсортированной выборки методом ближайшего ранга."""
+    index = max(0, min(len(sorted_samples) - 1, round(quantile * len(sorted_samples)) - 1))
+    return sorted_samples[index]
@@ -0,0 +1,196 @@
+"""
+Набор замеров пропускной способности и задержек BaseCRUDService через DataBaseService.
+
+Заполняет базу --users пользователями и --reminders напоминаниями, затем для каждой операции
+выполняет --iterations вызовов, каждый в своей сессии (как в приложении), и считает ops/s, p50 и p99.
+Замеры выполняются на SQLite в памяти и в файле.
+
+Результаты выводятся таблицей и, с --output, сохраняются в JSON. С --baseline результаты
+сравниваются с сохранённым ранее прогоном.
+
+Запуск: python -m benchmarks.crud_suite --users 10000 --reminders 50000 --output results.json
+        python -m benchmarks.crud_suite --baseline results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+import sqlalchemy
+
+from src.data_base.data_base_service import DataBaseService
+from src.data_base.model import Users, Reminders
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.service_model.reminders_service import RemindersService
+from .common import make_service, users_rows, percentile
+
+BACKENDS = ("memory", "file")
+EVENT_DATE = datetime(2025, 1, 1, 12, 0)
+
+
+def seed(service: DataBaseService, users: int, reminders: int) -> None:
+    """Заполняет базу пользователями и равномерно распределёнными между ними напоминаниями."""
+    with service.session_scope() as session:
+        user_ids = BaseCRUDService(session, Users).create_many(users_rows(users, "seed"), return_ids=True)
+        RemindersService(session).create_many(
+            {"user_id": user_ids[i % users], "task_description": f"Задача {i}",
+             "event_date": EVENT_DATE + timedelta(minutes=i), "remind_before": 15}
+            for i in range(reminders))
+
+
+def operations(service: DataBaseService, users: int) -> dict[str, Callable[[int], None]]:
+    """
+    Возвращает замеряемые операции: функция принимает номер вызова и выполняет одну операцию.
+
+    update и delete работают со строками, созданными замером create, поэтому порядок операций важен.
+    """
+    pages = {"cursor": None}
+
+    def create(i):
+        with service.session_scope() as session:
+            BaseCRUDService(session, Users).create(nickname=f"bench{i}", name="Пётр", surname="Петров")
+
+    def read_filtered(i):
+        with service.session_scope(commit=False) as session:
+            BaseCRUDService(session, Users).read(filters=[Users.nickname == f"seed{random.randrange(users)}"])
+
+    def read_ordered(i):
+        with service.session_scope(commit=False) as session:
+            BaseCRUDService(session, Reminders).read(filters=[Reminders.user_id == random.randrange(users) + 1],
+                                                     order_by=Reminders.remind_at.desc(), limit=20)
+
+    def read_paginated(i):
+        with service.session_scope(commit=False) as session:
+            _, pages["cursor"] = BaseCRUDService(session, Users).read_page(
+                filters=[Users.name == "Иван"], order_by=[Users.created_at.desc()], limit=50,
+                cursor=pages["cursor"])
+
+    def update(i):
+        with service.session_scope() as session:
+            BaseCRUDService(session, Users).update([Users.nickname == f"bench{i}"], {"name": "Павел"})
+
+    def delete(i):
+        with service.session_scope() as session:
+            BaseCRUDService(session, Users).delete(nickname=f"bench{i}")
+
+    return {"create": create, "read_filtered": read_filtered, "read_ordered": read_ordered,
+            "read_paginated": read_paginated, "update": update, "delete": delete}
+
+
+def measure(operation: Callable[[int], None], iterations: int, warmup: int) -> dict:
+    """Выполняет операцию iterations раз (после warmup прогревочных вызовов) и считает статистику."""
+    for i in range(warmup):
+        operation(iterations + i)
+
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        call_started = time.perf_counter()
+        operation(i)
+        samples.append((time.perf_counter() - call_started) * 1000)
+    elapsed = time.perf_counter() - started
+
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / elapsed,
+        "mean_ms": sum(samples) / iterations,
+        "p50_ms": percentile(samples, 0.5),
+        "p99_ms": percentile(samples, 0.99),
+        "max_ms": samples[-1],
+    }
+
+
+def run_backend(url: str, users: int, reminders: int, iterations: int, warmup: int) -> dict:
+    service = make_service(url)
+    seed(service, users, reminders)
+    return {name: measure(operation, iterations, warmup)
+            for name, operation in operations(service, users).items()}
+
+
+def run(backends, users: int, reminders: int, iterations: int, warmup: int, seed_value: int) -> dict:
+    """
+    Выполняет набор замеров для каждого бэкенда.
+
+    :return: Словарь с описанием окружения и параметров прогона и результатами по бэкендам и операциям.
+    """
+    random.seed(seed_value)
+    results = {}
+    for backend in backends:
+        if backend == "memory":
+            results[backend] = run_backend("sqlite:///:memory:", users, reminders, iterations, warmup)
+            continue
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'crud_suite.db')}"
+            results[backend] = run_backend(url, users, reminders, iterations, warmup)
+
+    return {
+        "meta": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "params": {"users": users, "reminders": reminders, "iterations": iterations, "warmup": warmup,
+                   "seed": seed_value},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[tuple[str, str, float, float, float]]:
+    """
+    Сравнивает ops/s прогонов по общим бэкендам и операциям.
+
+    :return: Список (бэкенд, операция, ops/s в baseline, ops/s сейчас, изменение в процентах).
+    """
+    rows = []
+    for backend, operations_results in current["results"].items():
+        for name, result in operations_results.items():
+            before = baseline["results"].get(backend, {}).get(name)
+            if before is None:
+                continue
+            change = (result["ops_per_sec"] / before["ops_per_sec"] - 1) * 100
+            rows.append((backend, name, before["ops_per_sec"], result["ops_per_sec"], change))
+    return rows
+
+
+def print_report(report: dict) -> None:
+    print(f"{'бэкенд':<8} {'операция':<16} {'ops/s':>10} {'p50, мс':>9} {'p99, мс':>9}")
+    for backend, operations_results in report["results"].items():
+        for name, result in operations_results.items():
+            print(f"{backend:<8} {name:<16} {result['ops_per_sec']:10.0f} "
+                  f"{result['p50_ms']:9.3f} {result['p99_ms']:9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--reminders", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Файл для сохранения результатов в JSON")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона для сравнения")
+    args = parser.parse_args()
+
+    report = run(args.backends, args.users, args.reminders, args.iterations, args.warmup, args.seed)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        print(f"\n{'бэкенд':<8} {'операция':<16} {'было ops/s':>11} {'стало ops/s':>12} {'изменение':>10}")
+        for backend, name, before, after, change in compare(report, baseline):
+            print(f"{backend:<8} {name:<16} {before:11.0f} {after:12.0f} {change:+9.1f}%")
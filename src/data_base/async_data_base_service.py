@@ -0,0 +1,41 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .configuration import DataBaseConfig
+
+
+class AsyncDataBaseService:
+    """
+    Асинхронный аналог DataBaseService: управляет сессиями AsyncSession поверх движка create_async_engine.
+    """
+
+    def __init__(self, database_config: DataBaseConfig, engine):
+        try:
+            self.engine = engine
+            self.conf = database_config
+            # После commit объекты не истекают: ленивая подгрузка атрибутов в asyncio недоступна.
+            self.session_local = async_sessionmaker(autocommit=self.conf.autocommit, autoflush=self.conf.autoflush,
+                                                    bind=self.engine, expire_on_commit=False)
+        except Exception as ex:
+            raise RuntimeError(f"Не удалось инициализировать AsyncDataBaseService: {ex}")
+
+    @asynccontextmanager
+    async def session_scope(self, commit=True):
+        """
+        Предоставляет асинхронный контекстный менеджер для управления сессией базы данных.
+
+        :param commit: Указывает, следует ли выполнять commit изменений в сессии. По умолчанию True.
+        :raises Exception: Выбрасывается в случае ошибки выполнения в сессии, с последующим откатом изменений.
+        """
+        session = self.session_local()
+        try:
+            yield session
+            if commit:
+                await session.commit()
+        except Exception as e:
+            await session.rollback()
+            print(f"Session rollback due to: {e}")
+            raise
+        finally:
+            await session.close()
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 
 @dataclass
@@ -7,3 +8,41 @@ class DataBaseConfig:
     echo: bool = False
     autocommit: bool = False
     autoflush: bool = False
+    # Параметры пула соединений. None — значение по умолчанию SQLAlchemy для диалекта.
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    pool_timeout: Optional[float] = None
+    pool_recycle: Optional[int] = None
+    pool_pre_ping: bool = False
+    pool_class: Optional[str] = None
+    # Количество соединений, открываемых заранее при создании движка.
+    pool_warmup: int = 0
+    # Профиль PRAGMA для SQLite: sqlite_performance включает SQLITE_PERFORMANCE_PRAGMAS из engine.py,
+    # отдельные параметры sqlite_* переопределяют значения профиля. Для других диалектов игнорируются.
+    sqlite_performance: bool = False
+    sqlite_journal_mode: Optional[str] = None
+    sqlite_synchronous: Optional[str] = None
+    sqlite_mmap_size: Optional[int] = None
+    sqlite_cache_size: Optional[int] = None
+    sqlite_temp_store: Optional[str] = None
+    sqlite_busy_timeout: Optional[int] = None
+    # Реплики только для чтения: session_scope(read_only=True) распределяет сессии между ними.
+    # В ini-файле адреса перечисляются через запятую или с новой строки.
+    replica_urls: list[str] = field(default_factory=list)
+    # Стратегия выбора реплики: "round_robin" или "least_busy".
+    replica_strategy: str = "round_robin"
+    # Сколько секунд недоступная реплика исключается из выбора.
+    replica_retry_interval: float = 30.0
+    # Как часто (в секундах) проверять доступность реплики перед выдачей сессии.
+    replica_health_check_interval: float = 5.0
+    # Замеры времени запросов (см. QueryInstrumentation). Порог медленного запроса включает замеры сам.
+    instrumentation: bool = False
+    slow_query_threshold_ms: Optional[float] = None
+    # Повтор транзакций DataBaseService.run_in_transaction при конфликтах блокировок и сериализации
+    # (см. RetryPolicy в retry.py): количество попыток и экспоненциальная задержка между ними.
+    retry_max_attempts: int = 5
+    retry_base_delay: float = 0.01
+    retry_max_delay: float = 1.0
+    retry_multiplier: float = 2.0
+    # Случайная задержка от 0 до расчётной (full jitter), чтобы конфликтующие транзакции не повторялись синхронно.
+    retry_jitter: bool = True
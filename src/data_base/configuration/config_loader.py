@@ -1,5 +1,7 @@
 import configparser
+from dataclasses import fields
 from enum import Enum
+from typing import get_type_hints, get_origin, get_args, Union
 
 from src.data_base.configuration.config import DataBaseConfig
 from src.data_base.configuration.constrains import CONFIG_FILE
@@ -25,5 +27,43 @@ def load_config(database_type: DataBaseType, config_path:str = None) -> DataBase
         raise ValueError(f"Секция '{database_type.value}' не найдена в конфигурационном файле: {config_path}")
 
     conf_keys = config[database_type.value]
-    kwargs = {k: conf_keys[k] for k in conf_keys}
+    field_types = get_type_hints(DataBaseConfig)
+    known_fields = {field.name for field in fields(DataBaseConfig)}
+
+    kwargs = {}
+    for key in conf_keys:
+        if key not in known_fields:
+            raise ValueError(f"Неизвестный параметр '{key}' в секции '{database_type.value}'")
+        kwargs[key] = _coerce_value(conf_keys, key, field_types[key])
     return DataBaseConfig(**kwargs)
+
+
+def _coerce_value(section: configparser.SectionProxy, key: str, field_type):
+    """
+    Приводит строковое значение параметра из ini-файла к типу поля DataBaseConfig.
+
+    Для полей Optional пустое значение или "none" означает None. Списки перечисляются через запятую
+    или с новой строки.
+
+    :raises ValueError: Если значение не удаётся привести к типу поля.
+    """
+    raw = section[key].strip()
+
+    if get_origin(field_type) is list:
+        return [item.strip() for item in raw.replace("\n", ",").split(",") if item.strip()]
+
+    if get_origin(field_type) is Union:
+        if raw == "" or raw.lower() == "none":
+            return None
+        field_type = next(arg for arg in get_args(field_type) if arg is not type(None))
+
+    try:
+        if field_type is bool:
+            return section.getboolean(key)
+        if field_type is int:
+            return section.getint(key)
+        if field_type is float:
+            return section.getfloat(key)
+    except ValueError as ex:
+        raise ValueError(f"Некорректное значение параметра '{key}': {raw!r}") from ex
+    return raw
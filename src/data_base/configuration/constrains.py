@@ -8,3 +8,5 @@ CONFIG_FILE = os.path.join(os.getcwd(), "data_base","config.ini")
 class TableName(Enum):
     USERS = "users"
     REMINDERS = "reminders"
+    REMINDERS_ARCHIVE = "reminders_archive"
+    SCHEMA_FINGERPRINT = "schema_fingerprint"
@@ -1,8 +1,18 @@
+import threading
+import time
 from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any, Callable, Optional, TypeVar
 
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
 
 from .configuration import DataBaseConfig
+from .engine import DatabaseEngine
+from .replica_router import ReplicaRouter
+from .retry import RetryPolicy, is_retryable
+
+T = TypeVar("T")
 
 
 class DataBaseService:
@@ -11,24 +21,169 @@ class DataBaseService:
      удаление таблиц и управление сессиями.
     """
 
-    def __init__(self, database_config: DataBaseConfig, engine):
+    def __init__(self, database_config: DataBaseConfig, engine, replica_engines: Optional[list] = None,
+                 scopefunc: Optional[Callable[[], Any]] = None):
+        """
+        :param database_config: Конфигурация базы данных.
+        :param engine: Движок основной базы данных.
+        :param replica_engines: Движки реплик для чтения. По умолчанию создаются по database_config.replica_urls.
+        :param scopefunc: Функция, возвращающая ключ текущей области для scoped_session (например, идентификатор
+            запроса или задачи). По умолчанию область — текущий поток.
+        """
         try:
             self.engine = engine
             self.conf = database_config
             self.session_local = sessionmaker(autocommit=self.conf.autocommit, autoflush=self.conf.autoflush,
                                               bind=self.engine)
+            self.scoped_session = scoped_session(self.session_local, scopefunc=scopefunc)
+            self.retry_policy = RetryPolicy.from_config(self.conf)
+            self._retry_lock = threading.Lock()
+            self._retry_counters = {"transactions": 0, "retries": 0, "exhausted": 0}
+            if replica_engines is None:
+                replica_engines = [DatabaseEngine.from_config(replace(self.conf, url=url)).get_engine()
+                                   for url in self.conf.replica_urls]
+            self.replica_router = ReplicaRouter(self.engine, replica_engines,
+                                                strategy=self.conf.replica_strategy,
+                                                retry_interval=self.conf.replica_retry_interval,
+                                                health_check_interval=self.conf.replica_health_check_interval)
         except Exception as ex:
             raise RuntimeError(f"Не удалось инициализировать DataBaseService: {ex}")
 
     @contextmanager
-    def session_scope(self, commit=True):
+    def session_scope(self, commit=True, read_only=False):
         """
         Предоставляет контекстный менеджер для управления сессией базы данных.
 
         :param commit: Указывает, следует ли выполнять commit изменений в сессии. По умолчанию True.
+        :param read_only: Если True, сессия открывается на реплике (с откатом на основную базу, если реплики
+            недоступны) и никогда не фиксируется. По умолчанию False.
         :raises Exception: Выбрасывается в случае ошибки выполнения в сессии, с последующим откатом изменений.
         """
-        session = self.session_local()
+        if not read_only:
+            with self._scope(self.session_local(), commit) as session:
+                yield session
+            return
+
+        with self.replica_router.acquire() as bind:
+            try:
+                with self._scope(self.session_local(bind=bind), commit=False) as session:
+                    yield session
+            except DBAPIError as ex:
+                if ex.connection_invalidated and bind is not self.engine:
+                    self.replica_router.mark_unhealthy(bind)
+                raise
+
+    def run_in_transaction(self, work: Callable[[Session], T], policy: Optional[RetryPolicy] = None) -> T:
+        """
+        Выполняет work(session) в session_scope и повторяет транзакцию целиком, если она завершилась
+        конфликтом блокировок или сериализации (см. retry.is_retryable), с задержками по политике повтора.
+
+        Каждая попытка получает новую сессию, а изменения неудачной попытки откатываются, поэтому work
+        повторяется с чистого состояния. work не должна иметь побочных эффектов вне сессии
+        или они должны быть идемпотентны.
+
+        :param work: Функция, выполняющая единицу работы в переданной сессии.
+        :param policy: Политика повтора. По умолчанию — retry_policy, созданная по конфигурации.
+        :return: Результат work последней (успешной) попытки.
+        :raises Exception: Ошибка, которую нельзя повторить, или последняя ошибка после исчерпания попыток.
+        """
+        policy = policy or self.retry_policy
+        dialect_name = self.engine.dialect.name
+        self._count_retry("transactions")
+        attempt = 1
+        while True:
+            try:
+                with self.session_scope() as session:
+                    return work(session)
+            except DBAPIError as ex:
+                if not is_retryable(ex, dialect_name):
+                    raise
+                if attempt >= policy.max_attempts:
+                    self._count_retry("exhausted")
+                    raise
+            self._count_retry("retries")
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+
+    def retry_stats(self) -> dict:
+        """
+        Возвращает счётчики run_in_transaction: количество транзакций, повторов и транзакций,
+        исчерпавших попытки.
+        """
+        with self._retry_lock:
+            return dict(self._retry_counters)
+
+    def _count_retry(self, counter: str) -> None:
+        with self._retry_lock:
+            self._retry_counters[counter] += 1
+
+    def current_session(self) -> Session:
+        """
+        Возвращает сессию текущей области scoped_session (по умолчанию — текущего потока), создавая её
+        при первом обращении. Повторные вызовы в той же области возвращают ту же сессию до end_request.
+        """
+        return self.scoped_session()
+
+    def begin_request(self) -> Session:
+        """
+        Хук начала запроса: сбрасывает сессию, оставшуюся в области от прерванного запроса, и открывает новую.
+
+        :return: Сессия запроса.
+        """
+        if self.scoped_session.registry.has():
+            self.scoped_session.remove()
+        return self.scoped_session()
+
+    def end_request(self, exception: Optional[BaseException] = None, commit: bool = True) -> None:
+        """
+        Хук завершения запроса (teardown): фиксирует или откатывает сессию области и удаляет её из реестра.
+
+        Сессия удаляется в любом случае, даже если commit завершился ошибкой, поэтому следующий запрос
+        в том же потоке получит новую сессию. Если сессия в области не создавалась, ничего не делает.
+
+        :param exception: Исключение, которым завершился запрос. Если задано, изменения откатываются.
+        :param commit: Фиксировать ли изменения при успешном запросе. По умолчанию True.
+        :raises Exception: Ошибка commit, после отката изменений.
+        """
+        if not self.scoped_session.registry.has():
+            return
+        session = self.scoped_session()
+        try:
+            if exception is None and commit:
+                session.commit()
+            else:
+                session.rollback()
+        except Exception as e:
+            session.rollback()
+            print(f"Session rollback due to: {e}")
+            raise
+        finally:
+            self.scoped_session.remove()
+
+    @contextmanager
+    def request_scope(self, commit: bool = True):
+        """
+        Контекстный менеджер запроса поверх begin_request/end_request: код внутри блока и вызываемые им
+        функции получают одну сессию через current_session.
+
+        :param commit: Фиксировать ли изменения при успешном завершении блока. По умолчанию True.
+        :raises Exception: Выбрасывается в случае ошибки внутри блока или при commit, с откатом изменений.
+        """
+        session = self.begin_request()
+        try:
+            yield session
+        except BaseException as ex:
+            self.end_request(ex)
+            raise
+        self.end_request(commit=commit)
+
+    def read_scope(self):
+        """Сессия только для чтения на реплике: сокращение для session_scope(commit=False, read_only=True)."""
+        return self.session_scope(commit=False, read_only=True)
+
+    @staticmethod
+    @contextmanager
+    def _scope(session, commit):
         try:
             yield session
             if commit:
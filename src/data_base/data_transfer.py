@@ -0,0 +1,282 @@
+import csv
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, date
+from typing import Any, Callable, Iterable, Iterator, Optional, Type, Union, TextIO
+
+from sqlalchemy import select, inspect, Integer, DateTime, Date, String, Boolean, Float
+from sqlalchemy.exc import DBAPIError
+
+from .instrumentation import OPERATION_OPTION
+from .model.base_model import BaseModel
+from .service_model.base_service import BaseCRUDService, _where_clause, _order_by_list
+
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class RowError:
+    """Ошибка загрузки одной строки файла."""
+    line: int
+    message: str
+    row: dict
+
+
+@dataclass
+class ImportResult:
+    """Итог загрузки: количество добавленных записей и ошибки отдельных строк."""
+    imported: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+
+class DataTransfer:
+    """
+    Потоковая загрузка и выгрузка записей модели в файлы CSV и JSON Lines поверх DataBaseService.
+
+    Загрузка читает файл построчно, проверяет каждую строку по столбцам модели и вставляет корректные строки
+    через BaseCRUDService.create_many пачками по batch_size, каждую пачку в своей транзакции. Если пачка
+    отклонена базой (уникальность, внешний ключ), она повторяется по строкам в точках сохранения,
+    и в отчёт попадают только отклонённые строки. Загруженные пачки остаются зафиксированными
+    даже при ошибках в следующих.
+
+    Выгрузка читает таблицу потоковым курсором (yield_per) и пишет строки по мере получения, поэтому
+    расход памяти не зависит от размера таблицы.
+    """
+
+    def __init__(self, database_service, batch_size: int = 1000):
+        """
+        :param database_service: DataBaseService, в сессиях которого выполняются загрузка и выгрузка.
+        :param batch_size: Количество строк в одной пачке вставки и выборки. По умолчанию 1000.
+        :raises ValueError: Если batch_size меньше 1.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size должен быть положительным, а не {batch_size}")
+        self._database_service = database_service
+        self.batch_size = batch_size
+
+    def import_file(self, model: Type[BaseModel], source: Union[str, TextIO], file_format: str) -> ImportResult:
+        """
+        Загружает записи модели из файла.
+
+        В CSV первая строка — имена полей, пустое значение означает NULL. В JSON Lines каждая строка — объект
+        {поле: значение}; даты передаются в формате ISO 8601.
+
+        :param model: Класс модели базы данных.
+        :param source: Путь к файлу или открытый текстовый файл.
+        :param file_format: "csv" или "jsonl".
+        :return: Количество загруженных записей и ошибки строк с номерами строк файла.
+        :raises ValueError: Если формат неизвестен.
+        """
+        _check_format(file_format)
+        converter = _RowConverter(model)
+        result = ImportResult()
+        batch: list[tuple[int, dict]] = []
+
+        with _open(source, "r") as file:
+            for line, raw in _read_rows(file, file_format):
+                if isinstance(raw, ValueError):
+                    result.errors.append(RowError(line, str(raw), {}))
+                    continue
+                try:
+                    batch.append((line, converter.convert(raw)))
+                except (ValueError, TypeError) as ex:
+                    result.errors.append(RowError(line, str(ex), raw if isinstance(raw, dict) else {}))
+                    continue
+                if len(batch) >= self.batch_size:
+                    self._insert_batch(model, batch, result)
+                    batch = []
+            if batch:
+                self._insert_batch(model, batch, result)
+
+        return result
+
+    def import_csv(self, model: Type[BaseModel], source: Union[str, TextIO]) -> ImportResult:
+        """Загружает записи модели из CSV, см. import_file."""
+        return self.import_file(model, source, "csv")
+
+    def import_jsonl(self, model: Type[BaseModel], source: Union[str, TextIO]) -> ImportResult:
+        """Загружает записи модели из JSON Lines, см. import_file."""
+        return self.import_file(model, source, "jsonl")
+
+    def export_file(self, model: Type[BaseModel], target: Union[str, TextIO], file_format: str,
+                    filters: Optional[list] = None, use_or: bool = False, order_by=None) -> int:
+        """
+        Выгружает записи модели в файл, не загружая таблицу в память целиком.
+
+        :param model: Класс модели базы данных.
+        :param target: Путь к файлу или открытый текстовый файл.
+        :param file_format: "csv" или "jsonl".
+        :param filters: Список условий фильтрации SQLAlchemy в формате BaseCRUDService.read, опционально.
+        :param use_or: Определяет, использовать ли логическое "ИЛИ" вместо "И" при применении фильтров. По умолчанию False.
+        :param order_by: Порядок сортировки. По умолчанию по первичному ключу.
+        :return: Количество выгруженных записей.
+        :raises ValueError: Если формат неизвестен.
+        :raises TypeError: Если фильтры некорректны.
+        """
+        _check_format(file_format)
+        columns = list(model.__table__.columns)
+        stmt = select(*columns)
+        if filters:
+            stmt = stmt.where(_where_clause(filters, use_or))
+        stmt = stmt.order_by(*(_order_by_list(order_by) if order_by is not None else inspect(model).primary_key))
+        stmt = stmt.execution_options(yield_per=self.batch_size, **{OPERATION_OPTION: f"{model.__name__}.export"})
+
+        keys = [column.key for column in columns]
+        exported_count = 0
+        with _open(target, "w") as file, self._database_service.session_scope(commit=False) as session:
+            write = _row_writer(file, file_format, keys)
+            for partition in session.execute(stmt).partitions():
+                for row in partition:
+                    write(row)
+                exported_count += len(partition)
+        return exported_count
+
+    def export_csv(self, model: Type[BaseModel], target: Union[str, TextIO], **kwargs) -> int:
+        """Выгружает записи модели в CSV, см. export_file."""
+        return self.export_file(model, target, "csv", **kwargs)
+
+    def export_jsonl(self, model: Type[BaseModel], target: Union[str, TextIO], **kwargs) -> int:
+        """Выгружает записи модели в JSON Lines, см. export_file."""
+        return self.export_file(model, target, "jsonl", **kwargs)
+
+    def _insert_batch(self, model, batch: list[tuple[int, dict]], result: ImportResult) -> None:
+        """Вставляет пачку одной транзакцией, а если база её отклонила — по строкам в точках сохранения."""
+        try:
+            with self._database_service.session_scope() as session:
+                BaseCRUDService(session, model).create_many([row for _, row in batch], batch_size=self.batch_size)
+            result.imported += len(batch)
+            return
+        except DBAPIError:
+            pass
+
+        with self._database_service.session_scope() as session:
+            crud = BaseCRUDService(session, model)
+            for line, row in batch:
+                try:
+                    with session.begin_nested():
+                        crud.create_many([row])
+                    result.imported += 1
+                except DBAPIError as ex:
+                    result.errors.append(RowError(line, str(ex.orig), row))
+
+
+class _RowConverter:
+    """Проверяет строку файла по столбцам модели и приводит значения к типам столбцов."""
+
+    def __init__(self, model: Type[BaseModel]):
+        self._model = model
+        self._columns = {column.key: column for column in model.__table__.columns}
+        self._required = {key for key, column in self._columns.items()
+                          if not column.nullable and column.default is None and column.server_default is None
+                          and not (column.primary_key and column.autoincrement in (True, "auto")
+                                   and isinstance(column.type, Integer))}
+
+    def convert(self, raw: Any) -> dict:
+        """
+        :raises TypeError: Если строка не является объектом.
+        :raises ValueError: Если в строке неизвестное поле, нет обязательного поля или значение некорректно.
+        """
+        if not isinstance(raw, dict):
+            raise TypeError(f"Строка должна быть объектом, а не {type(raw).__name__}")
+
+        if None in raw:
+            raise ValueError("В строке больше значений, чем полей в заголовке")
+        unknown = [key for key in raw if key not in self._columns]
+        if unknown:
+            raise ValueError(f"Поля {unknown} не найдены в модели {self._model.__name__}")
+
+        row = {}
+        for key, value in raw.items():
+            if value == "" or value is None:
+                value = None
+            else:
+                value = self._convert_value(self._columns[key], value)
+            if value is None and not self._columns[key].nullable:
+                if key in self._required:
+                    raise ValueError(f"Поле '{key}' не может быть пустым")
+                continue
+            row[key] = value
+
+        missing = sorted(self._required - row.keys())
+        if missing:
+            raise ValueError(f"Не заданы обязательные поля {missing}")
+        return row
+
+    @staticmethod
+    def _convert_value(column, value):
+        column_type = column.type
+        try:
+            if isinstance(column_type, Boolean):
+                if isinstance(value, str):
+                    return {"true": True, "1": True, "false": False, "0": False}[value.lower()]
+                return bool(value)
+            if isinstance(column_type, Integer):
+                if isinstance(value, float) and not value.is_integer():
+                    raise ValueError
+                return int(value)
+            if isinstance(column_type, Float):
+                return float(value)
+            if isinstance(column_type, DateTime):
+                return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+            if isinstance(column_type, Date):
+                return value if isinstance(value, date) else date.fromisoformat(value)
+        except (ValueError, TypeError, KeyError):
+            raise ValueError(f"Некорректное значение поля '{column.key}': {value!r}") from None
+
+        if isinstance(column_type, String):
+            value = str(value)
+            if column_type.length is not None and len(value) > column_type.length:
+                raise ValueError(f"Значение поля '{column.key}' длиннее {column_type.length} символов")
+        return value
+
+
+def _check_format(file_format: str) -> None:
+    """:raises ValueError: Если формат не входит в FORMATS."""
+    if file_format not in FORMATS:
+        raise ValueError(f"Неизвестный формат '{file_format}', ожидается один из {list(FORMATS)}")
+
+
+@contextmanager
+def _open(source: Union[str, TextIO], mode: str) -> Iterator[TextIO]:
+    """Открывает файл по пути (и закрывает после использования) или возвращает уже открытый файл."""
+    if not isinstance(source, str):
+        yield source
+        return
+    with open(source, mode, encoding="utf-8", newline="") as file:
+        yield file
+
+
+def _read_rows(file: TextIO, file_format: str) -> Iterator[tuple[int, Any]]:
+    """Возвращает пары (номер строки файла, строка); вместо некорректной строки JSON возвращается ValueError."""
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for raw in reader:
+            yield reader.line_num, raw
+        return
+
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            yield line, json.loads(text)
+        except json.JSONDecodeError as ex:
+            yield line, ValueError(f"Некорректный JSON: {ex.msg}")
+
+
+def _row_writer(file: TextIO, file_format: str, keys: list[str]) -> Callable[[Iterable], None]:
+    """Возвращает функцию записи строки выборки в файл; для CSV сразу пишет заголовок."""
+    if file_format == "csv":
+        writer = csv.writer(file)
+        writer.writerow(keys)
+        return lambda row: writer.writerow(["" if value is None else _serialize(value) for value in row])
+
+    def write(row):
+        file.write(json.dumps(dict(zip(keys, (_serialize(value) for value in row))), ensure_ascii=False))
+        file.write("\n")
+
+    return write
+
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
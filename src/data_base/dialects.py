@@ -0,0 +1,5 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Функции insert() диалектов с поддержкой INSERT ... ON CONFLICT: ими строятся upsert BaseCRUDService
+# и сохранение отпечатка схемы в TableManager.
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
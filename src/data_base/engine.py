@@ -1,27 +1,142 @@
-from sqlalchemy import create_engine
+import re
+from typing import Optional, Type, Union
+
+from sqlalchemy import create_engine, text, pool, event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from .configuration import DataBaseConfig
+from .instrumentation import QueryInstrumentation
+
+# Профиль PRAGMA для SQLite под конкурентную нагрузку: WAL позволяет читателям не ждать писателя,
+# synchronous=NORMAL в режиме WAL делает fsync только при checkpoint.
+SQLITE_PERFORMANCE_PRAGMAS = {
+    "busy_timeout": 5000,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,
+    "cache_size": -65536,
+    "temp_store": "MEMORY",
+}
+
+_SQLITE_PRAGMA_NAMES = ("busy_timeout", "journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store")
+_SQLITE_PRAGMA_VALUE = re.compile(r"^(-?\d+|[A-Za-z]+)$")
 
 
 class DatabaseEngine:
     """Улучшенный класс для управления движком базы данных."""
 
-    def __init__(self, url: str, echo: bool = False):
+    def __init__(self, url: str, echo: bool = False,
+                 pool_size: Optional[int] = None,
+                 max_overflow: Optional[int] = None,
+                 pool_timeout: Optional[float] = None,
+                 pool_recycle: Optional[int] = None,
+                 pool_pre_ping: bool = False,
+                 pool_class: Union[str, Type[pool.Pool], None] = None,
+                 pool_warmup: int = 0,
+                 sqlite_pragmas: Optional[dict] = None,
+                 instrumentation: Optional[QueryInstrumentation] = None):
+        """
+        :param url: URL базы данных.
+        :param echo: Выводить ли выполняемые SQL-запросы.
+        :param pool_size: Количество постоянно удерживаемых соединений пула. None — по умолчанию для диалекта.
+        :param max_overflow: Количество соединений сверх pool_size, открываемых при пиковой нагрузке.
+        :param pool_timeout: Время ожидания свободного соединения в секундах.
+        :param pool_recycle: Время жизни соединения в секундах, после которого оно пересоздаётся.
+        :param pool_pre_ping: Проверять ли соединение перед выдачей из пула.
+        :param pool_class: Класс пула или его имя из sqlalchemy.pool, например "QueuePool" или "NullPool".
+        :param pool_warmup: Количество соединений, открываемых заранее при создании движка.
+        :param sqlite_pragmas: PRAGMA, выполняемые на каждом новом соединении SQLite, например
+            SQLITE_PERFORMANCE_PRAGMAS. Для других диалектов игнорируются.
+        :param instrumentation: Замеры времени запросов и ожидания соединений, подключаемые к движку.
+        :raises ValueError: Если указан неизвестный класс пула или недопустимая PRAGMA.
+        """
         self.url = url
         self.echo = echo
+        self.pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping or None,
+            "poolclass": _resolve_pool_class(pool_class),
+        }
+        self.pool_warmup = pool_warmup
+        self.sqlite_pragma_statements = _sqlite_pragma_statements(sqlite_pragmas or {})
+        self.instrumentation = instrumentation
         try:
             self.engine = self._create_engine()
         except Exception as ex:
             # logging.error(f"Ошибка при инициализации движка: {ex}", exc_info=True)
             raise RuntimeError("Инициализация движка базы данных не удалась.") from ex
 
+    @classmethod
+    def from_config(cls, config: DataBaseConfig) -> "DatabaseEngine":
+        """Создаёт движок по параметрам конфигурации."""
+        return cls(config.url, config.echo,
+                   pool_size=config.pool_size,
+                   max_overflow=config.max_overflow,
+                   pool_timeout=config.pool_timeout,
+                   pool_recycle=config.pool_recycle,
+                   pool_pre_ping=config.pool_pre_ping,
+                   pool_class=config.pool_class,
+                   pool_warmup=config.pool_warmup,
+                   sqlite_pragmas=_sqlite_pragmas_from_config(config),
+                   instrumentation=_instrumentation_from_config(config))
+
     def _create_engine(self):
         """Вспомогательный метод для создания движка."""
-        return create_engine(self.url, echo=self.echo)
+        options = {key: value for key, value in self.pool_options.items() if value is not None}
+        engine = create_engine(self.url, echo=self.echo, **options)
+        if self.sqlite_pragma_statements and engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", self._apply_sqlite_pragmas)
+        if self.instrumentation is not None:
+            self.instrumentation.attach(engine)
+        if self.pool_warmup:
+            self.warm_up(self.pool_warmup, engine)
+        return engine
+
+    def _apply_sqlite_pragmas(self, dbapi_connection, connection_record) -> None:
+        """Обработчик события connect: выполняет PRAGMA профиля на новом соединении SQLite."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in self.sqlite_pragma_statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    def warm_up(self, connections: int, engine=None) -> int:
+        """
+        Заранее открывает соединения пула, чтобы первые запросы не тратили время на их установку.
+
+        Для QueuePool количество ограничено pool_size: соединения сверх него пул закрывает при возврате.
+        Для остальных пулов открывается одно соединение, поскольку они не удерживают несколько соединений.
+
+        :param connections: Желаемое количество соединений.
+        :param engine: Движок для прогрева. По умолчанию текущий.
+        :return: Количество фактически открытых соединений.
+        """
+        engine = engine or self.engine
+        if isinstance(engine.pool, pool.QueuePool):
+            connections = min(connections, engine.pool.size())
+        else:
+            connections = min(connections, 1)
+
+        opened = []
+        try:
+            for _ in range(connections):
+                conn = engine.connect()
+                opened.append(conn)
+                conn.execute(text("SELECT 1"))
+        finally:
+            for conn in opened:
+                conn.close()
+        return len(opened)
 
     def test_connection(self) -> None:
         """Проверяет доступность базы данных."""
         try:
             with self.engine.connect() as conn:
-                conn.execute("SELECT 1")
+                conn.execute(text("SELECT 1"))
         except Exception as ex:
             raise RuntimeError("База данных недоступна.") from ex
 
@@ -36,4 +151,94 @@ class DatabaseEngine:
         """Возвращает движок, проверяя доступность при необходимости."""
         if ensure_available:
             self.test_connection()
-        return self.engine
\ No newline at end of file
+        return self.engine
+
+
+def _resolve_pool_class(pool_class: Union[str, Type[pool.Pool], None]) -> Optional[Type[pool.Pool]]:
+    """
+    Возвращает класс пула по имени из sqlalchemy.pool.
+
+    :raises ValueError: Если пул с таким именем не найден.
+    """
+    if pool_class is None or isinstance(pool_class, type):
+        return pool_class
+    resolved = getattr(pool, pool_class, None)
+    if not isinstance(resolved, type) or not issubclass(resolved, pool.Pool):
+        raise ValueError(f"Неизвестный класс пула соединений: {pool_class}")
+    return resolved
+
+
+def _instrumentation_from_config(config: DataBaseConfig) -> Optional[QueryInstrumentation]:
+    """Создаёт замеры запросов, если они включены в конфигурации или задан порог медленного запроса."""
+    if not config.instrumentation and config.slow_query_threshold_ms is None:
+        return None
+    return QueryInstrumentation(slow_query_threshold_ms=config.slow_query_threshold_ms)
+
+
+def _sqlite_pragmas_from_config(config: DataBaseConfig) -> dict:
+    """Собирает PRAGMA SQLite из конфигурации: профиль производительности и переопределения sqlite_*."""
+    pragmas = dict(SQLITE_PERFORMANCE_PRAGMAS) if config.sqlite_performance else {}
+    for name in _SQLITE_PRAGMA_NAMES:
+        value = getattr(config, f"sqlite_{name}")
+        if value is not None:
+            pragmas[name] = value
+    return pragmas
+
+
+def _sqlite_pragma_statements(pragmas: dict) -> list[str]:
+    """
+    Проверяет PRAGMA и формирует SQL для их выполнения. busy_timeout выполняется первым,
+    чтобы переключение journal_mode ожидало блокировку, а не завершалось ошибкой.
+
+    :raises ValueError: Если PRAGMA не поддерживается или значение не является числом или словом.
+    """
+    statements = []
+    for name in sorted(pragmas, key=lambda pragma: pragma != "busy_timeout"):
+        if name not in _SQLITE_PRAGMA_NAMES:
+            raise ValueError(f"Неподдерживаемая PRAGMA SQLite: {name}")
+        value = str(pragmas[name])
+        if not _SQLITE_PRAGMA_VALUE.match(value):
+            raise ValueError(f"Недопустимое значение PRAGMA {name}: {value!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+class AsyncDatabaseEngine:
+    """Класс для управления асинхронным движком базы данных (create_async_engine)."""
+
+    def __init__(self, url: str, echo: bool = False):
+        """
+        :param url: URL базы данных с асинхронным драйвером, например sqlite+aiosqlite:///file.db.
+        :param echo: Выводить ли выполняемые SQL-запросы.
+        """
+        self.url = url
+        self.echo = echo
+        try:
+            self.engine = self._create_engine()
+        except Exception as ex:
+            raise RuntimeError("Инициализация асинхронного движка базы данных не удалась.") from ex
+
+    def _create_engine(self):
+        """Вспомогательный метод для создания движка."""
+        return create_async_engine(self.url, echo=self.echo)
+
+    async def test_connection(self) -> None:
+        """Проверяет доступность базы данных."""
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as ex:
+            raise RuntimeError("База данных недоступна.") from ex
+
+    async def restart_engine(self, url: str = None, echo: bool = None) -> None:
+        """Перезапускает движок с новыми параметрами."""
+        await self.engine.dispose()
+        self.url = url or self.url
+        self.echo = echo if echo is not None else self.echo
+        self.engine = self._create_engine()
+
+    async def get_engine(self, ensure_available: bool = False):
+        """Возвращает движок, проверяя доступность при необходимости."""
+        if ensure_available:
+            await self.test_connection()
+        return self.engine
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Признак остановки в очереди операций: всё, что поставлено до него, будет выполнено.
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Групповая фиксация небольших записей: операции из разных потоков и задач asyncio собираются
+    в одну транзакцию DataBaseService.session_scope, которая фиксируется, когда набралось max_batch операций
+    или прошло max_delay секунд с первой операции пачки. Так один commit (и один fsync на SQLite)
+    приходится на всю пачку.
+
+    Операция — функция, принимающая сессию, например
+    ``lambda session: RemindersService(session).create(**data)``. Каждый вызывающий получает Future
+    со своим результатом или своей ошибкой; результат доступен только после commit пачки.
+    Объекты модели в результате не истекают после commit (expire_on_commit=False), но отсоединены от сессии.
+
+    Если пачка завершилась ошибкой (операция выбросила исключение или база отклонила commit), она откатывается,
+    и операции пачки повторяются по одной, каждая в своей транзакции: ошибка достаётся только своей операции.
+    Поэтому операция может выполниться дважды и не должна иметь побочных эффектов вне сессии.
+    """
+
+    def __init__(self, database_service, max_batch: int = 100, max_delay: float = 0.005):
+        """
+        :param database_service: DataBaseService, в сессиях которого выполняются пачки.
+        :param max_batch: Максимальное количество операций в одной транзакции. По умолчанию 100.
+        :param max_delay: Максимальное ожидание следующих операций после первой операции пачки в секундах.
+            По умолчанию 0.005.
+        :raises ValueError: Если max_batch меньше 1 или max_delay отрицателен.
+        """
+        if max_batch < 1:
+            raise ValueError(f"max_batch должен быть положительным, а не {max_batch}")
+        if max_delay < 0:
+            raise ValueError(f"max_delay не может быть отрицательным, а не {max_delay}")
+
+        self._database_service = database_service
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {"operations": 0, "batches": 0, "failed_batches": 0}
+
+    def start(self) -> None:
+        """
+        Запускает фоновый поток фиксации.
+
+        :raises RuntimeError: Если поток уже запущен.
+        """
+        with self._lock:
+            if self._thread is not None:
+                raise RuntimeError("GroupCommitWriter уже запущен")
+            self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Выполняет уже принятые операции и останавливает фоновый поток.
+
+        :param timeout: Максимальное время ожидания в секундах. None — ждать без ограничения.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def submit(self, operation: Callable[[Session], Any]) -> Future:
+        """
+        Ставит операцию в очередь ближайшей пачки.
+
+        :param operation: Функция, выполняющая запись в переданной сессии; её результат станет результатом Future.
+        :return: Future с результатом операции после commit или с её исключением.
+        :raises RuntimeError: Если поток фиксации не запущен.
+        """
+        future = Future()
+        with self._lock:
+            if self._thread is None:
+                raise RuntimeError("GroupCommitWriter не запущен")
+            self._queue.put((operation, future))
+        return future
+
+    def write(self, operation: Callable[[Session], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Выполняет операцию в ближайшей пачке и ждёт commit.
+
+        :param operation: Функция, выполняющая запись в переданной сессии.
+        :param timeout: Максимальное время ожидания в секундах. None — ждать без ограничения.
+        :return: Результат операции.
+        :raises RuntimeError: Если поток фиксации не запущен.
+        """
+        return self.submit(operation).result(timeout)
+
+    async def write_async(self, operation: Callable[[Session], Any]) -> Any:
+        """
+        Асинхронный вариант write: ожидание commit не блокирует цикл событий.
+
+        Операция выполняется в потоке фиксации, поэтому работает с обычной (синхронной) сессией.
+        """
+        return await asyncio.wrap_future(self.submit(operation))
+
+    def stats(self) -> dict:
+        """Возвращает количество зафиксированных операций и транзакций, а также пачек, завершившихся ошибкой."""
+        with self._lock:
+            return dict(self._counters)
+
+    def __enter__(self) -> "GroupCommitWriter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            batch = [(operation, future) for operation, future in batch if future.set_running_or_notify_cancel()]
+            if batch:
+                self._commit_batch(batch)
+
+    def _commit_batch(self, batch: list[tuple[Callable, Future]]) -> None:
+        """Выполняет пачку одной транзакцией, а при ошибке — каждую операцию в своей транзакции."""
+        try:
+            results = self._execute([operation for operation, _ in batch])
+        except Exception as ex:
+            with self._lock:
+                self._counters["failed_batches"] += 1
+            if len(batch) == 1:
+                batch[0][1].set_exception(ex)
+                return
+            logger.warning("Пачка из %d операций не зафиксирована, повтор по одной: %s", len(batch), ex)
+            for operation, future in batch:
+                try:
+                    result = self._execute([operation])[0]
+                except Exception as operation_ex:
+                    future.set_exception(operation_ex)
+                else:
+                    future.set_result(result)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _execute(self, operations: list[Callable]) -> list:
+        with self._database_service.session_scope() as session:
+            session.expire_on_commit = False
+            results = [operation(session) for operation in operations]
+        with self._lock:
+            self._counters["operations"] += len(operations)
+            self._counters["batches"] += 1
+        return results
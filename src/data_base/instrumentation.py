@@ -0,0 +1,195 @@
+import bisect
+import logging
+import re
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Ключ параметра выполнения, которым BaseCRUDService помечает запросы своей операцией, например "Users.read".
+OPERATION_OPTION = "crud_operation"
+# Ключ параметра выполнения соединения сессии со словарём {имя таблицы: операция} для INSERT, которые
+# отправляет flush: так объекты, добавленные BaseCRUDService.create, попадают в группу "Users.create".
+FLUSH_OPERATIONS_OPTION = "crud_flush_operations"
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"(?:\?|:\w+|%\(\w+\)s|%s|\$\d+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES \([^()]*\))(?:, \([^()]*\))+", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Приводит SQL к шаблону для группировки: литералы заменяются на ?, списки параметров IN (...)
+    и строки VALUES многострочного INSERT сворачиваются в один элемент.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _VALUES_ROWS.sub(r"\1", statement)
+
+
+class LatencyHistogram:
+    """Гистограмма задержек в миллисекундах с фиксированными границами корзин."""
+
+    BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+
+    def record(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(self.BOUNDS_MS, elapsed_ms)] += 1
+
+    def percentile(self, quantile: float) -> float:
+        """Оценивает перцентиль по верхней границе корзины, в которую он попадает (не больше максимума)."""
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                bound = self.BOUNDS_MS[index] if index < len(self.BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {**{f"le_{bound}": count for bound, count in zip(self.BOUNDS_MS, self.buckets)},
+                        "le_inf": self.buckets[-1]},
+        }
+
+
+class QueryInstrumentation:
+    """
+    Замеряет время выполнения запросов через события before_cursor_execute/after_cursor_execute движка
+    и время ожидания соединения из пула.
+
+    Задержки группируются по нормализованному SQL и операции сервиса (параметр выполнения crud_operation,
+    например "Users.read"). INSERT объектов, добавленных через create, отправляются при flush и получают
+    операцию по своей таблице из параметра crud_flush_operations соединения. Запросы дольше
+    slow_query_threshold_ms пишутся в журнал с уровнем WARNING.
+    """
+
+    def __init__(self, slow_query_threshold_ms: Optional[float] = None, max_statements: int = 1000):
+        """
+        :param slow_query_threshold_ms: Порог медленного запроса в миллисекундах. None — журнал отключён.
+        :param max_statements: Максимальное количество групп запросов; остальные учитываются в группе "<other>".
+        """
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._statements: dict[tuple[str, Optional[str]], LatencyHistogram] = {}
+        self._pool_checkout = LatencyHistogram()
+        self._slow_queries = 0
+
+    def attach(self, engine) -> None:
+        """
+        Подключает замеры к движку.
+
+        Ожидание соединения замеряется обёрткой над engine.raw_connection, через который Connection
+        получает соединение из пула, поэтому замер не теряется, когда engine.dispose() пересоздаёт пул.
+        """
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+            event.listen(engine, "handle_error", self._handle_error)
+
+        if "raw_connection" not in engine.__dict__:
+            engine.raw_connection = self._timed_checkout(engine.raw_connection)
+
+    def detach(self, engine) -> None:
+        """Отключает замеры запросов от движка."""
+        if event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+            event.remove(engine, "handle_error", self._handle_error)
+        engine.__dict__.pop("raw_connection", None)
+
+    def snapshot(self) -> dict:
+        """
+        Возвращает текущие метрики: гистограммы по группам запросов (от наибольшего суммарного времени),
+        гистограмму ожидания соединения из пула и количество медленных запросов.
+        """
+        with self._lock:
+            statements = [{"sql": sql, "operation": operation, **histogram.to_dict()}
+                          for (sql, operation), histogram in self._statements.items()]
+            pool_checkout = self._pool_checkout.to_dict()
+            slow_queries = self._slow_queries
+        statements.sort(key=lambda item: item["total_ms"], reverse=True)
+        return {"statements": statements, "pool_checkout": pool_checkout, "slow_queries": slow_queries}
+
+    def reset(self) -> None:
+        """Сбрасывает накопленные метрики."""
+        with self._lock:
+            self._statements.clear()
+            self._pool_checkout = LatencyHistogram()
+            self._slow_queries = 0
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+        operation = _operation(context)
+        key = (normalize_sql(statement), operation)
+
+        slow = self.slow_query_threshold_ms is not None and elapsed_ms >= self.slow_query_threshold_ms
+        with self._lock:
+            if key not in self._statements and len(self._statements) >= self.max_statements:
+                key = ("<other>", None)
+            self._statements.setdefault(key, LatencyHistogram()).record(elapsed_ms)
+            if slow:
+                self._slow_queries += 1
+
+        if slow:
+            logger.warning("Медленный запрос (%.1f мс, операция %s): %s", elapsed_ms, operation or "-", statement)
+
+    @staticmethod
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started_at"):
+            connection.info["query_started_at"].pop()
+
+    def _timed_checkout(self, raw_connection):
+        def timed_raw_connection():
+            started = time.perf_counter()
+            try:
+                return raw_connection()
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    self._pool_checkout.record(elapsed_ms)
+
+        return timed_raw_connection
+
+
+def _operation(context) -> Optional[str]:
+    """Возвращает операцию сервиса запроса: из его параметров, а для INSERT при flush — по таблице."""
+    if context is None:
+        return None
+    options = context.execution_options
+    operation = options.get(OPERATION_OPTION)
+    flush_operations = options.get(FLUSH_OPERATIONS_OPTION)
+    if operation is None and flush_operations and context.isinsert:
+        table = getattr(context.compiled.statement, "table", None)
+        operation = flush_operations.get(getattr(table, "name", None))
+    return operation
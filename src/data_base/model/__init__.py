@@ -1,3 +1,4 @@
 from .reminders import Reminders
+from .reminders_archive import RemindersArchive
 from .users import Users
 from .base_model import BaseModel
\ No newline at end of file
@@ -1,5 +1,19 @@
+from typing import Optional
+
 from sqlalchemy.orm import DeclarativeBase
 
 
 class BaseModel(DeclarativeBase):
-    pass
+
+    @classmethod
+    def prepare_bulk_updates(cls, updates: dict) -> Optional[dict]:
+        """
+        Возвращает значения для массового UPDATE по условию.
+
+        Модели с производными столбцами дополняют updates их значениями или возвращают None,
+        если производные значения нельзя вычислить без самих строк — тогда сервис обновляет
+        загруженные объекты по одному.
+
+        :param updates: Словарь с данными для обновления.
+        """
+        return updates
@@ -1,19 +1,89 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Index
+from sqlalchemy.orm import validates, relationship
 
 from .base_model import BaseModel
 from ..configuration.constrains import TableName
 
 
+def remind_at_for(event_date: datetime, remind_before: int) -> datetime:
+    """Вычисляет момент напоминания: за remind_before минут до event_date."""
+    return event_date - timedelta(minutes=remind_before)
+
+
+def _remind_at_default(context) -> Optional[datetime]:
+    """Значение remind_at по умолчанию для INSERT, в том числе массового, без объектов модели."""
+    parameters = context.get_current_parameters()
+    event_date, remind_before = parameters.get("event_date"), parameters.get("remind_before")
+    if event_date is None or remind_before is None:
+        return None
+    return remind_at_for(event_date, remind_before)
+
+
 class Reminders(BaseModel):
     __tablename__ = TableName.REMINDERS.value
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey(f"{TableName.USERS.value}.id"), nullable=False)
+    # Индекс нужен для загрузки напоминаний пользователей (selectinload: WHERE user_id IN (...)) и выборки по пользователю.
+    user_id = Column(Integer, ForeignKey(f"{TableName.USERS.value}.id"), nullable=False, index=True)
     task_description = Column(String(250), nullable=False)
     event_date = Column(DateTime, nullable=False)
+    # Количество минут до event_date, за которое нужно напомнить.
     remind_before = Column(Integer, nullable=False)
+    # event_date - remind_before. Полный индекс по remind_at нужен архиватору: он выбирает напоминания
+    # независимо от отправки, поэтому частичный индекс ниже ему не подходит.
+    remind_at = Column(DateTime, nullable=False, index=True, default=_remind_at_default)
+    # Аренда напоминания обработчиком рассылки (см. RemindersService.claim_due) и момент отправки.
+    leased_by = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    dispatched_at = Column(DateTime, nullable=True)
+
+    user = relationship("Users", back_populates="reminders")
+
+    __table_args__ = (
+        # Частичный индекс только по неотправленным напоминаниям для fetch_due и claim_due: отправленные
+        # не замедляют выборку на рассылку. Условие запросов должно содержать dispatched_at IS NULL.
+        # id во втором столбце отдаёт порядок (remind_at, id) курсора fetch_due без сортировки.
+        Index("ix_reminders_pending_remind_at", "remind_at", "id",
+              sqlite_where=dispatched_at.is_(None), postgresql_where=dispatched_at.is_(None)),
+        # id переносится в reminders_archive как первичный ключ, поэтому не должен повторно выдаваться
+        # после удаления архиватором: без AUTOINCREMENT SQLite выдаёт освободившийся максимальный rowid.
+        {"sqlite_autoincrement": True},
+    )
+
+    @validates("event_date", "remind_before")
+    def _sync_remind_at(self, key, value):
+        event_date = value if key == "event_date" else self.event_date
+        remind_before = value if key == "remind_before" else self.remind_before
+        if event_date is not None and remind_before is not None:
+            self.remind_at = remind_at_for(event_date, remind_before)
+        return value
+
+    @classmethod
+    def prepare_bulk_updates(cls, updates: dict) -> Optional[dict]:
+        """
+        Дополняет updates значением remind_at, если заданы и event_date, и remind_before.
+        Если задано только одно из них, remind_at зависит от строки, поэтому возвращается None.
+
+        :raises TypeError: Если event_date или remind_before заданы не значениями, а SQL-выражениями.
+        """
+        if "event_date" not in updates and "remind_before" not in updates:
+            return updates
+
+        event_date, remind_before = updates.get("event_date"), updates.get("remind_before")
+        if event_date is not None and not isinstance(event_date, datetime) \
+                or remind_before is not None and not isinstance(remind_before, int):
+            raise TypeError("event_date и remind_before должны обновляться значениями, а не SQL-выражениями")
+
+        if event_date is None or remind_before is None:
+            return None
+        return {**updates, "remind_at": remind_at_for(event_date, remind_before)}
 
     def __repr__(self) -> str:
         return (f"{TableName.REMINDERS.value}(id={self.id}, user_id={self.user_id},"
                 f" task_description={self.task_description}, event_date={self.event_date},"
-                f" remind_before={self.remind_before})")
+                f" remind_before={self.remind_before}, remind_at={self.remind_at},"
+                f" leased_by={self.leased_by}, lease_expires_at={self.lease_expires_at},"
+                f" dispatched_at={self.dispatched_at})")
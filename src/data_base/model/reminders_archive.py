@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String
+
+from .base_model import BaseModel
+from ..configuration.constrains import TableName
+
+
+class RemindersArchive(BaseModel):
+    """
+    Напоминания, перенесённые из reminders архиватором (см. RemindersArchiver).
+
+    Столбцы повторяют Reminders, id сохраняется исходный, поэтому строка однозначно соответствует
+    удалённому из reminders напоминанию.
+    """
+    __tablename__ = TableName.REMINDERS_ARCHIVE.value
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey(f"{TableName.USERS.value}.id"), nullable=False, index=True)
+    task_description = Column(String(250), nullable=False)
+    event_date = Column(DateTime, nullable=False, index=True)
+    remind_before = Column(Integer, nullable=False)
+    remind_at = Column(DateTime, nullable=False)
+    leased_by = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    dispatched_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    def __repr__(self) -> str:
+        return (f"{TableName.REMINDERS_ARCHIVE.value}(id={self.id}, user_id={self.user_id},"
+                f" task_description={self.task_description}, event_date={self.event_date},"
+                f" remind_before={self.remind_before}, remind_at={self.remind_at},"
+                f" dispatched_at={self.dispatched_at}, archived_at={self.archived_at})")
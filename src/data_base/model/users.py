@@ -1,5 +1,7 @@
-from sqlalchemy.sql import func
+from datetime import datetime, timezone
+
 from sqlalchemy import Column, Integer, String, DateTime, CheckConstraint
+from sqlalchemy.orm import relationship
 
 from .base_model import BaseModel
 from ..configuration.constrains import TableName
@@ -10,10 +12,13 @@ class Users(BaseModel):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     nickname = Column(String(50), nullable=False, unique=True)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
     name = Column(String(50), nullable=False)
     surname = Column(String(50), nullable=False)
 
+    # Загружается лениво; для списка пользователей используйте BaseCRUDService.read(load=...), чтобы избежать N+1.
+    reminders = relationship("Reminders", back_populates="user", order_by="Reminders.remind_at")
+
     __table_args__ = (
         CheckConstraint("nickname <> ''", name="check_nickname_not_empty"),
         CheckConstraint("name <> ''", name="check_name_not_empty"),
@@ -0,0 +1,102 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+
+class ReplicaRouter:
+    """
+    Распределяет сессии только для чтения между репликами.
+
+    Реплика, не ответившая на проверку доступности, исключается из выбора на retry_interval секунд.
+    Если доступных реплик нет, используется основной движок.
+    """
+
+    STRATEGIES = ("round_robin", "least_busy")
+
+    def __init__(self, primary, replicas: list, strategy: str = "round_robin",
+                 retry_interval: float = 30.0, health_check_interval: float = 5.0):
+        """
+        :param primary: Движок основной базы данных.
+        :param replicas: Список движков реплик.
+        :param strategy: Стратегия выбора: "round_robin" — по кругу, "least_busy" — с наименьшим числом активных сессий.
+        :param retry_interval: Сколько секунд недоступная реплика исключается из выбора.
+        :param health_check_interval: Как часто в секундах проверять доступность реплики.
+        :raises ValueError: Если стратегия неизвестна.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия выбора реплики: {strategy}")
+
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.retry_interval = retry_interval
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._rotation = itertools.count()
+        self._in_flight = {id(engine): 0 for engine in self.replicas}
+        self._unhealthy_until = {id(engine): 0.0 for engine in self.replicas}
+        self._checked_at = {id(engine): float("-inf") for engine in self.replicas}
+
+    @contextmanager
+    def acquire(self):
+        """
+        Выбирает движок для сессии только для чтения и учитывает его как занятый до выхода из контекста.
+
+        :return: Движок реплики или основной движок, если доступных реплик нет.
+        """
+        engine = self._choose()
+        if engine is self.primary:
+            yield engine
+            return
+
+        with self._lock:
+            self._in_flight[id(engine)] += 1
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                self._in_flight[id(engine)] -= 1
+
+    def mark_unhealthy(self, engine) -> None:
+        """Исключает реплику из выбора на retry_interval секунд."""
+        with self._lock:
+            self._unhealthy_until[id(engine)] = time.monotonic() + self.retry_interval
+
+    def healthy_replicas(self) -> list:
+        """Возвращает реплики, не исключённые из выбора."""
+        now = time.monotonic()
+        return [engine for engine in self.replicas if self._unhealthy_until[id(engine)] <= now]
+
+    def _choose(self):
+        for engine in self._candidates():
+            if self._is_available(engine):
+                return engine
+        return self.primary
+
+    def _candidates(self) -> list:
+        """Возвращает доступные реплики в порядке предпочтения согласно стратегии."""
+        candidates = self.healthy_replicas()
+        if not candidates:
+            return []
+        if self.strategy == "least_busy":
+            with self._lock:
+                return sorted(candidates, key=lambda engine: self._in_flight[id(engine)])
+        start = next(self._rotation) % len(candidates)
+        return candidates[start:] + candidates[:start]
+
+    def _is_available(self, engine) -> bool:
+        """Проверяет реплику запросом SELECT 1, если с прошлой проверки прошло больше health_check_interval."""
+        now = time.monotonic()
+        if now - self._checked_at[id(engine)] < self.health_check_interval:
+            return True
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception:
+            self.mark_unhealthy(engine)
+            return False
+        self._checked_at[id(engine)] = now
+        return True
@@ -0,0 +1,86 @@
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+
+from .configuration import DataBaseConfig
+
+# Коды SQLSTATE PostgreSQL, после которых транзакцию безопасно повторить целиком:
+# serialization_failure, deadlock_detected и lock_not_available (NOWAIT / lock_timeout).
+POSTGRESQL_RETRYABLE_SQLSTATES = frozenset({"40001", "40P01", "55P03"})
+
+# Коды SQLite «база занята» и «таблица заблокирована», включая расширенные (SQLITE_BUSY_SNAPSHOT и т. п.).
+SQLITE_RETRYABLE_ERRORS = ("SQLITE_BUSY", "SQLITE_LOCKED")
+SQLITE_RETRYABLE_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Параметры повтора транзакции: не более max_attempts попыток с экспоненциальной задержкой
+    base_delay * multiplier ** (n - 1) перед n-м повтором, ограниченной max_delay. С jitter задержка
+    выбирается случайно от 0 до расчётной (full jitter).
+    """
+    max_attempts: int = 5
+    base_delay: float = 0.01
+    max_delay: float = 1.0
+    multiplier: float = 2.0
+    jitter: bool = True
+
+    def __post_init__(self):
+        """:raises ValueError: Если max_attempts меньше 1, задержки отрицательны или multiplier меньше 1."""
+        if self.max_attempts < 1:
+            raise ValueError(f"max_attempts должен быть положительным, а не {self.max_attempts}")
+        if self.base_delay < 0 or self.max_delay < 0:
+            raise ValueError(f"Задержки не могут быть отрицательными: base_delay={self.base_delay}, "
+                             f"max_delay={self.max_delay}")
+        if self.multiplier < 1:
+            raise ValueError(f"multiplier должен быть не меньше 1, а не {self.multiplier}")
+
+    @classmethod
+    def from_config(cls, config: DataBaseConfig) -> "RetryPolicy":
+        """Создаёт политику по параметрам retry_* конфигурации."""
+        return cls(max_attempts=config.retry_max_attempts, base_delay=config.retry_base_delay,
+                   max_delay=config.retry_max_delay, multiplier=config.retry_multiplier,
+                   jitter=config.retry_jitter)
+
+    def delay(self, retry: int, rng: Optional[random.Random] = None) -> float:
+        """
+        Возвращает задержку перед повтором.
+
+        :param retry: Номер повтора, начиная с 1.
+        :param rng: Генератор случайных чисел для jitter. По умолчанию модуль random.
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        if self.jitter:
+            delay = (rng or random).uniform(0, delay)
+        return delay
+
+
+def is_retryable(exception: BaseException, dialect_name: str) -> bool:
+    """
+    Проверяет, вызвана ли ошибка конфликтом блокировок или сериализации, после которого
+    транзакцию можно повторить: "database is locked" на SQLite, serialization_failure, deadlock_detected
+    и lock_not_available на PostgreSQL. Ошибки других диалектов не повторяются.
+
+    :param exception: Исключение, которым завершилась транзакция.
+    :param dialect_name: Имя диалекта движка (engine.dialect.name).
+    """
+    if not isinstance(exception, DBAPIError) or exception.orig is None:
+        return False
+    orig = exception.orig
+
+    if dialect_name == "sqlite":
+        error_name = getattr(orig, "sqlite_errorname", None)
+        if error_name is not None:
+            return error_name.startswith(SQLITE_RETRYABLE_ERRORS)
+        message = str(orig).lower()
+        return any(text in message for text in SQLITE_RETRYABLE_MESSAGES)
+
+    if dialect_name == "postgresql":
+        # pgcode — psycopg2, sqlstate — psycopg 3 и asyncpg.
+        sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+        return sqlstate in POSTGRESQL_RETRYABLE_SQLSTATES
+
+    return False
@@ -0,0 +1,125 @@
+from typing import Type, TypeVar, Generic, Optional, Any
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import BinaryExpression
+
+from src.data_base.model.base_model import BaseModel
+from src.data_base.service_model.base_service import _where_clause, _read_statement, _loader_options, \
+    _projection_columns, _shape_rows, _check_shape
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class AsyncBaseCRUDService(Generic[T]):
+    """Асинхронный аналог BaseCRUDService для работы через AsyncSession."""
+
+    def __init__(self, session: AsyncSession, model: Type[T]):
+        """
+        :param session: Асинхронная сессия SQLAlchemy.
+        :param model: Класс модели базы данных.
+        """
+        self._session = session
+        self._model = model
+
+    async def create(self, **kwargs) -> T:
+        """
+        Создание новой записи в базе данных.
+
+        Запись добавляется в сессию и отправляется в базу при flush или commit.
+
+        :param kwargs: Данные для создания новой записи. Имя поля: значение.
+        :return: Созданный объект модели.
+        """
+        instance = self._model(**kwargs)
+        self._session.add(instance)
+        return instance
+
+    async def delete(self, **filters) -> int:
+        """
+        Удаление записей из базы данных на основе фильтров.
+
+        :param filters: Условия фильтрации для удаления записей.  Ключи — имена полей, значения — условия фильтрации.
+        :return: Количество удалённых записей.
+        """
+        stmt = delete(self._model).filter_by(**filters).execution_options(synchronize_session="fetch")
+        result = await self._session.execute(stmt)
+        return result.rowcount
+
+    async def update(self, filters: list[Any], updates: dict, use_or: bool = False) -> int:
+        """
+        Обновляет записи в базе данных на основе заданных условий и значений для обновления.
+
+        :param filters: Список условий фильтрации SQLAlchemy.
+        :param updates: Словарь с данными для обновления.
+        :param use_or: Если True, применяет логическое "или" к фильтрам; иначе применяет "и". По умолчанию False.
+        :raises TypeError: Если filters не является списком, updates не является словарём или filters содержит элементы, не являющиеся SQLAlchemy условиями фильтрации.
+        :raises ValueError: Если filters пуст или updates не содержит данных.
+        """
+        if not isinstance(filters, list):
+            raise TypeError(f"filters должен быть списком, а не {type(filters).__name__}")
+
+        if not filters:
+            raise ValueError("Не переданы условия фильтрации")
+
+        where_clause = _where_clause(filters, use_or)
+
+        if not isinstance(updates, dict):
+            raise TypeError(f"updates должен быть словарём, а не {type(updates).__name__}")
+
+        if not updates:
+            raise ValueError("Не переданы данные для обновления")
+
+        bulk_updates = self._model.prepare_bulk_updates(updates)
+        if bulk_updates is None:
+            instances = (await self._session.scalars(select(self._model).where(where_clause))).all()
+            for instance in instances:
+                for key, value in updates.items():
+                    setattr(instance, key, value)
+            return len(instances)
+
+        stmt = update(self._model).where(where_clause).values(bulk_updates)
+        result = await self._session.execute(stmt.execution_options(synchronize_session="fetch"))
+        return result.rowcount
+
+    async def read(self,
+                   filters: Optional[list[BinaryExpression]] = None,
+                   use_or: bool = False,
+                   order_by=None,
+                   limit: int = None,
+                   offset: int = None,
+                   load=None,
+                   columns: Optional[list] = None,
+                   shape: str = "row") -> list:
+        """
+        Читает данные из базы данных с использованием заданных фильтров, сортировки, лимита и смещения.
+
+        :param filters: Список условий фильтрации SQLAlchemy, опционально.
+        :param use_or: Определяет, использовать ли логическое "ИЛИ" вместо "И" при применении фильтров. По умолчанию False.
+        :param order_by: Порядок сортировки. Может быть одиночным условием или списком условий.
+        :param limit: Максимальное количество возвращаемых записей. Опционально.
+        :param offset: Смещение записей. Опционально.
+        :param load: Связи для предварительной загрузки в формате BaseCRUDService.read. Ленивая загрузка
+            в AsyncSession недоступна, поэтому связи, к которым обращается вызывающий код, нужно указать здесь.
+        :param columns: Столбцы для выборки без создания объектов модели в формате BaseCRUDService.read.
+        :param shape: Вид строк при заданном columns: "row", "dict" или "dataclass". По умолчанию "row".
+        :raises TypeError: Если переданные фильтры не являются списком или содержат некорректные условия.
+        :raises ValueError: Если связь или столбец не найдены в модели, стратегия загрузки или shape неизвестны,
+            либо load передан вместе с columns.
+        """
+        if columns is not None:
+            if load is not None:
+                raise ValueError("load нельзя использовать вместе с columns")
+            columns = _projection_columns(self._model, columns)
+            _check_shape(shape)
+            result = await self._session.execute(
+                _read_statement(self._model, filters, use_or, order_by, limit, offset, columns))
+            return _shape_rows(self._model, [column.key for column in columns], result.all(), shape)
+
+        stmt = _read_statement(self._model, filters, use_or, order_by, limit, offset)
+        if load is not None:
+            stmt = stmt.options(*_loader_options(self._model, load))
+            result = await self._session.scalars(stmt)
+            return list(result.unique().all())
+        result = await self._session.scalars(stmt)
+        return list(result.all())
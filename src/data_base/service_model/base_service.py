@@ -1,22 +1,41 @@
-from sqlalchemy.orm import Session
-from typing import Type, TypeVar, Generic, Optional, Any, Union
+from dataclasses import make_dataclass
+from functools import lru_cache
+
+from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy.orm.interfaces import LoaderOption
+from typing import Type, TypeVar, Generic, Optional, Any, Union, Iterable, Iterator
 from sqlalchemy.sql.expression import BinaryExpression
 from src.data_base.model.base_model import BaseModel
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, insert, inspect, select, update, delete, func, literal, event
+from sqlalchemy.sql.elements import Label, ColumnElement
+from src.data_base.dialects import UPSERT_DIALECTS
+from src.data_base.instrumentation import OPERATION_OPTION, FLUSH_OPERATIONS_OPTION
+from src.data_base.service_model.pagination import order_by_columns, order_by_clauses, keyset_condition, \
+    columns_signature, row_values, encode_cursor, decode_cursor
+from src.data_base.service_model.query_cache import QueryCache, statement_cache_key, snapshot_instances, \
+    restore_instances
 
 T = TypeVar("T", bound=BaseModel)
 
+ROW_SHAPES = ("row", "dict", "dataclass")
+SYNCHRONIZE_SESSION = ("evaluate", "fetch", False, None)
+LOAD_STRATEGIES = {"selectin": selectinload, "joined": joinedload}
+
 
 class BaseCRUDService(Generic[T]):
     """Базовый класс для реализации CRUD (Create, Read, Update, Delete) операций."""
 
-    def __init__(self, session: Session, model: Type[T]):
+    def __init__(self, session: Session, model: Type[T], cache: Optional[QueryCache] = None):
         """
         :param session: Сессия SQLAlchemy.
         :param model: Класс модели базы данных.
+        :param cache: Кэш результатов read, общий для сервисов разных сессий. По умолчанию кэш не используется.
         """
         self._session = session
         self._model = model
+        self._cache = cache
+        if cache is not None:
+            cache.watch(session)
 
     def create(self, **kwargs) -> T:
         """
@@ -27,8 +46,162 @@ class BaseCRUDService(Generic[T]):
         """
         instance = self._model(**kwargs)
         self._session.add(instance)
+        self._label_flush("create")
+        self._invalidate_cache()
         return instance
 
+    def create_many(self, rows: Iterable[dict], batch_size: int = 1000,
+                    return_ids: bool = False) -> Union[int, list[Any]]:
+        """
+        Массовое создание записей через Core insert() пачками по batch_size строк.
+
+        В отличие от create, объекты модели не создаются и не попадают в сессию: каждая пачка
+        отправляется одним executemany (insertmanyvalues на SQLite и PostgreSQL).
+
+        :param rows: Итерируемый набор словарей с данными записей. Имя поля: значение.
+        :param batch_size: Максимальное количество строк в одном INSERT. По умолчанию 1000.
+        :param return_ids: Если True, возвращает список сгенерированных первичных ключей в порядке rows.
+        :return: Количество вставленных записей или список первичных ключей.
+        :raises ValueError: Если batch_size меньше 1.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size должен быть положительным, а не {batch_size}")
+
+        stmt = self._labeled(insert(self._model), "create")
+        if return_ids:
+            primary_key = inspect(self._model).primary_key[0]
+            stmt = stmt.returning(primary_key, sort_by_parameter_order=True)
+
+        self._invalidate_cache()
+        ids = []
+        inserted_count = 0
+        for batch in _batched(rows, batch_size):
+            if return_ids:
+                ids.extend(self._session.scalars(stmt, batch).all())
+            else:
+                self._session.execute(stmt, batch)
+            inserted_count += len(batch)
+
+        return ids if return_ids else inserted_count
+
+    def upsert(self, conflict_target: Optional[list] = None, update_columns: Optional[list] = None,
+               **values) -> Optional[T]:
+        """
+        Вставляет запись или, при конфликте по conflict_target, обновляет существующую одним запросом
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING (SQLite и PostgreSQL).
+
+        :param conflict_target: Столбцы (атрибуты или имена полей) уникального ограничения, по которому
+            определяется конфликт. По умолчанию — уникальный столбец модели, а если его нет, первичный ключ.
+        :param update_columns: Столбцы, обновляемые при конфликте. По умолчанию — все переданные столбцы,
+            кроме conflict_target и первичного ключа. Пустой список — ON CONFLICT DO NOTHING.
+        :param values: Данные записи. Имя поля: значение.
+        :return: Вставленный или обновлённый объект модели; None, если при DO NOTHING запись уже была.
+        :raises ValueError: Если поле не является столбцом модели.
+        :raises NotImplementedError: Если диалект базы не поддерживает ON CONFLICT.
+        """
+        stmt, _ = self._upsert_statement(values, conflict_target, update_columns, orm_entity=True)
+        stmt = stmt.values(values)
+        stmt = stmt.returning(self._model).execution_options(populate_existing=True)
+        self._invalidate_cache()
+        return self._session.scalars(stmt).one_or_none()
+
+    def upsert_many(self, rows: Iterable[dict], conflict_target: Optional[list] = None,
+                    update_columns: Optional[list] = None, batch_size: int = 1000,
+                    return_ids: bool = False) -> Union[int, list[Any]]:
+        """
+        Массовая вставка с обновлением существующих записей (INSERT ... ON CONFLICT DO UPDATE)
+        пачками по batch_size строк, как в create_many: каждая пачка отправляется одним executemany,
+        который SQLAlchemy собирает в многострочные INSERT ... VALUES (insertmanyvalues).
+
+        Все строки должны содержать одинаковый набор полей, включая conflict_target. Объекты модели
+        не создаются; уже загруженные в сессию объекты не обновляются, перечитайте их при необходимости.
+        На PostgreSQL значения conflict_target внутри одной пачки должны быть уникальны.
+
+        :param rows: Итерируемый набор словарей с данными записей. Имя поля: значение.
+        :param conflict_target: Столбцы уникального ограничения, как в upsert.
+        :param update_columns: Обновляемые при конфликте столбцы, как в upsert.
+        :param batch_size: Максимальное количество строк в одном executemany. По умолчанию 1000.
+        :param return_ids: Если True, возвращает первичные ключи записей в порядке rows; для строк,
+            пропущенных при DO NOTHING, возвращается None.
+        :return: Количество вставленных и обновлённых записей или список первичных ключей.
+        :raises ValueError: Если batch_size меньше 1, поле не является столбцом модели
+            или в строке нет полей conflict_target.
+        :raises NotImplementedError: Если диалект базы не поддерживает ON CONFLICT.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size должен быть положительным, а не {batch_size}")
+
+        self._invalidate_cache()
+        stmt = target_keys = None
+        ids = []
+        affected_count = 0
+        for batch in _batched(rows, batch_size):
+            if stmt is None:
+                stmt, target_keys = self._upsert_statement(batch[0], conflict_target, update_columns)
+                if return_ids:
+                    table_columns = self._model.__table__.c
+                    primary_key = inspect(self._model).primary_key[0]
+                    stmt = stmt.returning(primary_key, *(table_columns[key] for key in target_keys))
+
+            for row in batch:
+                if not all(key in row for key in target_keys):
+                    raise ValueError(f"Строка должна содержать поля conflict_target {target_keys}: {row}")
+
+            result = self._session.execute(stmt, batch)
+            if return_ids:
+                # Порядок RETURNING для ON CONFLICT не гарантирован, поэтому ключи сопоставляются
+                # со строками по значениям conflict_target.
+                returned = {tuple(returned_row[1:]): returned_row[0] for returned_row in result}
+                ids.extend(returned.get(tuple(row[key] for key in target_keys)) for row in batch)
+            else:
+                affected_count += result.rowcount
+
+        return ids if return_ids else affected_count
+
+    def _upsert_statement(self, row: dict, conflict_target: Optional[list], update_columns: Optional[list],
+                          orm_entity: bool = False):
+        """
+        Строит INSERT ... ON CONFLICT для диалекта сессии по набору полей строки row.
+
+        Без orm_entity запрос строится по Core-таблице для executemany без ORM-обработки строк.
+        С orm_entity RETURNING модели возвращает объекты.
+
+        :return: Кортеж из запроса без VALUES и имён полей conflict_target.
+        """
+        dialect = self._session.get_bind().dialect.name
+        if dialect not in UPSERT_DIALECTS:
+            raise NotImplementedError(f"upsert не поддерживается для диалекта {dialect}")
+
+        mapper = inspect(self._model)
+        if conflict_target is None:
+            unique = [column for column in self._model.__table__.columns if column.unique]
+            target_keys = [unique[0].key] if unique else [column.key for column in mapper.primary_key]
+        else:
+            target_keys = [column.key for column in _projection_columns(self._model, conflict_target)]
+
+        if update_columns is None:
+            primary_keys = {column.key for column in mapper.primary_key}
+            update_keys = [key for key in row if key not in target_keys and key not in primary_keys]
+        elif update_columns:
+            update_keys = [column.key for column in _projection_columns(self._model, update_columns)]
+        else:
+            update_keys = []
+
+        if update_keys:
+            # Производные столбцы модели (например, Reminders.remind_at) обновляются вместе с исходными.
+            prepared = self._model.prepare_bulk_updates({key: row[key] for key in update_keys if key in row})
+            if prepared is None:
+                raise ValueError(f"Столбцы {update_keys} нельзя обновить при конфликте без связанных с ними полей")
+            update_keys += [key for key in prepared if key not in update_keys]
+
+        stmt = UPSERT_DIALECTS[dialect](self._model if orm_entity else self._model.__table__)
+        if update_keys:
+            stmt = stmt.on_conflict_do_update(index_elements=target_keys,
+                                              set_={key: stmt.excluded[key] for key in update_keys})
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=target_keys)
+        return self._labeled(stmt, "upsert"), target_keys
+
     def delete(self, **filters) -> int:
         """
         Удаление записей из базы данных на основе фильтров.
@@ -36,14 +209,18 @@ class BaseCRUDService(Generic[T]):
         :param filters: Условия фильтрации для удаления записей.  Ключи — имена полей, значения — условия фильтрации.
         :return: Количество удалённых записей.
         """
-        query = self._session.query(self._model).filter_by(**filters)
-        deleted_count = query.delete(synchronize_session="fetch")
-        return deleted_count
+        stmt = self._labeled(delete(self._model).filter_by(**filters), "delete")
+        stmt = stmt.execution_options(synchronize_session="fetch")
+        self._invalidate_cache()
+        return self._session.execute(stmt).rowcount
 
     def update(self, filters: list[Any], updates: dict, use_or: bool = False, ) -> int:
         """
         Обновляет записи в базе данных на основе заданных условий и значений для обновления.
 
+        Обычно выполняется одним UPDATE. Если модель не может вычислить производные столбцы без самих строк
+        (см. BaseModel.prepare_bulk_updates), записи загружаются и обновляются как объекты.
+
         :param filters: Список условий фильтрации SQLAlchemy.
         :param updates: Словарь с данными для обновления.
         :param use_or: Если True, применяет логическое "или" к фильтрам; иначе применяет "и". По умолчанию False.
@@ -56,8 +233,7 @@ class BaseCRUDService(Generic[T]):
         if not filters:
             raise ValueError("Не переданы условия фильтрации")
 
-        if not all(isinstance(f, BinaryExpression) for f in filters):
-            raise TypeError("filters должен содержать только условия фильтрации SQLAlchemy")
+        where_clause = _where_clause(filters, use_or)
 
         if not isinstance(updates, dict):
             raise TypeError(f"updates должен быть словарём, а не {type(updates).__name__}")
@@ -65,17 +241,97 @@ class BaseCRUDService(Generic[T]):
         if not updates:
             raise ValueError("Не переданы данные для обновления")
 
-        query = self._session.query(self._model)
-        query = query.filter(or_(*filters) if use_or else and_(*filters))
-        updated_count = query.update(updates, synchronize_session="fetch")
+        self._invalidate_cache()
+        bulk_updates = self._model.prepare_bulk_updates(updates)
+        if bulk_updates is None:
+            return self._update_instances(where_clause, updates)
+
+        stmt = self._labeled(update(self._model).where(where_clause).values(bulk_updates), "update")
+        return self._session.execute(stmt.execution_options(synchronize_session="fetch")).rowcount
+
+    def delete_by_ids(self, ids: Iterable[Any], chunk_size: int = 500,
+                      synchronize_session: Union[str, bool] = "evaluate") -> int:
+        """
+        Удаляет записи по первичному ключу запросами DELETE ... WHERE id IN (...) по chunk_size ключей.
+
+        :param ids: Первичные ключи удаляемых записей. Повторы учитываются один раз.
+        :param chunk_size: Максимальное количество ключей в одном IN. По умолчанию 500.
+        :param synchronize_session: Синхронизация объектов сессии: "evaluate" — без запросов, по условию IN
+            (по умолчанию), "fetch" — по ключам, полученным из базы (RETURNING или дополнительный SELECT),
+            False или None — без синхронизации, если удаляемые объекты не загружены в сессию.
+        :return: Количество удалённых записей.
+        :raises ValueError: Если chunk_size меньше 1 или synchronize_session неизвестен.
+        """
+        primary_key = self._by_ids_primary_key(chunk_size, synchronize_session)
+        self._invalidate_cache()
+        deleted_count = 0
+        for chunk in _batched(dict.fromkeys(ids), chunk_size):
+            stmt = self._labeled(delete(self._model).where(primary_key.in_(chunk)), "delete")
+            deleted_count += self._session.execute(
+                stmt.execution_options(synchronize_session=synchronize_session or False)).rowcount
+        return deleted_count
+
+    def update_by_ids(self, ids: Iterable[Any], updates: dict, chunk_size: int = 500,
+                      synchronize_session: Union[str, bool] = "evaluate") -> int:
+        """
+        Обновляет записи по первичному ключу запросами UPDATE ... WHERE id IN (...) по chunk_size ключей.
+
+        Если модель не может вычислить производные столбцы без самих строк (см. BaseModel.prepare_bulk_updates),
+        записи каждой пачки загружаются и обновляются как объекты, и synchronize_session не используется.
+
+        :param ids: Первичные ключи обновляемых записей. Повторы учитываются один раз.
+        :param updates: Словарь с данными для обновления.
+        :param chunk_size: Максимальное количество ключей в одном IN. По умолчанию 500.
+        :param synchronize_session: Синхронизация объектов сессии, как в delete_by_ids.
+        :return: Количество обновлённых записей.
+        :raises TypeError: Если updates не является словарём.
+        :raises ValueError: Если updates пуст, chunk_size меньше 1 или synchronize_session неизвестен.
+        """
+        primary_key = self._by_ids_primary_key(chunk_size, synchronize_session)
+        if not isinstance(updates, dict):
+            raise TypeError(f"updates должен быть словарём, а не {type(updates).__name__}")
+        if not updates:
+            raise ValueError("Не переданы данные для обновления")
+
+        self._invalidate_cache()
+        bulk_updates = self._model.prepare_bulk_updates(updates)
+        updated_count = 0
+        for chunk in _batched(dict.fromkeys(ids), chunk_size):
+            where_clause = primary_key.in_(chunk)
+            if bulk_updates is None:
+                updated_count += self._update_instances(where_clause, updates)
+                continue
+            stmt = self._labeled(update(self._model).where(where_clause).values(bulk_updates), "update")
+            updated_count += self._session.execute(
+                stmt.execution_options(synchronize_session=synchronize_session or False)).rowcount
         return updated_count
 
+    def _by_ids_primary_key(self, chunk_size: int, synchronize_session: Union[str, bool]):
+        """
+        Проверяет аргументы delete_by_ids/update_by_ids и возвращает столбец первичного ключа.
+
+        :raises ValueError: Если chunk_size меньше 1, synchronize_session неизвестен или первичный ключ составной.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size должен быть положительным, а не {chunk_size}")
+        if synchronize_session not in SYNCHRONIZE_SESSION:
+            raise ValueError(f"Неизвестный synchronize_session {synchronize_session!r}, "
+                             f"ожидается один из {SYNCHRONIZE_SESSION}")
+
+        primary_keys = inspect(self._model).primary_key
+        if len(primary_keys) != 1:
+            raise ValueError(f"Модель {self._model.__name__} имеет составной первичный ключ")
+        return getattr(self._model, primary_keys[0].key)
+
     def read(self,
              filters: Optional[list[BinaryExpression]] = None,
              use_or: bool = False,
              order_by = None,
              limit: int = None,
-             offset: int = None) -> list[T]:
+             offset: int = None,
+             load=None,
+             columns: Optional[list] = None,
+             shape: str = "row") -> list:
         """
         Читает данные из базы данных с использованием заданных фильтров, сортировки, лимита и смещения.
 
@@ -84,29 +340,418 @@ class BaseCRUDService(Generic[T]):
         :param order_by: Порядок сортировки. Может быть одиночным условием или списком условий.
         :param limit: Максимальное количество возвращаемых записей. Опционально.
         :param offset: Смещение записей. Опционально.
+        :param load: Связи для предварительной загрузки, опционально. Связь (атрибут или имя) загружается
+            через selectinload — одним дополнительным запросом на все строки. Словарь {связь: "selectin" | "joined"}
+            задаёт стратегию для каждой связи. Также принимаются готовые опции загрузки и список любых из них.
+            С load кэш результатов не используется.
+        :param columns: Столбцы (атрибуты модели или имена полей) для выборки без создания объектов модели.
+            Строки не попадают в сессию, а изменения в них не сохраняются. Опционально.
+        :param shape: Вид строк при заданном columns: "row" — Row (кортеж с доступом по имени),
+            "dict" — словари, "dataclass" — неизменяемые dataclass со __slots__. По умолчанию "row".
+        :return: Список объектов модели или, при заданном columns, список строк вида shape.
         :raises TypeError: Если переданные фильтры не являются списком или содержат некорректные условия.
+        :raises ValueError: Если связь или столбец не найдены в модели, стратегия загрузки или shape неизвестны,
+            либо load передан вместе с columns.
+        """
+        if columns is not None:
+            if load is not None:
+                raise ValueError("load нельзя использовать вместе с columns")
+            return self._read_columns(filters, use_or, order_by, limit, offset, columns, shape)
+
+        stmt = self._labeled(_read_statement(self._model, filters, use_or, order_by, limit, offset), "read")
+
+        if load is not None:
+            stmt = stmt.options(*_loader_options(self._model, load))
+            # joinedload коллекции повторяет строку модели для каждой связанной записи.
+            return self._session.scalars(stmt).unique().all()
+
+        if self._cache is None or self._cache.has_pending_writes(self._session):
+            return self._session.scalars(stmt).all()
+
+        cache_key = statement_cache_key(stmt)
+        if cache_key is None:
+            return self._session.scalars(stmt).all()
+        key, tables = cache_key
+        snapshots = self._cache.get(key)
+        if snapshots is not None:
+            return restore_instances(self._session, self._model, snapshots)
+
+        generation = self._cache.generation(tables)
+        rows = self._session.scalars(stmt).all()
+        self._cache.put(key, tables, snapshot_instances(rows), generation)
+        return rows
+
+    def _read_columns(self, filters, use_or, order_by, limit, offset, columns: list, shape: str) -> list:
+        """Выполняет read с выборкой отдельных столбцов."""
+        columns = _projection_columns(self._model, columns)
+        _check_shape(shape)
+        stmt = _read_statement(self._model, filters, use_or, order_by, limit, offset, columns)
+        rows = self._cached_rows(self._labeled(stmt, "read"))
+        return _shape_rows(self._model, [column.key for column in columns], rows, shape)
+
+    def count(self, filters: Optional[list[BinaryExpression]] = None, use_or: bool = False) -> int:
         """
-        query = self._session.query(self._model)
+        Считает записи, удовлетворяющие фильтрам, запросом SELECT count(*) без передачи самих строк.
 
+        :param filters: Список условий фильтрации SQLAlchemy в формате read, опционально.
+        :param use_or: Определяет, использовать ли логическое "ИЛИ" вместо "И" при применении фильтров. По умолчанию False.
+        :raises TypeError: Если переданные фильтры не являются списком или содержат некорректные условия.
+        """
+        stmt = select(func.count()).select_from(self._model)
         if filters:
-            if not isinstance(filters, list):
-                raise TypeError(f"filters должен быть списком, а не {type(filters).__name__}")
+            stmt = stmt.where(_where_clause(filters, use_or))
+        return self._cached_rows(self._labeled(stmt, "count"))[0][0]
 
-            if not all(isinstance(f, BinaryExpression) for f in filters):
-                raise TypeError("filters должен содержать только условия фильтрации SQLAlchemy")
+    def exists(self, filters: Optional[list[BinaryExpression]] = None, use_or: bool = False) -> bool:
+        """
+        Проверяет наличие хотя бы одной записи, удовлетворяющей фильтрам, запросом SELECT EXISTS(...).
+        База прекращает поиск на первой найденной строке.
 
-            query = query.filter(or_(*filters) if use_or else and_(*filters))
+        :param filters: Список условий фильтрации SQLAlchemy в формате read, опционально.
+        :param use_or: Определяет, использовать ли логическое "ИЛИ" вместо "И" при применении фильтров. По умолчанию False.
+        :raises TypeError: Если переданные фильтры не являются списком или содержат некорректные условия.
+        """
+        subquery = select(literal(1)).select_from(self._model)
+        if filters:
+            subquery = subquery.where(_where_clause(filters, use_or))
+        return bool(self._cached_rows(self._labeled(select(subquery.exists()), "exists"))[0][0])
 
-        if order_by is not None:
-            if isinstance(order_by, list):
-                query = query.order_by(*order_by)
-            else:
-                query = query.order_by(order_by)
+    def aggregate(self,
+                  group_by,
+                  aggregates: Optional[dict[str, Any]] = None,
+                  filters: Optional[list[BinaryExpression]] = None,
+                  use_or: bool = False,
+                  order_by=None,
+                  shape: str = "row") -> list:
+        """
+        Группирует записи и вычисляет агрегаты на стороне базы (SELECT ... GROUP BY).
+
+        Пример: количество напоминаний по пользователям —
+        aggregate(Reminders.user_id, {"count": func.count(), "last": func.max(Reminders.event_date)}).
+
+        :param group_by: Столбец или имя поля модели, выражение с именем (.label(...)) или их список.
+        :param aggregates: Словарь {имя: агрегатное выражение}. По умолчанию {"count": func.count()}.
+        :param filters: Список условий фильтрации SQLAlchemy в формате read, применяются до группировки.
+        :param use_or: Определяет, использовать ли логическое "ИЛИ" вместо "И" при применении фильтров. По умолчанию False.
+        :param order_by: Порядок сортировки групп. По умолчанию по столбцам группировки.
+        :param shape: Вид строк: "row", "dict" или "dataclass", как в read. По умолчанию "row".
+        :return: Список строк с полями группировки и агрегатов.
+        :raises TypeError: Если фильтры, столбцы группировки или агрегаты некорректны.
+        :raises ValueError: Если поле не найдено в модели, агрегаты пусты или shape неизвестен.
+        """
+        group_columns = _group_by_columns(self._model, group_by)
+        if aggregates is None:
+            aggregates = {"count": func.count()}
+        if not isinstance(aggregates, dict) or not aggregates:
+            raise ValueError("aggregates должен быть непустым словарём {имя: выражение}")
+        for name, expression in aggregates.items():
+            if not isinstance(expression, ColumnElement):
+                raise TypeError(f"Агрегат '{name}' должен быть SQL-выражением, а не {type(expression).__name__}")
+        _check_shape(shape)
+
+        stmt = select(*group_columns, *(expression.label(name) for name, expression in aggregates.items()))
+        stmt = stmt.select_from(self._model)
+        if filters:
+            stmt = stmt.where(_where_clause(filters, use_or))
+        stmt = stmt.group_by(*group_columns)
+        stmt = stmt.order_by(*(_order_by_list(order_by) if order_by is not None else group_columns))
+
+        rows = self._cached_rows(self._labeled(stmt, "aggregate"))
+        keys = [column.key for column in group_columns] + list(aggregates)
+        return _shape_rows(self._model, keys, rows, shape)
+
+    def _cached_rows(self, stmt) -> list:
+        """
+        Выполняет запрос, возвращающий Row, через кэш результатов, если он задан.
+        Row неизменяемы и не привязаны к сессии, поэтому кэшируются как есть.
+        """
+        if self._cache is None or self._cache.has_pending_writes(self._session):
+            return self._session.execute(stmt).all()
+
+        cache_key = statement_cache_key(stmt)
+        if cache_key is None:
+            return self._session.execute(stmt).all()
+        key, tables = cache_key
+        rows = self._cache.get(key)
+        if rows is None:
+            generation = self._cache.generation(tables)
+            rows = self._session.execute(stmt).all()
+            self._cache.put(key, tables, rows, generation)
+        return rows
+
+    def iter_read(self,
+                  filters: Optional[list[BinaryExpression]] = None,
+                  use_or: bool = False,
+                  order_by=None,
+                  batch_size: int = 1000) -> Iterator[list[T]]:
+        """
+        Читает данные пачками, не загружая весь результат в память.
+
+        Строки подгружаются через yield_per (stream_results, на PostgreSQL — серверный курсор).
+        После обработки каждой пачки её объекты удаляются из сессии (expunge), поэтому расход памяти
+        не зависит от размера результата. Изменения в объектах пачки нужно сохранить (flush) до перехода
+        к следующей пачке, иначе они будут потеряны.
+
+        :param filters: Список условий фильтрации SQLAlchemy, опционально.
+        :param use_or: Определяет, использовать ли логическое "ИЛИ" вместо "И" при применении фильтров. По умолчанию False.
+        :param order_by: Порядок сортировки. Может быть одиночным условием или списком условий.
+        :param batch_size: Количество записей в одной пачке. По умолчанию 1000.
+        :return: Генератор списков объектов модели длиной не более batch_size.
+        :raises TypeError: Если переданные фильтры не являются списком или содержат некорректные условия.
+        :raises ValueError: Если batch_size меньше 1.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size должен быть положительным, а не {batch_size}")
+
+        stmt = self._labeled(_read_statement(self._model, filters, use_or, order_by), "read")
+        result = self._session.execute(stmt, execution_options={"yield_per": batch_size})
+        try:
+            for batch in result.scalars().partitions():
+                yield batch
+                for instance in batch:
+                    if instance in self._session:
+                        self._session.expunge(instance)
+        finally:
+            result.close()
+
+    def read_page(self,
+                  filters: Optional[list[BinaryExpression]] = None,
+                  use_or: bool = False,
+                  order_by=None,
+                  limit: int = 100,
+                  cursor: Optional[str] = None) -> tuple[list[T], Optional[str]]:
+        """
+        Читает одну страницу данных с постраничным чтением по ключу (keyset pagination).
+
+        Вместо смещения следующая страница начинается условием "после последней строки предыдущей",
+        поэтому страница N стоит столько же, сколько первая. Первичный ключ добавляется в конец сортировки
+        для однозначного порядка.
+
+        :param filters: Список условий фильтрации SQLAlchemy, опционально.
+        :param use_or: Определяет, использовать ли логическое "ИЛИ" вместо "И" при применении фильтров. По умолчанию False.
+        :param order_by: Порядок сортировки: столбец, asc()/desc() от столбца, имя поля или их список.
+        :param limit: Размер страницы. По умолчанию 100.
+        :param cursor: Курсор, полученный вместе с предыдущей страницей. None — первая страница.
+        :return: Кортеж из списка записей и курсора следующей страницы (None, если страница последняя).
+        :raises TypeError: Если фильтры или условия сортировки некорректны.
+        :raises ValueError: Если limit меньше 1 или курсор не соответствует сортировке.
+        """
+        if limit < 1:
+            raise ValueError(f"limit должен быть положительным, а не {limit}")
+
+        columns = order_by_columns(self._model, order_by)
+        signature = columns_signature(columns)
+
+        stmt = self._labeled(_read_statement(self._model, filters, use_or), "read")
+        if cursor is not None:
+            stmt = stmt.where(keyset_condition(columns, decode_cursor(cursor, signature)))
+
+        rows = self._session.scalars(stmt.order_by(*order_by_clauses(columns)).limit(limit + 1)).all()
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, encode_cursor(signature, row_values(rows[-1], columns))
+
+    def _update_instances(self, where_clause, updates: dict) -> int:
+        """
+        Обновляет строки через загруженные объекты модели, чтобы сработала логика модели (валидаторы, события).
+        Используется, когда prepare_bulk_updates модели отказывается от массового UPDATE.
+
+        :return: Количество обновлённых записей.
+        """
+        instances = self._session.scalars(self._labeled(select(self._model).where(where_clause), "update")).all()
+        for instance in instances:
+            for key, value in updates.items():
+                setattr(instance, key, value)
+        return len(instances)
+
+    def _labeled(self, stmt, operation: str):
+        """Помечает запрос операцией сервиса, например "Users.read", для QueryInstrumentation."""
+        return stmt.execution_options(**{OPERATION_OPTION: f"{self._model.__name__}.{operation}"})
+
+    def _label_flush(self, operation: str) -> None:
+        """
+        Помечает операцией сервиса INSERT в таблицу модели, которые отправит ближайший flush сессии:
+        на время flush словарь меток передаётся соединению параметром crud_flush_operations,
+        а после flush метки сбрасываются, чтобы не достаться последующим запросам транзакции.
+        """
+        labels = self._session.info.get(FLUSH_OPERATIONS_OPTION)
+        if labels is None:
+            labels = self._session.info[FLUSH_OPERATIONS_OPTION] = {}
+            event.listen(self._session, "before_flush", _label_flush_connection)
+            event.listen(self._session, "after_flush", _clear_flush_labels)
+        labels[self._model.__table__.name] = f"{self._model.__name__}.{operation}"
+
+    def _invalidate_cache(self) -> None:
+        """Сбрасывает кэшированные результаты read по таблице модели."""
+        if self._cache is not None:
+            self._cache.track_write(self._session, self._model.__table__.name)
+
+
+def _batched(rows: Iterable[dict], batch_size: int):
+    """Разбивает итерируемый набор строк на списки длиной не более batch_size."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _read_statement(model, filters: Optional[list[BinaryExpression]] = None, use_or: bool = False,
+                    order_by=None, limit: Optional[int] = None, offset: Optional[int] = None,
+                    columns: Optional[list] = None):
+    """
+    Строит SELECT для чтения модели (или только столбцов columns) в стиле SQLAlchemy 2.0.
+
+    Структура запроса зависит только от формы фильтров и сортировки, а значения, limit и offset передаются
+    связанными параметрами, поэтому повторные вызовы попадают в кэш скомпилированных запросов движка.
+
+    :raises TypeError: Если переданные фильтры не являются списком или содержат некорректные условия.
+    """
+    stmt = select(*columns) if columns else select(model)
+
+    if filters:
+        stmt = stmt.where(_where_clause(filters, use_or))
+
+    if order_by is not None:
+        stmt = stmt.order_by(*_order_by_list(order_by))
+
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    if offset is not None:
+        stmt = stmt.offset(offset)
+
+    return stmt
+
+
+def _label_flush_connection(session: Session, flush_context, instances) -> None:
+    """Обработчик before_flush: передаёт соединению сессии метки INSERT, собранные BaseCRUDService.create."""
+    labels = session.info[FLUSH_OPERATIONS_OPTION]
+    if labels:
+        session.connection().execution_options(**{FLUSH_OPERATIONS_OPTION: dict(labels)})
+
+
+def _clear_flush_labels(session: Session, flush_context) -> None:
+    """Обработчик after_flush: снимает метки с соединения сессии после flush, для которого они собраны."""
+    labels = session.info[FLUSH_OPERATIONS_OPTION]
+    if labels:
+        labels.clear()
+        session.connection().execution_options(**{FLUSH_OPERATIONS_OPTION: {}})
+
+
+def _projection_columns(model, columns: list) -> list:
+    """
+    Приводит элементы columns к атрибутам столбцов модели.
+
+    :raises TypeError: Если columns не список или его элемент не является столбцом модели или именем поля.
+    :raises ValueError: Если columns пуст или поле не является столбцом модели.
+    """
+    if not isinstance(columns, list):
+        raise TypeError(f"columns должен быть списком, а не {type(columns).__name__}")
+    if not columns:
+        raise ValueError("columns не должен быть пустым")
+
+    column_attrs = inspect(model).column_attrs
+    result = []
+    for column in columns:
+        if isinstance(column, str):
+            if column not in column_attrs:
+                raise ValueError(f"Столбец '{column}' не найден в модели {model.__name__}")
+            column = getattr(model, column)
+        elif getattr(column, "class_", None) is not model or column.key not in column_attrs:
+            raise TypeError(f"Неподдерживаемый элемент columns: {column!r}")
+        result.append(column)
+    return result
+
+
+def _group_by_columns(model, group_by) -> list:
+    """
+    Приводит group_by метода aggregate к списку выражений с именами.
+
+    :raises TypeError: Если элемент не является столбцом модели, именем поля или выражением с .label().
+    :raises ValueError: Если поле не является столбцом модели.
+    """
+    items = group_by if isinstance(group_by, list) else [group_by]
+    if not items:
+        raise ValueError("group_by не должен быть пустым")
+    return [item if isinstance(item, Label) else _projection_columns(model, [item])[0] for item in items]
+
+
+def _check_shape(shape: str) -> None:
+    """:raises ValueError: Если shape не входит в ROW_SHAPES."""
+    if shape not in ROW_SHAPES:
+        raise ValueError(f"Неизвестный shape '{shape}', ожидается один из {list(ROW_SHAPES)}")
+
+
+def _shape_rows(model, keys: list[str], rows: list, shape: str) -> list:
+    """Преобразует Row с полями keys в вид shape: сами Row, словари или dataclass."""
+    if shape == "row":
+        return rows
+    keys = tuple(keys)
+    if shape == "dict":
+        return [dict(zip(keys, row)) for row in rows]
+    row_class = _row_dataclass(model, keys)
+    return [row_class(*row) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def _row_dataclass(model, keys: tuple[str, ...]):
+    """Создаёт (один раз на набор столбцов) неизменяемый dataclass со __slots__ для строк read."""
+    return make_dataclass(f"{model.__name__}Row", keys, frozen=True, slots=True)
+
+
+def _loader_options(model, load) -> list:
+    """
+    Преобразует параметр load метода read в опции загрузки связей.
+
+    :raises TypeError: Если элемент load не является связью, её именем или опцией загрузки.
+    :raises ValueError: Если связь не найдена в модели или стратегия загрузки неизвестна.
+    """
+    if isinstance(load, dict):
+        items = list(load.items())
+    else:
+        items = [(item, "selectin") for item in (load if isinstance(load, list) else [load])]
+
+    options = []
+    for relationship, strategy in items:
+        if isinstance(relationship, LoaderOption):
+            options.append(relationship)
+            continue
+        if strategy not in LOAD_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия загрузки '{strategy}', ожидается одна из {list(LOAD_STRATEGIES)}")
+        if isinstance(relationship, str):
+            if relationship not in inspect(model).relationships:
+                raise ValueError(f"Связь '{relationship}' не найдена в модели {model.__name__}")
+            relationship = getattr(model, relationship)
+        elif getattr(getattr(relationship, "property", None), "mapper", None) is None:
+            raise TypeError(f"Неподдерживаемый элемент load: {relationship!r}")
+        options.append(LOAD_STRATEGIES[strategy](relationship))
+    return options
+
+
+def _where_clause(filters: list[BinaryExpression], use_or: bool):
+    """
+    Проверяет условия фильтрации и объединяет их через "И" или "ИЛИ".
+
+    :raises TypeError: Если filters не является списком или содержит элементы, не являющиеся SQLAlchemy условиями фильтрации.
+    """
+    if not isinstance(filters, list):
+        raise TypeError(f"filters должен быть списком, а не {type(filters).__name__}")
+
+    for f in filters:
+        if not isinstance(f, BinaryExpression):
+            raise TypeError("filters должен содержать только условия фильтрации SQLAlchemy")
 
-        if limit is not None:
-            query = query.limit(limit)
+    if len(filters) == 1:
+        return filters[0]
+    return or_(*filters) if use_or else and_(*filters)
 
-        if offset is not None:
-            query = query.offset(offset)
 
-        return query.all()
+def _order_by_list(order_by) -> list:
+    """Приводит порядок сортировки (одиночное условие или список условий) к списку."""
+    return order_by if isinstance(order_by, list) else [order_by]
@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from src.data_base.model.base_model import BaseModel
+
+
+class EntityCache:
+    """
+    LRU-кэш отдельных записей модели по первичному ключу и уникальным столбцам с ограничением
+    по размеру и времени жизни.
+
+    Запись хранится один раз — снимком значений столбцов под первичным ключом; для уникальных столбцов
+    (у Users — nickname) ведётся индекс значение -> первичный ключ. Отсутствующие в базе записи не кэшируются,
+    поэтому create кэш не затрагивает.
+
+    Изменения через сервис сбрасывают затронутые записи сразу и повторно после commit или rollback сессии,
+    чтобы другие сессии не закэшировали незафиксированное состояние. Изменения в обход сервиса
+    кэш не видит — для них остаётся только ttl.
+
+    Один экземпляр разделяется между сервисами и потоками.
+    """
+
+    def __init__(self, model: Type[BaseModel], maxsize: int = 10000, ttl: Optional[float] = 300.0):
+        """
+        :param model: Класс модели базы данных с простым (не составным) первичным ключом.
+        :param maxsize: Максимальное количество записей. При превышении вытесняется давно не использованная.
+        :param ttl: Время жизни записи в секундах. None — без ограничения.
+        :raises ValueError: Если maxsize меньше 1, ttl не положителен или первичный ключ составной.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize должен быть положительным, а не {maxsize}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl должен быть положительным, а не {ttl}")
+
+        primary_keys = inspect(model).primary_key
+        if len(primary_keys) != 1:
+            raise ValueError(f"Модель {model.__name__} имеет составной первичный ключ")
+
+        self.model = model
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.primary_key = primary_keys[0].key
+        self.unique_keys = tuple(column.key for column in model.__table__.columns
+                                 if column.unique and not column.primary_key)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, dict]] = OrderedDict()
+        self._index: dict[tuple[str, Hashable], Hashable] = {}
+        # Номер последнего сброса и номера сбросов значений столбцов: по ним put отбрасывает снимки,
+        # прочитанные из базы до сброса. Хранятся последние maxsize значений; для более старых
+        # известен только номер последнего забытого сброса.
+        self._generation = 0
+        self._invalidated: OrderedDict[tuple[str, Hashable], int] = OrderedDict()
+        self._forgotten_generation = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+        self._pending_key = ("entity_cache_pending_keys", id(self))
+        self._watched_key = ("entity_cache_watched", id(self))
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        """Столбцы, по которым возможен поиск: первичный ключ и уникальные столбцы."""
+        return self.primary_key, *self.unique_keys
+
+    def get(self, key: str, value: Hashable) -> Optional[dict]:
+        """
+        Возвращает снимок записи по значению столбца или None, если записи нет или срок её жизни истёк.
+
+        :param key: Имя столбца из keys.
+        :param value: Значение столбца.
+        """
+        with self._lock:
+            primary_key = self._resolve(key, value)
+            entry = None if primary_key is None else self._entries.get(primary_key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                self._remove(primary_key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(primary_key)
+            self._counters["hits"] += 1
+            return snapshot
+
+    def generation(self) -> int:
+        """Возвращает номер последнего сброса. Его снимают до запроса и передают в put."""
+        with self._lock:
+            return self._generation
+
+    def put(self, snapshot: dict, generation: Optional[int] = None) -> bool:
+        """
+        Сохраняет снимок записи (значения всех столбцов модели).
+
+        :param snapshot: Значения всех столбцов модели.
+        :param generation: Номер сброса (см. generation), снятый до выполнения запроса. Если с тех пор
+            запись сбрасывалась по первичному ключу или уникальному столбцу снимка, снимок мог устареть
+            и не сохраняется.
+        :return: True, если снимок сохранён.
+        """
+        expires_at = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        primary_key = snapshot[self.primary_key]
+        with self._lock:
+            if generation is not None and self._invalidated_since(snapshot, generation):
+                return False
+            if primary_key in self._entries:
+                self._remove(primary_key)
+            self._entries[primary_key] = (expires_at, snapshot)
+            for key in self.unique_keys:
+                self._index[key, snapshot[key]] = primary_key
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+            return True
+
+    def invalidate(self, key: str, values: Iterable[Hashable]) -> int:
+        """
+        Сбрасывает записи с указанными значениями столбца.
+
+        :param key: Имя столбца из keys.
+        :param values: Значения столбца.
+        :return: Количество сброшенных записей.
+        """
+        invalidated_count = 0
+        with self._lock:
+            self._generation += 1
+            for value in values:
+                primary_key = self._resolve(key, value)
+                self._mark_invalidated(key, value)
+                if primary_key is not None:
+                    self._mark_invalidated(self.primary_key, primary_key)
+                    if primary_key in self._entries:
+                        self._remove(primary_key)
+                        invalidated_count += 1
+                if key != self.primary_key:
+                    self._index.pop((key, value), None)
+            self._counters["invalidations"] += invalidated_count
+        return invalidated_count
+
+    def track_write(self, session: Session, key: str, values: Iterable[Hashable]) -> None:
+        """
+        Сбрасывает записи и запоминает их в сессии, чтобы сбросить ещё раз после commit или rollback.
+
+        Пока в транзакции сессии есть запись через сервис, кэш в этой сессии не используется.
+        """
+        values = list(values)
+        self.invalidate(key, values)
+        pending = session.info.get(self._pending_key)
+        if pending is None:
+            pending = session.info[self._pending_key] = []
+            event.listen(session, "after_commit", self._flush_pending)
+            event.listen(session, "after_rollback", self._flush_pending)
+        pending.append((key, values))
+
+    def watch(self, session: Session) -> None:
+        """
+        Отслеживает flush изменённых и удалённых объектов модели в сессии: их записи сбрасываются
+        как при track_write — по первичному ключу и по новым значениям уникальных столбцов.
+
+        UsersService с entity_cache вызывает watch для своей сессии сам.
+        """
+        if session.info.get(self._watched_key):
+            return
+        session.info[self._watched_key] = True
+        event.listen(session, "before_flush", self._before_flush)
+
+    def has_pending_writes(self, session: Session) -> bool:
+        """Проверяет, были ли в текущей транзакции сессии изменения через сервис."""
+        return bool(session.info.get(self._pending_key))
+
+    def clear(self) -> None:
+        """Удаляет все записи, не сбрасывая счётчики."""
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики попаданий, промахов, вытеснений, истечений и сбросов, долю попаданий
+        (hit_rate, 0.0 до первого обращения) и текущий размер.
+        """
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            hit_rate = self._counters["hits"] / lookups if lookups else 0.0
+            return {**self._counters, "hit_rate": hit_rate, "size": len(self._entries)}
+
+    def _before_flush(self, session: Session, flush_context, instances) -> None:
+        # До flush история атрибутов ещё содержит изменения. Сброс по первичному ключу удаляет и индекс
+        # старых значений уникальных столбцов; новые значения сбрасываются отдельно, если под ними
+        # закэширована другая запись.
+        changed = {key: [] for key in self.keys}
+        for instance in (*session.dirty, *session.deleted):
+            if not isinstance(instance, self.model):
+                continue
+            state = inspect(instance)
+            if state.identity is None:
+                continue
+            changed[self.primary_key].append(state.identity[0])
+            for key in self.unique_keys:
+                changed[key].extend(state.attrs[key].history.added)
+        for key, values in changed.items():
+            if values:
+                self.track_write(session, key, values)
+
+    def _flush_pending(self, session: Session) -> None:
+        pending = session.info.get(self._pending_key)
+        while pending:
+            self.invalidate(*pending.pop())
+
+    def _mark_invalidated(self, key: str, value: Hashable) -> None:
+        self._invalidated[key, value] = self._generation
+        self._invalidated.move_to_end((key, value))
+        while len(self._invalidated) > self.maxsize:
+            _, self._forgotten_generation = self._invalidated.popitem(last=False)
+
+    def _invalidated_since(self, snapshot: dict, generation: int) -> bool:
+        if generation < self._forgotten_generation:
+            return True
+        return any(self._invalidated.get((key, snapshot[key]), 0) > generation for key in self.keys)
+
+    def _resolve(self, key: str, value: Hashable) -> Optional[Hashable]:
+        if key == self.primary_key:
+            return value
+        return self._index.get((key, value))
+
+    def _remove(self, primary_key: Hashable) -> None:
+        _, snapshot = self._entries.pop(primary_key)
+        for key in self.unique_keys:
+            if self._index.get((key, snapshot[key])) == primary_key:
+                del self._index[key, snapshot[key]]
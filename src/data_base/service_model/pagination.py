@@ -0,0 +1,114 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Type
+
+from sqlalchemy import and_, or_, inspect
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression, ColumnElement
+
+
+def order_by_columns(model: Type, order_by) -> list[tuple[ColumnElement, bool]]:
+    """
+    Разбирает order_by в список пар (столбец, по убыванию) и дополняет его первичным ключом модели.
+
+    Первичный ключ в конце делает порядок строгим, что нужно для постраничного чтения по ключу.
+
+    :param model: Класс модели базы данных.
+    :param order_by: Порядок сортировки в формате BaseCRUDService.read: условие, список условий или None.
+    :raises TypeError: Если элемент сортировки не является столбцом, asc()/desc() от столбца или именем поля.
+    :raises ValueError: Если имя поля не найдено в модели.
+    """
+    items = [] if order_by is None else order_by if isinstance(order_by, list) else [order_by]
+    columns = []
+    for item in items:
+        descending = False
+        if isinstance(item, str):
+            if not hasattr(model, item):
+                raise ValueError(f"Поле '{item}' не найдено в модели {model.__name__}")
+            item = getattr(model, item)
+        elif isinstance(item, UnaryExpression):
+            if item.modifier not in (operators.asc_op, operators.desc_op):
+                raise TypeError(f"Неподдерживаемое условие сортировки: {item}")
+            descending = item.modifier is operators.desc_op
+            item = item.element
+        if not isinstance(item, ColumnElement) and not hasattr(item, "__clause_element__"):
+            raise TypeError(f"Неподдерживаемое условие сортировки: {item!r}")
+        columns.append((item, descending))
+
+    keys = {column.key for column, _ in columns}
+    for primary_key in inspect(model).primary_key:
+        if primary_key.key not in keys:
+            columns.append((getattr(model, primary_key.key), False))
+    return columns
+
+
+def order_by_clauses(columns: list[tuple[ColumnElement, bool]]) -> list:
+    """Преобразует пары (столбец, по убыванию) в условия ORDER BY."""
+    return [column.desc() if descending else column.asc() for column, descending in columns]
+
+
+def keyset_condition(columns: list[tuple[ColumnElement, bool]], values: list[Any]):
+    """
+    Строит условие "строка идёт после values" для порядка columns.
+
+    Для (a ASC, b DESC) получается: a > :a OR (a = :a AND b < :b).
+    """
+    branches = []
+    for index, (column, descending) in enumerate(columns):
+        equals = [previous == value for (previous, _), value in zip(columns[:index], values)]
+        compare = column < values[index] if descending else column > values[index]
+        branches.append(and_(*equals, compare))
+    return or_(*branches)
+
+
+def columns_signature(columns: list[tuple[ColumnElement, bool]]) -> list[str]:
+    """Возвращает описание порядка сортировки, по которому проверяется соответствие курсора."""
+    return [f"{column.key} {'desc' if descending else 'asc'}" for column, descending in columns]
+
+
+def row_values(row, columns: list[tuple[ColumnElement, bool]]) -> list[Any]:
+    """Извлекает из объекта модели значения столбцов сортировки."""
+    return [getattr(row, column.key) for column, _ in columns]
+
+
+def encode_cursor(signature: list[str], values: list[Any]) -> str:
+    """Упаковывает значения последней строки страницы в непрозрачный курсор."""
+    payload = json.dumps({"k": signature, "v": [_encode_value(value) for value in values]},
+                         separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, signature: list[str]) -> list[Any]:
+    """
+    Распаковывает курсор, созданный encode_cursor.
+
+    :raises ValueError: Если курсор повреждён или создан для другого порядка сортировки.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        keys, values = payload["k"], payload["v"]
+    except (ValueError, TypeError, KeyError, binascii.Error) as ex:
+        raise ValueError("Некорректный курсор") from ex
+
+    if keys != signature or len(values) != len(signature):
+        raise ValueError("Курсор не соответствует порядку сортировки")
+    return [_decode_value(value) for value in values]
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
@@ -0,0 +1,255 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Union
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, sessionmaker, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.util import find_tables
+
+
+class QueryCache:
+    """
+    LRU-кэш результатов BaseCRUDService.read с ограничением по размеру и времени жизни записей.
+
+    Ключ — ключ кэша SQLAlchemy для структуры запроса и значения связанных параметров. Каждая запись помечена
+    таблицами запроса. Записи таблицы сбрасываются сразу при изменении и повторно после commit или rollback
+    сессии, чтобы другие сессии не закэшировали незафиксированное состояние. Изменения отслеживаются
+    в наблюдаемых сессиях (см. watch): flush изменённых объектов модели и запросы INSERT/UPDATE/DELETE
+    через session.execute. Изменения в других сессиях и процессах, а также текстовым SQL кэш не видит —
+    для них остаётся только ttl.
+
+    У каждой таблицы есть счётчик поколений, который растёт при каждом сбросе. Результат запроса,
+    начатого до сброса, не сохраняется (см. put), поэтому чтение, пересёкшееся с commit другой сессии,
+    не вернёт в кэш устаревшие строки.
+
+    Один экземпляр разделяется между сервисами и потоками.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        """
+        :param maxsize: Максимальное количество записей. При превышении вытесняется давно не использованная.
+        :param ttl: Время жизни записи в секундах. None — без ограничения.
+        :raises ValueError: Если maxsize меньше 1 или ttl не положителен.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize должен быть положительным, а не {maxsize}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl должен быть положительным, а не {ttl}")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, frozenset, Any]] = OrderedDict()
+        self._keys_by_table: dict[str, set] = {}
+        self._generations: dict[str, int] = {}
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+        self._pending_key = ("query_cache_pending_tables", id(self))
+        self._watched_key = ("query_cache_watched", id(self))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Возвращает значение по ключу или None, если записи нет или срок её жизни истёк."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def generation(self, tables: Iterable[str]) -> tuple:
+        """Возвращает поколения таблиц; снимается перед выполнением запроса и передаётся в put."""
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in sorted(tables))
+
+    def put(self, key: Hashable, tables: Iterable[str], value: Any, generation: Optional[tuple] = None) -> bool:
+        """
+        Сохраняет значение, помечая его таблицами, при изменении которых оно должно быть сброшено.
+
+        :param key: Ключ записи.
+        :param tables: Имена таблиц, от которых зависит значение.
+        :param value: Сохраняемое значение.
+        :param generation: Поколения таблиц (см. generation), снятые до выполнения запроса. Если с тех пор
+            таблица сбрасывалась, значение могло устареть и не сохраняется.
+        :return: True, если значение сохранено.
+        """
+        expires_at = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        tables = frozenset(tables)
+        with self._lock:
+            if generation is not None and generation != tuple(
+                    self._generations.get(table, 0) for table in sorted(tables)):
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, tables, value)
+            for table in tables:
+                self._keys_by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+            return True
+
+    def invalidate(self, table: str) -> int:
+        """
+        Сбрасывает все записи, зависящие от таблицы.
+
+        :return: Количество сброшенных записей.
+        """
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            keys = list(self._keys_by_table.get(table, ()))
+            for key in keys:
+                self._remove(key)
+            self._counters["invalidations"] += len(keys)
+            return len(keys)
+
+    def track_write(self, session: Session, table: str) -> None:
+        """
+        Сбрасывает записи таблицы и запоминает её в сессии, чтобы сбросить ещё раз после commit или rollback.
+
+        Пока в транзакции сессии есть запись через сервис, BaseCRUDService не использует кэш в этой сессии.
+        """
+        self.invalidate(table)
+        pending = session.info.get(self._pending_key)
+        if pending is None:
+            pending = session.info[self._pending_key] = set()
+            event.listen(session, "after_commit", self._flush_pending)
+            event.listen(session, "after_rollback", self._flush_pending)
+        pending.add(table)
+
+    def has_pending_writes(self, session: Session) -> bool:
+        """Проверяет, были ли в текущей транзакции сессии изменения через сервис."""
+        return bool(session.info.get(self._pending_key))
+
+    def watch(self, target: Union[Session, sessionmaker]) -> None:
+        """
+        Отслеживает изменения в сессии или во всех сессиях фабрики: flush новых, изменённых и удалённых
+        объектов и запросы INSERT/UPDATE/DELETE через session.execute сбрасывают записи своих таблиц
+        (как track_write).
+
+        BaseCRUDService с кэшем вызывает watch для своей сессии сам. Чтобы учитывать изменения в сессиях
+        без кэша (например, RemindersArchiver или RemindersService без cache), передайте фабрику сессий —
+        DataBaseService.session_local.
+        """
+        if isinstance(target, Session):
+            if target.info.get(self._watched_key):
+                return
+            target.info[self._watched_key] = True
+        event.listen(target, "after_flush", self._after_flush)
+        event.listen(target, "do_orm_execute", self._on_execute)
+
+    def clear(self) -> None:
+        """Удаляет все записи, не сбрасывая счётчики."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def stats(self) -> dict:
+        """Возвращает счётчики попаданий, промахов, вытеснений, истечений и сбросов, а также текущий размер."""
+        with self._lock:
+            return {**self._counters, "size": len(self._entries)}
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        # В after_flush new, dirty и deleted ещё содержат объекты, записанные этим flush.
+        tables = set()
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            tables.update(table.name for table in inspect(instance).mapper.tables)
+        for table in tables:
+            self.track_write(session, table)
+
+    def _on_execute(self, orm_execute_state) -> None:
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            table = getattr(orm_execute_state.statement, "table", None)
+            name = getattr(table, "name", None)
+            if name is not None:
+                self.track_write(orm_execute_state.session, name)
+
+    def _flush_pending(self, session: Session) -> None:
+        pending = session.info.get(self._pending_key)
+        while pending:
+            self.invalidate(pending.pop())
+
+    def _remove(self, key: Hashable) -> None:
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+
+# Таблицы запроса по структурному ключу: find_tables обходит запрос целиком, поэтому результат запоминается.
+_TABLES_BY_STRUCTURE: dict = {}
+_TABLES_BY_STRUCTURE_MAXSIZE = 4096
+
+
+def statement_cache_key(statement) -> Optional[tuple[tuple, frozenset]]:
+    """
+    Вычисляет ключ кэша для запроса без его компиляции: структурный ключ кэша SQLAlchemy
+    (тот же, что использует кэш скомпилированных запросов) и значения связанных параметров.
+
+    :return: Кортеж из ключа и имён таблиц, участвующих в запросе, или None, если запрос не кэшируется.
+    """
+    cache_key = statement._generate_cache_key()
+    if cache_key is None:
+        return None
+
+    tables = _TABLES_BY_STRUCTURE.get(cache_key.key)
+    if tables is None:
+        if len(_TABLES_BY_STRUCTURE) >= _TABLES_BY_STRUCTURE_MAXSIZE:
+            _TABLES_BY_STRUCTURE.clear()
+        tables = _TABLES_BY_STRUCTURE[cache_key.key] = frozenset(
+            table.name for table in find_tables(statement, check_columns=True, include_joins=True))
+    params = tuple(_hashable(bind.effective_value) for bind in cache_key.bindparams)
+    return (cache_key.key, params), tables
+
+
+def _hashable(value):
+    """Приводит значение параметра к хешируемому виду: списки IN (...) — к кортежам."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return type(value).__name__, tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item)) for key, item in value.items()))
+    return value
+
+
+def snapshot_instances(instances: list) -> list[dict]:
+    """Сохраняет значения столбцов объектов модели без привязки к сессии."""
+    if not instances:
+        return []
+    column_keys = [attr.key for attr in inspect(instances[0]).mapper.column_attrs]
+    return [{key: getattr(instance, key) for key in column_keys} for instance in instances]
+
+
+def restore_instances(session: Session, model, snapshots: list[dict]) -> list:
+    """
+    Восстанавливает объекты модели из снимков и присоединяет их к сессии без обращения к базе.
+
+    Если объект с тем же первичным ключом уже есть в сессии, возвращается он — как и при обычном запросе.
+    """
+    mapper = inspect(model)
+    instances = []
+    for snapshot in snapshots:
+        identity_key = mapper.identity_key_from_primary_key(
+            [snapshot[column.key] for column in mapper.primary_key])
+        existing = session.identity_map.get(identity_key)
+        if existing is not None:
+            instances.append(existing)
+            continue
+
+        instance = mapper.class_manager.new_instance()
+        for key, value in snapshot.items():
+            set_committed_value(instance, key, value)
+        make_transient_to_detached(instance)
+        session.add(instance)
+        instances.append(instance)
+    return instances
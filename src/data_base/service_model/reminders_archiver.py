@@ -0,0 +1,139 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import select, insert, delete, literal
+
+from src.data_base.instrumentation import OPERATION_OPTION
+from src.data_base.model import Reminders, RemindersArchive
+
+logger = logging.getLogger(__name__)
+
+# Столбцы, общие для reminders и reminders_archive, в порядке объявления модели.
+ARCHIVED_COLUMNS = [column.key for column in Reminders.__table__.columns]
+
+
+class RemindersArchiver:
+    """
+    Переносит напоминания, событие которых (event_date) старше retention, из reminders в reminders_archive.
+
+    Перенос идёт пачками по batch_size строк, каждая пачка — отдельная короткая транзакция
+    (INSERT ... SELECT в архив и DELETE по тем же id), поэтому блокировки не держатся долго и работа
+    с напоминаниями не останавливается. Прерванный перенос безопасно продолжить: пачка переносится целиком или никак.
+
+    Может работать в фоновом потоке (start/stop) или вызываться из внешнего планировщика (run_once).
+    """
+
+    def __init__(self, database_service, retention: timedelta, batch_size: int = 1000, interval: float = 60.0,
+                 clock: Optional[Callable[[], datetime]] = None):
+        """
+        :param database_service: DataBaseService, в сессиях которого выполняются пачки.
+        :param retention: Сколько хранить напоминания в reminders после event_date.
+        :param batch_size: Максимальное количество напоминаний в одной транзакции. По умолчанию 1000.
+        :param interval: Пауза фонового потока между проходами в секундах. По умолчанию 60.
+        :param clock: Функция текущего момента (UTC без часового пояса). Задаётся в тестах.
+        :raises ValueError: Если retention отрицателен, batch_size меньше 1 или interval не положителен.
+        """
+        if retention < timedelta(0):
+            raise ValueError(f"retention не может быть отрицательным, а не {retention}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size должен быть положительным, а не {batch_size}")
+        if interval <= 0:
+            raise ValueError(f"interval должен быть положительным, а не {interval}")
+
+        self._database_service = database_service
+        self.retention = retention
+        self.batch_size = batch_size
+        self.interval = interval
+        self._clock = clock or (lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def archive_batch(self, now: Optional[datetime] = None) -> int:
+        """
+        Переносит одну пачку в отдельной транзакции.
+
+        Кандидаты выбираются по индексу remind_at (remind_at = event_date - remind_before, поэтому
+        при неотрицательном remind_before условие event_date < cutoff влечёт remind_at < cutoff).
+        На PostgreSQL строки пачки блокируются с SKIP LOCKED, чтобы не ждать обработчиков рассылки.
+
+        :param now: Текущий момент. По умолчанию — значение clock.
+        :return: Количество перенесённых напоминаний.
+        """
+        now = now or self._clock()
+        cutoff = now - self.retention
+        with self._database_service.session_scope() as session:
+            candidates = (select(Reminders.id)
+                          .where(Reminders.remind_at < cutoff, Reminders.event_date < cutoff)
+                          .order_by(Reminders.remind_at)
+                          .limit(self.batch_size))
+            if session.get_bind().dialect.name == "postgresql":
+                candidates = candidates.with_for_update(skip_locked=True)
+            ids = session.scalars(candidates.execution_options(**{OPERATION_OPTION: "Reminders.archive"})).all()
+            if not ids:
+                return 0
+
+            columns = [getattr(Reminders, key) for key in ARCHIVED_COLUMNS]
+            session.execute(
+                insert(RemindersArchive)
+                .from_select([*ARCHIVED_COLUMNS, "archived_at"],
+                             select(*columns, literal(now)).where(Reminders.id.in_(ids)))
+                .execution_options(**{OPERATION_OPTION: "Reminders.archive"}))
+            session.execute(
+                delete(Reminders)
+                .where(Reminders.id.in_(ids))
+                .execution_options(synchronize_session=False, **{OPERATION_OPTION: "Reminders.archive"}))
+            return len(ids)
+
+    def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Переносит пачки, пока есть устаревшие напоминания (или до вызова stop).
+
+        :param now: Текущий момент, одинаковый для всех пачек прохода. По умолчанию — значение clock.
+        :return: Общее количество перенесённых напоминаний.
+        """
+        now = now or self._clock()
+        archived_count = 0
+        while not self._stop_event.is_set():
+            archived = self.archive_batch(now)
+            archived_count += archived
+            if archived < self.batch_size:
+                break
+        return archived_count
+
+    def start(self) -> None:
+        """
+        Запускает фоновый поток, выполняющий run_once каждые interval секунд.
+
+        :raises RuntimeError: Если поток уже запущен.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Архиватор напоминаний уже запущен")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="reminders-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Останавливает фоновый поток после текущей пачки и ждёт его завершения.
+
+        :param timeout: Максимальное время ожидания в секундах. None — ждать без ограничения.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return
+            self._thread = None
+        self._stop_event.clear()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                archived = self.run_once()
+                if archived:
+                    logger.info("Перенесено в архив напоминаний: %d", archived)
+            except Exception:
+                logger.exception("Ошибка архивации напоминаний")
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta, date
+from typing import Optional, Iterable
+
+from sqlalchemy import select, update, and_, or_, func, Date, union_all, literal, Column
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import BinaryExpression
+from sqlalchemy.sql.visitors import replacement_traverse
+
+from src.data_base.model import Reminders, RemindersArchive
+from src.data_base.service_model.base_service import BaseCRUDService, _where_clause, _check_shape, _shape_rows
+from src.data_base.service_model.pagination import order_by_columns, order_by_clauses, keyset_condition
+from src.data_base.service_model.query_cache import QueryCache
+
+
+class RemindersService(BaseCRUDService[Reminders]):
+    """
+    CRUD-сервис напоминаний с выборкой наступивших напоминаний для рассылки.
+
+    Несколько обработчиков рассылки могут работать с одной таблицей через аренду (claim_due): напоминание
+    выдаётся одному обработчику на lease_seconds, после отправки подтверждается (ack) или возвращается (release).
+    Неподтверждённая аренда истекает, и напоминание снова становится доступным.
+    """
+
+    def __init__(self, session: Session, cache: Optional[QueryCache] = None):
+        """
+        :param session: Сессия SQLAlchemy.
+        :param cache: Кэш результатов read, общий для сервисов разных сессий. По умолчанию кэш не используется.
+        """
+        super().__init__(session, Reminders, cache)
+
+    def fetch_due(self, now: datetime, limit: int = 100,
+                  after: Optional[tuple[datetime, int]] = None) -> list[Reminders]:
+        """
+        Возвращает неотправленные напоминания, момент которых (remind_at) уже наступил, в порядке (remind_at, id).
+
+        Запрос выполняется сканированием диапазона частичного индекса ix_reminders_pending_remind_at,
+        без просмотра всей таблицы и уже отправленных напоминаний.
+
+        Без after каждый вызов начинает с самых ранних напоминаний, поэтому опрашивающий вызывающий
+        либо отмечает обработанные напоминания отправленными (dispatched_at), либо передаёт курсор —
+        (remind_at, id) последнего напоминания предыдущей страницы.
+
+        :param now: Текущий момент.
+        :param limit: Максимальное количество возвращаемых напоминаний. По умолчанию 100.
+        :param after: Курсор (remind_at, id): возвращаются только напоминания строго после него.
+            По умолчанию None — с самого раннего.
+        :raises ValueError: Если limit меньше 1.
+        """
+        if limit < 1:
+            raise ValueError(f"limit должен быть положительным, а не {limit}")
+
+        order = [(Reminders.remind_at, False), (Reminders.id, False)]
+        stmt = select(Reminders).where(Reminders.remind_at <= now, Reminders.dispatched_at.is_(None))
+        if after is not None:
+            # Отдельное условие remind_at >= ... задаёт нижнюю границу сканирования индекса,
+            # которую планировщик не выводит из OR условия курсора.
+            stmt = stmt.where(Reminders.remind_at >= after[0], keyset_condition(order, list(after)))
+        stmt = stmt.order_by(*order_by_clauses(order)).limit(limit)
+        return self._session.scalars(self._labeled(stmt, "fetch_due")).all()
+
+    def count_by_user(self, user_ids: Optional[Iterable[int]] = None) -> dict[int, int]:
+        """
+        Считает напоминания каждого пользователя одним запросом GROUP BY user_id.
+
+        :param user_ids: Идентификаторы пользователей. None — все пользователи.
+        :return: Словарь {user_id: количество}. Пользователи без напоминаний в него не попадают.
+        """
+        filters = None if user_ids is None else [Reminders.user_id.in_(list(user_ids))]
+        return dict(self.aggregate(Reminders.user_id, filters=filters))
+
+    def count_by_day(self, start: datetime, end: datetime, user_id: Optional[int] = None) -> dict[date, int]:
+        """
+        Считает напоминания по дням события (event_date) в диапазоне [start, end).
+
+        :param start: Начало диапазона включительно.
+        :param end: Конец диапазона, не включается.
+        :param user_id: Идентификатор пользователя. None — все пользователи.
+        :return: Словарь {день: количество} по возрастанию дней. Дни без напоминаний в него не попадают.
+        :raises ValueError: Если start не меньше end.
+        """
+        if start >= end:
+            raise ValueError(f"start ({start}) должен быть меньше end ({end})")
+
+        filters = [Reminders.event_date >= start, Reminders.event_date < end]
+        if user_id is not None:
+            filters.append(Reminders.user_id == user_id)
+        # Date в type_ разбирает строку, которую возвращает date() на SQLite, в datetime.date.
+        day = func.date(Reminders.event_date, type_=Date).label("day")
+        return dict(self.aggregate(day, filters=filters))
+
+    def read_history(self,
+                     filters: Optional[list[BinaryExpression]] = None,
+                     use_or: bool = False,
+                     order_by=None,
+                     limit: Optional[int] = None,
+                     offset: Optional[int] = None,
+                     include_archived: bool = True,
+                     shape: str = "row") -> list:
+        """
+        Читает напоминания вместе с перенесёнными в архив (см. RemindersArchiver) одним запросом UNION ALL.
+
+        Фильтры и сортировка задаются по столбцам Reminders, как в read, и применяются к обеим таблицам.
+        Возвращаются строки, а не объекты модели: архивные записи нельзя изменять через сессию.
+
+        :param filters: Список условий фильтрации по столбцам Reminders, опционально.
+        :param use_or: Определяет, использовать ли логическое "ИЛИ" вместо "И" при применении фильтров. По умолчанию False.
+        :param order_by: Порядок сортировки по столбцам Reminders, как в read_page. Первичный ключ добавляется в конец.
+        :param limit: Максимальное количество возвращаемых записей. Опционально.
+        :param offset: Смещение записей. Опционально.
+        :param include_archived: Если False, читаются только записи reminders. По умолчанию True.
+        :param shape: Вид строк: "row", "dict" или "dataclass", как в read. По умолчанию "row".
+        :return: Строки со столбцами Reminders и признаком archived.
+        :raises TypeError: Если фильтры или условия сортировки некорректны.
+        :raises ValueError: Если поле сортировки не найдено или shape неизвестен.
+        """
+        _check_shape(shape)
+        columns = order_by_columns(Reminders, order_by)
+        where_clause = _where_clause(filters, use_or) if filters else None
+
+        keys = [column.key for column in Reminders.__table__.columns]
+        parts = [_history_select(Reminders.__table__, keys, where_clause, archived=False)]
+        if include_archived:
+            parts.append(_history_select(RemindersArchive.__table__, keys, where_clause, archived=True))
+        history = union_all(*parts).subquery("reminders_history") if len(parts) > 1 else parts[0].subquery()
+
+        stmt = select(history).order_by(*order_by_clauses([(history.c[column.key], descending)
+                                                           for column, descending in columns]))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if offset is not None:
+            stmt = stmt.offset(offset)
+
+        rows = self._session.execute(self._labeled(stmt, "read_history")).all()
+        return _shape_rows(Reminders, [*keys, "archived"], rows, shape)
+
+    def claim_due(self, worker_id: str, now: datetime, limit: int = 100,
+                  lease_seconds: float = 60) -> list[Reminders]:
+        """
+        Атомарно арендует для обработчика пачку наступивших, неотправленных и никем не арендованных напоминаний.
+
+        На PostgreSQL кандидаты выбираются с FOR UPDATE SKIP LOCKED, поэтому конкурирующие обработчики
+        не ждут друг друга. На SQLite запись сериализуется блокировкой базы, а условие аренды повторно
+        проверяется в самом UPDATE, так что одно напоминание не достанется двум обработчикам.
+        Вызывайте в отдельной короткой транзакции и фиксируйте её сразу.
+
+        :param worker_id: Идентификатор обработчика.
+        :param now: Текущий момент.
+        :param limit: Максимальное количество арендуемых напоминаний. По умолчанию 100.
+        :param lease_seconds: Срок аренды в секундах. По умолчанию 60.
+        :return: Арендованные напоминания.
+        :raises ValueError: Если limit меньше 1 или lease_seconds не положителен.
+        """
+        if limit < 1:
+            raise ValueError(f"limit должен быть положительным, а не {limit}")
+        if lease_seconds <= 0:
+            raise ValueError(f"lease_seconds должен быть положительным, а не {lease_seconds}")
+
+        claimable = and_(Reminders.remind_at <= now,
+                         Reminders.dispatched_at.is_(None),
+                         or_(Reminders.lease_expires_at.is_(None), Reminders.lease_expires_at <= now))
+        candidates = select(Reminders.id).where(claimable).order_by(Reminders.remind_at).limit(limit)
+        if self._session.get_bind().dialect.name == "postgresql":
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        stmt = (update(Reminders)
+                .where(Reminders.id.in_(candidates.scalar_subquery()), claimable)
+                .values(leased_by=worker_id, lease_expires_at=now + timedelta(seconds=lease_seconds))
+                .returning(Reminders)
+                .execution_options(synchronize_session=False, populate_existing=True))
+        self._invalidate_cache()
+        return self._session.scalars(self._labeled(stmt, "claim_due")).all()
+
+    def ack(self, worker_id: str, ids: Iterable[int], now: datetime) -> int:
+        """
+        Подтверждает отправку арендованных напоминаний: они помечаются отправленными и больше не выдаются.
+
+        Напоминания, аренду которых после истечения перехватил другой обработчик, не подтверждаются.
+
+        :param worker_id: Идентификатор обработчика, арендовавшего напоминания.
+        :param ids: Идентификаторы напоминаний.
+        :param now: Момент отправки.
+        :return: Количество подтверждённых напоминаний.
+        """
+        return self._update_leased("ack", worker_id, ids, dispatched_at=now, leased_by=None, lease_expires_at=None)
+
+    def release(self, worker_id: str, ids: Iterable[int]) -> int:
+        """
+        Возвращает арендованные напоминания до истечения аренды, например при ошибке отправки.
+
+        :param worker_id: Идентификатор обработчика, арендовавшего напоминания.
+        :param ids: Идентификаторы напоминаний.
+        :return: Количество возвращённых напоминаний.
+        """
+        return self._update_leased("release", worker_id, ids, leased_by=None, lease_expires_at=None)
+
+    def _update_leased(self, operation: str, worker_id: str, ids: Iterable[int], **values) -> int:
+        ids = list(ids)
+        if not ids:
+            return 0
+        stmt = (update(Reminders)
+                .where(Reminders.id.in_(ids), Reminders.leased_by == worker_id, Reminders.dispatched_at.is_(None))
+                .values(**values)
+                .execution_options(synchronize_session="fetch"))
+        self._invalidate_cache()
+        return self._session.execute(self._labeled(stmt, operation)).rowcount
+
+
+def _history_select(table, keys: list[str], where_clause, archived: bool):
+    """Строит SELECT столбцов keys и признака archived из table, перенося условие со столбцов reminders на table."""
+    stmt = select(*(table.c[key] for key in keys), literal(archived).label("archived"))
+    if where_clause is None:
+        return stmt
+
+    reminders = Reminders.__table__
+
+    def replace(element):
+        if isinstance(element, Column) and element.table is reminders:
+            return table.c[element.key]
+        return None
+
+    return stmt.where(replacement_traverse(where_clause, {}, replace))
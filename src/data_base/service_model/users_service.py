@@ -0,0 +1,170 @@
+from typing import Any, Iterable, Optional, Union
+
+from sqlalchemy import select, inspect
+from sqlalchemy.orm import Session
+
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService, _batched, _where_clause
+from src.data_base.service_model.entity_cache import EntityCache
+from src.data_base.service_model.query_cache import QueryCache, snapshot_instances, restore_instances
+
+
+class UsersService(BaseCRUDService[Users]):
+    """
+    CRUD-сервис пользователей с поиском по id и nickname через кэш записей (EntityCache).
+
+    get/get_by_nickname и их пакетные варианты сначала ищут пользователей в кэше, а промахи загружают
+    одним запросом WHERE ... IN (...) на chunk_size ключей. update, delete, update_by_ids, delete_by_ids,
+    upsert и upsert_many сбрасывают затронутые записи кэша; для update и delete по фильтрам затронутые id
+    выбираются отдельным запросом перед изменением. Изменения загруженных объектов сбрасывают записи
+    кэша при flush (EntityCache.watch).
+    """
+
+    def __init__(self, session: Session, cache: Optional[QueryCache] = None,
+                 entity_cache: Optional[EntityCache] = None):
+        """
+        :param session: Сессия SQLAlchemy.
+        :param cache: Кэш результатов read, общий для сервисов разных сессий. По умолчанию кэш не используется.
+        :param entity_cache: Кэш записей Users, общий для сервисов разных сессий. По умолчанию кэш не используется.
+        :raises ValueError: Если entity_cache создан для другой модели.
+        """
+        if entity_cache is not None and entity_cache.model is not Users:
+            raise ValueError(f"entity_cache создан для модели {entity_cache.model.__name__}, а не Users")
+        super().__init__(session, Users, cache)
+        self._entity_cache = entity_cache
+        if entity_cache is not None:
+            entity_cache.watch(session)
+
+    def get(self, user_id: int) -> Optional[Users]:
+        """
+        Возвращает пользователя по id.
+
+        :param user_id: Идентификатор пользователя.
+        :return: Объект пользователя или None, если его нет.
+        """
+        return self.get_many([user_id]).get(user_id)
+
+    def get_by_nickname(self, nickname: str) -> Optional[Users]:
+        """
+        Возвращает пользователя по nickname.
+
+        :param nickname: Никнейм пользователя.
+        :return: Объект пользователя или None, если его нет.
+        """
+        return self.get_many_by_nickname([nickname]).get(nickname)
+
+    def get_many(self, user_ids: Iterable[int], chunk_size: int = 500) -> dict[int, Users]:
+        """
+        Возвращает пользователей по id: найденные в кэше — без запроса, остальные — запросами
+        WHERE id IN (...) по chunk_size ключей.
+
+        :param user_ids: Идентификаторы пользователей. Повторы учитываются один раз.
+        :param chunk_size: Максимальное количество ключей в одном IN. По умолчанию 500.
+        :return: Словарь {id: пользователь}. Отсутствующих пользователей в нём нет.
+        :raises ValueError: Если chunk_size меньше 1.
+        """
+        return self._lookup("id", user_ids, chunk_size)
+
+    def get_many_by_nickname(self, nicknames: Iterable[str], chunk_size: int = 500) -> dict[str, Users]:
+        """
+        Возвращает пользователей по nickname, как get_many.
+
+        :param nicknames: Никнеймы пользователей. Повторы учитываются один раз.
+        :param chunk_size: Максимальное количество ключей в одном IN. По умолчанию 500.
+        :return: Словарь {nickname: пользователь}. Отсутствующих пользователей в нём нет.
+        :raises ValueError: Если chunk_size меньше 1.
+        """
+        return self._lookup("nickname", nicknames, chunk_size)
+
+    def upsert(self, conflict_target: Optional[list] = None, update_columns: Optional[list] = None,
+               **values) -> Optional[Users]:
+        """Выполняет BaseCRUDService.upsert, сбрасывая запись кэша по переданным id и nickname."""
+        self._track_entity_rows([values])
+        return super().upsert(conflict_target, update_columns, **values)
+
+    def upsert_many(self, rows: Iterable[dict], conflict_target: Optional[list] = None,
+                    update_columns: Optional[list] = None, batch_size: int = 1000,
+                    return_ids: bool = False) -> Union[int, list[Any]]:
+        """Выполняет BaseCRUDService.upsert_many, сбрасывая записи кэша по id и nickname строк."""
+        if self._entity_cache is not None:
+            rows = list(rows)
+            self._track_entity_rows(rows)
+        return super().upsert_many(rows, conflict_target, update_columns, batch_size, return_ids)
+
+    def delete(self, **filters) -> int:
+        """Выполняет BaseCRUDService.delete, сбрасывая записи кэша удаляемых пользователей."""
+        if self._entity_cache is not None:
+            self._track_entity_write("id", self._session.scalars(
+                self._labeled(select(Users.id).filter_by(**filters), "delete")))
+        return super().delete(**filters)
+
+    def update(self, filters: list[Any], updates: dict, use_or: bool = False, ) -> int:
+        """Выполняет BaseCRUDService.update, сбрасывая записи кэша изменяемых пользователей."""
+        if self._entity_cache is not None and isinstance(filters, list) and filters:
+            self._track_entity_write("id", self._session.scalars(
+                self._labeled(select(Users.id).where(_where_clause(filters, use_or)), "update")))
+        return super().update(filters, updates, use_or)
+
+    def delete_by_ids(self, ids: Iterable[Any], chunk_size: int = 500,
+                      synchronize_session: Union[str, bool] = "evaluate") -> int:
+        """Выполняет BaseCRUDService.delete_by_ids, сбрасывая записи кэша по ids."""
+        ids = list(ids)
+        self._track_entity_write("id", ids)
+        return super().delete_by_ids(ids, chunk_size, synchronize_session)
+
+    def update_by_ids(self, ids: Iterable[Any], updates: dict, chunk_size: int = 500,
+                      synchronize_session: Union[str, bool] = "evaluate") -> int:
+        """Выполняет BaseCRUDService.update_by_ids, сбрасывая записи кэша по ids."""
+        ids = list(ids)
+        self._track_entity_write("id", ids)
+        return super().update_by_ids(ids, updates, chunk_size, synchronize_session)
+
+    def _lookup(self, key: str, values: Iterable[Any], chunk_size: int) -> dict[Any, Users]:
+        """
+        Ищет пользователей по столбцу key в кэше, а промахи — в базе, сохраняя найденных в кэш.
+
+        Пока в транзакции сессии есть изменения через сервис, кэш не используется и не пополняется,
+        чтобы сессия видела свои изменения, а другие сессии не получили незафиксированные данные.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size должен быть положительным, а не {chunk_size}")
+
+        use_cache = self._entity_cache is not None and not self._entity_cache.has_pending_writes(self._session)
+        found = {}
+        missing = []
+        for value in dict.fromkeys(values):
+            snapshot = self._entity_cache.get(key, value) if use_cache else None
+            if snapshot is None:
+                missing.append(value)
+            else:
+                found[value] = snapshot
+
+        if found:
+            instances = restore_instances(self._session, Users, list(found.values()))
+            found = dict(zip(found, instances))
+
+        # Результаты ключуются значением столбца из строки базы, а не атрибутом объекта: объект, уже
+        # находящийся в сессии, запрос не перезаписывает, и его атрибут может отличаться от базы.
+        # Объекты с изменениями, ещё не записанными flush, в кэш не попадают.
+        column = getattr(Users, key)
+        # Номер сброса снимается до запроса: если другая сессия изменила и сбросила запись, пока шёл запрос,
+        # прочитанный снимок устарел и в кэш не попадает.
+        for chunk in _batched(missing, chunk_size):
+            generation = self._entity_cache.generation() if use_cache else None
+            rows = self._session.execute(self._labeled(select(Users, column).where(column.in_(chunk)), "get")).all()
+            if use_cache:
+                for snapshot in snapshot_instances([user for user, _ in rows if not inspect(user).modified]):
+                    self._entity_cache.put(snapshot, generation)
+            found.update((value, user) for user, value in rows)
+        return found
+
+    def _track_entity_rows(self, rows: list[dict]) -> None:
+        """Сбрасывает записи кэша по значениям id и nickname, переданным в строках upsert."""
+        if self._entity_cache is None:
+            return
+        for key in self._entity_cache.keys:
+            self._track_entity_write(key, [row[key] for row in rows if key in row])
+
+    def _track_entity_write(self, key: str, values: Iterable[Any]) -> None:
+        if self._entity_cache is not None:
+            self._entity_cache.track_write(self._session, key, values)
@@ -1,9 +1,33 @@
-from typing import Type, Union
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Type, Union
 
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, inspect, select, insert, delete, func
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import DeclarativeMeta
+from sqlalchemy.schema import CreateTable, CreateIndex
 
+from .configuration.constrains import TableName
+from .dialects import UPSERT_DIALECTS
 from .model import BaseModel
 
+logger = logging.getLogger(__name__)
+
+# Служебная таблица с отпечатком схемы. Объявлена в отдельных метаданных, чтобы не входить в отпечаток
+# и не создаваться вместе с таблицами моделей.
+schema_metadata = MetaData()
+schema_fingerprint_table = Table(
+    TableName.SCHEMA_FINGERPRINT.value, schema_metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("fingerprint", String(64), nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+# Ключ транзакционной advisory-блокировки PostgreSQL, под которой ensure_tables создаёт таблицы.
+SCHEMA_LOCK_KEY = 0x5C4E3A
+
+
 class TableManager:
     def __init__(self, engine):
         self.engine = engine
@@ -18,6 +42,94 @@ class TableManager:
         """Удаляет таблицы, если они существуют."""
         validation_models = self._validation_model(models)
         self._apply_to_tables(validation_models, "drop")
+        schema_fingerprint_table.drop(self.engine, checkfirst=True)
+
+    def ensure_tables(self) -> bool:
+        """
+        Режим запуска: создаёт недостающие таблицы всех моделей, если схема изменилась с прошлого запуска.
+
+        Отпечаток BaseModel.metadata (см. schema_fingerprint) сравнивается с сохранённым в таблице
+        schema_fingerprint. Если они совпадают, DDL и проверки существования таблиц не выполняются —
+        только один SELECT. Иначе имена существующих таблиц читаются за один проход инспектора,
+        недостающие таблицы и их индексы создаются через CREATE ... IF NOT EXISTS, и отпечаток
+        сохраняется upsert'ом.
+
+        Несколько процессов могут вызвать ensure_tables одновременно: таблицу, созданную другим процессом
+        между проверкой и созданием, IF NOT EXISTS пропускает, а upsert не даёт второй строке отпечатка
+        нарушить первичный ключ. На PostgreSQL создание к тому же выполняется под транзакционной
+        advisory-блокировкой (pg_advisory_xact_lock), так как параллельные CREATE TABLE IF NOT EXISTS
+        одной таблицы там всё равно могут конфликтовать.
+
+        Изменения уже существующих таблиц не применяются — это задача миграций. Если у существующей таблицы
+        столбцы или индексы (по именам и столбцам индексов) расходятся с моделью, в журнал пишется
+        предупреждение со списком таких таблиц, а отпечаток не сохраняется: проверка и предупреждение
+        повторяются при каждом запуске, пока схема не будет мигрирована. Изменения типов столбцов так
+        не обнаруживаются. Отпечаток сбрасывается drop_tables; таблицы, удалённые в обход TableManager,
+        не будут созданы заново, пока отпечаток не изменится.
+
+        :return: True, если выполнялась проверка и создание таблиц; False, если схема не менялась.
+        """
+        fingerprint = self.schema_fingerprint()
+        if self._stored_fingerprint() == fingerprint:
+            return False
+
+        with self.engine.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                connection.execute(select(func.pg_advisory_xact_lock(SCHEMA_LOCK_KEY)))
+            inspector = inspect(connection)
+            existing = set(inspector.get_table_names())
+            missing = [table for table in self.base_model.metadata.sorted_tables if table.name not in existing]
+            changed = [table.name for table in self.base_model.metadata.sorted_tables
+                       if table.name in existing and _differs_from_database(inspector, table)]
+            if schema_fingerprint_table.name not in existing:
+                missing.append(schema_fingerprint_table)
+            for table in missing:
+                connection.execute(CreateTable(table, if_not_exists=True))
+                for index in sorted(table.indexes, key=lambda index: index.name or ""):
+                    connection.execute(CreateIndex(index, if_not_exists=True))
+
+            if changed:
+                logger.warning("Таблицы %s отличаются от моделей: изменения существующих таблиц нужно применить "
+                               "миграцией. Отпечаток схемы не сохранён", ", ".join(changed))
+            else:
+                self._store_fingerprint(connection, fingerprint)
+        return True
+
+    def schema_fingerprint(self) -> str:
+        """
+        Вычисляет отпечаток схемы моделей: SHA-256 от DDL всех таблиц и индексов BaseModel.metadata,
+        скомпилированного для диалекта движка.
+        """
+        dialect = self.engine.dialect
+        digest = hashlib.sha256(dialect.name.encode())
+        for table in sorted(self.base_model.metadata.tables.values(), key=lambda table: table.name):
+            digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+            for index in sorted(table.indexes, key=lambda index: index.name or ""):
+                digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+        return digest.hexdigest()
+
+    def _stored_fingerprint(self) -> Optional[str]:
+        """Возвращает сохранённый отпечаток схемы или None, если его нет (в том числе нет самой таблицы)."""
+        try:
+            with self.engine.connect() as connection:
+                return connection.scalar(select(schema_fingerprint_table.c.fingerprint)
+                                         .where(schema_fingerprint_table.c.id == 1))
+        except DBAPIError:
+            return None
+
+    @staticmethod
+    def _store_fingerprint(connection, fingerprint: str) -> None:
+        """Сохраняет отпечаток схемы в строку id=1: upsert'ом, если диалект его поддерживает."""
+        values = {"id": 1, "fingerprint": fingerprint, "updated_at": datetime.now(timezone.utc).replace(tzinfo=None)}
+        dialect_insert = UPSERT_DIALECTS.get(connection.dialect.name)
+        if dialect_insert is None:
+            connection.execute(delete(schema_fingerprint_table))
+            connection.execute(insert(schema_fingerprint_table).values(values))
+            return
+        stmt = dialect_insert(schema_fingerprint_table).values(values)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=["id"], set_={"fingerprint": stmt.excluded.fingerprint,
+                                         "updated_at": stmt.excluded.updated_at}))
 
     def _validation_model(self, models: Union[Type[DeclarativeMeta], list[Type[DeclarativeMeta]], None]):
         """
@@ -45,7 +157,7 @@ class TableManager:
 
     def _apply_to_tables(self, models: Union[Type[DeclarativeMeta], list[Type[DeclarativeMeta]], None],
                          action: str) -> None:
-        """Применяет указанное действие к таблицам моделей."""
+        """Применяет указанное действие к таблицам моделей одним вызовом create_all/drop_all."""
         action_type = {
             "create": lambda model_obj, model_tables: model_obj.metadata.create_all(bind=self.engine,
                                                                                     tables=model_tables),
@@ -55,8 +167,21 @@ class TableManager:
         if action not in action_type:
             raise ValueError(f"Неизвестное действие: {action}")
 
+        model_tables = []
         for model in models:
-            model_tables = None
-            if hasattr(model, "__table__"):
-                model_tables = [model.__table__]
-            action_type[action](model, model_tables)
\ No newline at end of file
+            if not hasattr(model, "__table__"):
+                model_tables = None
+                break
+            model_tables.append(model.__table__)
+        action_type[action](self.base_model, model_tables)
+
+
+def _differs_from_database(inspector, table: Table) -> bool:
+    """Проверяет, расходятся ли имена столбцов или индексы (имена и столбцы) таблицы модели с базой."""
+    columns = {column["name"] for column in inspector.get_columns(table.name)}
+    if columns != {column.name for column in table.columns}:
+        return True
+    indexes = {index["name"]: index["column_names"] for index in inspector.get_indexes(table.name)
+               if not index.get("duplicates_constraint")}
+    expected = {index.name: [column.name for column in index.columns] for index in table.indexes}
+    return indexes != expected
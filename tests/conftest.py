@@ -1,8 +1,12 @@
+import dataclasses
+
 import pytest
+from sqlalchemy import event
 
 from src.data_base.configuration.config import DataBaseConfig
 from src.data_base.data_base_service import DataBaseService
 from src.data_base.engine import DatabaseEngine
+from src.data_base.model import Users
 from src.data_base.table_manager import TableManager
 
 
@@ -56,3 +60,77 @@ def db_session(db_service):
     """
     with db_service.session_scope(commit=False) as session:
         yield session
+
+
+@pytest.fixture
+def setup_users_table(table_manager):
+    """Фикстура для создания таблицы Users на чистой базе."""
+    table_manager.drop_tables()
+    table_manager.create_tables(Users)
+
+
+@pytest.fixture
+def file_db_config(tmp_path):
+    """
+    Конфигурация файловой SQLite для file_db_service. Модуль с тестами может переопределить фикстуру,
+    чтобы задать другие параметры конфигурации.
+
+    :param tmp_path: Временный каталог теста.
+    """
+    return DataBaseConfig(url=f"sqlite:///{tmp_path / 'test.db'}")
+
+
+@pytest.fixture
+def make_file_db_service(tmp_path, file_db_config):
+    """
+    Возвращает функцию, создающую сервис на новой файловой SQLite со всеми таблицами по конфигурации
+    file_db_config. Функция принимает имя файла базы и параметры DataBaseService.
+
+    :param tmp_path: Временный каталог теста.
+    :param file_db_config: Конфигурация базы данных.
+    """
+    def make(file_name: str = "test.db", **service_options) -> DataBaseService:
+        config = dataclasses.replace(file_db_config, url=f"sqlite:///{tmp_path / file_name}")
+        engine = DatabaseEngine.from_config(config).get_engine()
+        TableManager(engine).create_tables()
+        return DataBaseService(config, engine, **service_options)
+
+    return make
+
+
+@pytest.fixture
+def file_db_service(make_file_db_service):
+    """
+    Сервис на файловой SQLite со всеми таблицами. В отличие от db_service, у каждой сессии своё соединение
+    из пула, и сессия видит только зафиксированные данные других сессий.
+
+    :param make_file_db_service: Функция создания сервиса на файловой SQLite.
+    """
+    return make_file_db_service()
+
+
+@pytest.fixture
+def statements_engine(db_engine):
+    """
+    Движок, запросы которого собирает фикстура statements. Модуль с тестами может переопределить фикстуру.
+
+    :param db_engine: Объект подключения к базе данных.
+    """
+    return db_engine
+
+
+@pytest.fixture
+def statements(statements_engine):
+    """
+    Собирает SQL-запросы, отправленные в базу во время теста.
+
+    :param statements_engine: Движок, запросы которого собираются.
+    """
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(statements_engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(statements_engine, "before_cursor_execute", before_cursor_execute)
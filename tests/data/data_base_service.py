@@ -9,6 +9,6 @@ parametrize_create_tables_with_specific_models = [
     (Users, "users", nullcontext()),
     (Reminders, "reminders", nullcontext()),
     ([Users, Reminders], ["users", "reminders"], nullcontext()),
-    (None, ["users", "reminders"], nullcontext()),
+    (None, ["users", "reminders", "reminders_archive"], nullcontext()),
     ("...", ["users", "reminders"], pytest.raises(TypeError))
 ]
@@ -158,3 +158,68 @@ parametrize_with_filter_sorted_limit = [
     )
 ]
 
+
+parametrize_create_many = [
+    # Одна неполная пачка
+    ([{"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(3)], 10),
+    # Несколько пачек, последняя неполная
+    ([{"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(25)], 10),
+    # Размер пачки равен количеству строк
+    ([{"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(5)], 5),
+]
+
+parametrize_read_page = [
+    # Сортировка по неуникальному полю, дубликаты разрешаются по id
+    ([{"nickname": f"user{i}", "name": "ABC"[i % 3], "surname": "Иванов"} for i in range(10)], "name", 3),
+    ([{"nickname": f"user{i}", "name": "ABC"[i % 3], "surname": "Иванов"} for i in range(10)], "name desc", 4),
+    # Сортировка по нескольким полям с разными направлениями
+    ([{"nickname": f"user{i}", "name": "AB"[i % 2], "surname": "XYZ"[i % 3]} for i in range(12)],
+     "name asc, surname desc", 5),
+    # Размер страницы больше количества записей
+    ([{"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(3)], None, 10),
+]
+
+parametrize_read_columns = [
+    # (столбцы, shape, ожидаемое представление первой строки)
+    (["id", "nickname"], "row", (1, "user0")),
+    (["nickname", "name"], "row", ("user0", "Иван")),
+    (["id", "nickname"], "dict", {"id": 1, "nickname": "user0"}),
+    (["nickname"], "dataclass", {"nickname": "user0"}),
+]
+
+parametrize_invalid_columns = [
+    # Не список
+    ("nickname", "row", TypeError),
+    ([], "row", ValueError),
+    # Нет такого поля или это связь, а не столбец
+    (["missing"], "row", ValueError),
+    (["reminders"], "row", ValueError),
+    # Условие вместо столбца
+    ([42], "row", TypeError),
+    (["nickname"], "json", ValueError),
+]
+
+parametrize_count = [
+    # (данные пользователей, фильтры {поле: значение}, use_or, ожидаемое количество)
+    ([{"nickname": f"user{i}", "name": "AB"[i % 2], "surname": "Иванов"} for i in range(5)], {}, False, 5),
+    ([{"nickname": f"user{i}", "name": "AB"[i % 2], "surname": "Иванов"} for i in range(5)], {"name": "A"}, False, 3),
+    ([{"nickname": f"user{i}", "name": "AB"[i % 2], "surname": "Иванов"} for i in range(5)],
+     {"name": "B", "nickname": "user0"}, True, 3),
+    ([{"nickname": f"user{i}", "name": "AB"[i % 2], "surname": "Иванов"} for i in range(5)], {"name": "C"}, False, 0),
+    ([], {}, False, 0),
+]
+
+parametrize_upsert_many = [
+    # (существующие никнеймы, никнеймы для upsert, batch_size, ожидаемое количество INSERT)
+    ([], [f"user{i}" for i in range(5)], 2, 3),
+    ([f"user{i}" for i in range(3)], [f"user{i}" for i in range(5)], 10, 1),
+    ([f"user{i}" for i in range(5)], [f"user{i}" for i in range(5)], 5, 1),
+]
+
+parametrize_by_ids = [
+    # (количество пользователей, индексы удаляемых/обновляемых, chunk_size, synchronize_session, ожидаемое число IN)
+    (10, list(range(10)), 3, "evaluate", 4),
+    (10, [1, 3, 3, 5, 1], 2, "fetch", 2),
+    (10, [0, 9], 500, False, 1),
+    (10, [], 3, None, 0),
+]
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+EVENT_DATE = datetime(2025, 1, 10, 12, 0)
+
+parametrize_update_remind_at = [
+    # Заданы оба поля — массовый UPDATE
+    ({"event_date": datetime(2025, 1, 11, 12, 0), "remind_before": 30}, datetime(2025, 1, 11, 11, 30)),
+    # Только event_date — обновление через объекты
+    ({"event_date": datetime(2025, 1, 11, 12, 0)}, datetime(2025, 1, 11, 11, 0)),
+    # Только remind_before — обновление через объекты
+    ({"remind_before": 120}, datetime(2025, 1, 10, 10, 0)),
+    # Поля remind_at не затронуты
+    ({"task_description": "Другое"}, datetime(2025, 1, 10, 11, 0)),
+]
+
+parametrize_fetch_due = [
+    # (смещения remind_at от now в минутах, limit, ожидаемые смещения)
+    ([-30, 10, -5, -60, 0, 45], 10, [-60, -30, -5, 0]),
+    ([-30, 10, -5, -60, 0, 45], 2, [-60, -30]),
+    ([10, 20], 5, []),
+]
+
+parametrize_load = [
+    # (load, ожидаемое количество запросов на 10 пользователей с напоминаниями)
+    ("reminders", 2),
+    ({"reminders": "selectin"}, 2),
+    ({"reminders": "joined"}, 1),
+]
+
+parametrize_invalid_load = [
+    ("missing", ValueError),
+    ({"reminders": "lazy"}, ValueError),
+    ("nickname", ValueError),
+    (42, TypeError),
+]
+
+parametrize_archive = [
+    # (возраст событий в днях, retention в днях, batch_size, ожидаемое количество перенесённых, пачек DELETE)
+    ([0, 1, 2, 5, 6, 7, 8, 30], 3, 2, 5, 3),
+    ([0, 1, 2, 5, 6, 7, 8, 30], 3, 5, 5, 1),
+    ([0, 1, 2], 3, 2, 0, 0),
+    ([10, 20], 0, 100, 2, 1),
+]
+
+parametrize_import_users_csv = [
+    # (содержимое CSV, batch_size, ожидаемое количество загруженных, ожидаемые номера строк с ошибками)
+    ("nickname,name,surname\nuser1,Иван,Иванов\nuser2,Пётр,Петров\n", 10, 2, []),
+    # Дубликат никнейма внутри пачки: пачка повторяется по строкам
+    ("nickname,name,surname\nuser1,Иван,Иванов\nuser2,Пётр,Петров\nuser1,Павел,Павлов\nuser3,Иван,Иванов\n", 2, 3, [4]),
+    # Пустое обязательное поле, лишнее значение, отсутствующее поле
+    ("nickname,name,surname\n,Иван,Иванов\nuser2,Пётр,Петров,лишнее\nuser3,Иван,Иванов\n", 10, 1, [2, 3]),
+    ("nickname,name\nuser1,Иван\n", 10, 0, [2]),
+    # Слишком длинное значение и неизвестное поле
+    (f"nickname,name,surname\n{'x' * 51},Иван,Иванов\n", 10, 0, [2]),
+    ("nickname,name,surname,age\nuser1,Иван,Иванов,30\n", 10, 0, [2]),
+]
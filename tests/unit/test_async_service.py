@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.data_base.async_data_base_service import AsyncDataBaseService
+from src.data_base.configuration.config import DataBaseConfig
+from src.data_base.engine import AsyncDatabaseEngine
+from src.data_base.model import BaseModel, Users
+from src.data_base.service_model.async_base_service import AsyncBaseCRUDService
+from ..data.data_model_users import parametrize_create, parametrize_filter_single_field
+
+
+def run_async(url, scenario):
+    """
+    Создаёт асинхронный сервис с чистыми таблицами и выполняет в нём сценарий.
+
+    Движок создаётся и закрывается внутри одного цикла событий, так как соединения aiosqlite к нему привязаны.
+
+    :param url: URL базы данных с драйвером aiosqlite.
+    :param scenario: Корутинная функция, принимающая AsyncDataBaseService.
+    """
+    async def main():
+        engine = await AsyncDatabaseEngine(url).get_engine(ensure_available=True)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(BaseModel.metadata.drop_all)
+                await conn.run_sync(BaseModel.metadata.create_all)
+            return await scenario(AsyncDataBaseService(DataBaseConfig(url=url), engine))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def async_url():
+    return "sqlite+aiosqlite:///:memory:"
+
+
+@pytest.fixture
+def async_file_url(tmp_path):
+    return f"sqlite+aiosqlite:///{tmp_path / 'async.db'}"
+
+
+class TestAsyncBaseCRUDService:
+
+    @pytest.mark.parametrize("users_data, expected_count", parametrize_create)
+    def test_create_and_read(self, async_url, users_data, expected_count):
+        async def scenario(service):
+            async with service.session_scope() as session:
+                crud = AsyncBaseCRUDService(session, Users)
+                for user_data in users_data:
+                    await crud.create(**user_data)
+
+            async with service.session_scope(commit=False) as session:
+                return await AsyncBaseCRUDService(session, Users).read(order_by=Users.id)
+
+        users = run_async(async_url, scenario)
+
+        assert len(users) == expected_count
+        assert [user.nickname for user in users] == [user_data["nickname"] for user_data in users_data]
+
+    @pytest.mark.parametrize("users_data, filter_field, expected_count", parametrize_filter_single_field)
+    def test_read_with_filter(self, async_url, users_data, filter_field, expected_count):
+        async def scenario(service):
+            async with service.session_scope() as session:
+                crud = AsyncBaseCRUDService(session, Users)
+                for user_data in users_data:
+                    await crud.create(**user_data)
+                await session.flush()
+                filters = [getattr(Users, key) == value for key, value in filter_field.items()]
+                return await crud.read(filters=filters, order_by="nickname", limit=10, offset=0)
+
+        users = run_async(async_url, scenario)
+        assert len(users) == expected_count
+
+    def test_update_and_delete(self, async_url):
+        async def scenario(service):
+            async with service.session_scope() as session:
+                crud = AsyncBaseCRUDService(session, Users)
+                for i in range(3):
+                    await crud.create(nickname=f"user{i}", name="Иван", surname="Иванов")
+
+            async with service.session_scope() as session:
+                crud = AsyncBaseCRUDService(session, Users)
+                updated = await crud.update([Users.nickname == "user1"], {"name": "Пётр"})
+                deleted = await crud.delete(nickname="user2")
+
+            async with service.session_scope(commit=False) as session:
+                users = await AsyncBaseCRUDService(session, Users).read(order_by=Users.id)
+            return updated, deleted, users
+
+        updated, deleted, users = run_async(async_url, scenario)
+
+        assert (updated, deleted) == (1, 1)
+        assert [(user.nickname, user.name) for user in users] == [("user0", "Иван"), ("user1", "Пётр")]
+
+    def test_update_invalid_arguments(self, async_url):
+        async def scenario(service):
+            async with service.session_scope(commit=False) as session:
+                crud = AsyncBaseCRUDService(session, Users)
+                with pytest.raises(ValueError):
+                    await crud.update([], {"name": "Пётр"})
+                with pytest.raises(TypeError):
+                    await crud.update(["nickname"], {"name": "Пётр"})
+
+        run_async(async_url, scenario)
+
+    def test_rollback_on_error(self, async_url):
+        async def scenario(service):
+            with pytest.raises(IntegrityError):
+                async with service.session_scope() as session:
+                    crud = AsyncBaseCRUDService(session, Users)
+                    await crud.create(nickname="user1", name="Иван", surname="Иванов")
+                    await crud.create(nickname="user1", name="Иван", surname="Иванов")
+
+            async with service.session_scope(commit=False) as session:
+                return await AsyncBaseCRUDService(session, Users).read()
+
+        assert run_async(async_url, scenario) == []
+
+    def test_concurrent_sessions_share_one_loop(self, async_file_url):
+        """Тест проверяет, что множество конкурентных запросов обслуживается одним циклом событий."""
+        requests_count = 50
+
+        async def handle_request(service, index):
+            async with service.session_scope() as session:
+                await AsyncBaseCRUDService(session, Users).create(nickname=f"user{index}", name="Иван",
+                                                                  surname="Иванов")
+            async with service.session_scope(commit=False) as session:
+                users = await AsyncBaseCRUDService(session, Users).read(filters=[Users.nickname == f"user{index}"])
+            return len(users)
+
+        async def scenario(service):
+            results = await asyncio.gather(*(handle_request(service, i) for i in range(requests_count)))
+            async with service.session_scope(commit=False) as session:
+                return results, await AsyncBaseCRUDService(session, Users).read()
+
+        results, users = run_async(async_file_url, scenario)
+
+        assert results == [1] * requests_count
+        assert len(users) == requests_count
@@ -0,0 +1,74 @@
+import pytest
+
+from src.data_base.configuration import load_config, DataBaseType, DataBaseConfig
+
+
+def _write_config(tmp_path, body):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(body, encoding="utf-8")
+    return str(config_path)
+
+
+class TestLoadConfig:
+
+    def test_coerces_types(self, tmp_path):
+        config_path = _write_config(tmp_path, """
+[sqlite]
+url = sqlite:///file.db
+echo = False
+autocommit = false
+autoflush = yes
+pool_size = 5
+max_overflow = 10
+pool_timeout = 2.5
+pool_recycle = 1800
+pool_pre_ping = True
+pool_class = QueuePool
+pool_warmup = 3
+""")
+        config = load_config(DataBaseType.SQLite, config_path)
+
+        assert config == DataBaseConfig(url="sqlite:///file.db", echo=False, autocommit=False, autoflush=True,
+                                        pool_size=5, max_overflow=10, pool_timeout=2.5, pool_recycle=1800,
+                                        pool_pre_ping=True, pool_class="QueuePool", pool_warmup=3)
+
+    def test_defaults_and_none(self, tmp_path):
+        config_path = _write_config(tmp_path, """
+[sqlite]
+url = sqlite:///file.db
+pool_size = none
+pool_timeout =
+""")
+        config = load_config(DataBaseType.SQLite, config_path)
+
+        assert config == DataBaseConfig(url="sqlite:///file.db")
+
+    @pytest.mark.parametrize("line", ["pool_size = five", "echo = maybe", "pool_timeout = fast", "unknown = 1"])
+    def test_invalid_values(self, tmp_path, line):
+        config_path = _write_config(tmp_path, f"[sqlite]\nurl = sqlite:///file.db\n{line}\n")
+        with pytest.raises(ValueError):
+            load_config(DataBaseType.SQLite, config_path)
+
+    def test_missing_section(self, tmp_path):
+        config_path = _write_config(tmp_path, "[sqlite]\nurl = sqlite:///file.db\n")
+        with pytest.raises(ValueError):
+            load_config(DataBaseType.PostgreSQL, config_path)
+
+    def test_repository_config(self):
+        config = load_config(DataBaseType.SQLite, "src/data_base/config.ini")
+        assert config.echo is True
+        assert config.pool_size == 5
+        assert config.pool_pre_ping is True
+
+    def test_replica_urls_list(self, tmp_path):
+        config_path = _write_config(tmp_path, """
+[sqlite]
+url = sqlite:///primary.db
+replica_urls = sqlite:///replica1.db,
+    sqlite:///replica2.db
+replica_strategy = least_busy
+""")
+        config = load_config(DataBaseType.SQLite, config_path)
+
+        assert config.replica_urls == ["sqlite:///replica1.db", "sqlite:///replica2.db"]
+        assert config.replica_strategy == "least_busy"
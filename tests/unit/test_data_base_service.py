@@ -1,6 +1,14 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from sqlalchemy import inspect
+from sqlalchemy import inspect, event, update, text, Column, Integer
+from sqlalchemy.orm import DeclarativeBase
 
+from src.data_base.engine import DatabaseEngine
+from src.data_base.model import Users, Reminders
+from src.data_base.table_manager import TableManager, schema_fingerprint_table
 from ..data.data_base_service import parametrize_create_tables_with_specific_models
 
 
@@ -50,3 +58,115 @@ class TestDataBaseService:
             tables = inspector.get_table_names()
             expected = [excepted_tables] if not isinstance(excepted_tables, (list, tuple)) else excepted_tables
             assert sorted(expected) == sorted(tables)
+
+
+class TestSchemaFingerprint:
+
+    @pytest.fixture
+    def file_engine(self, tmp_path):
+        return DatabaseEngine(f"sqlite:///{tmp_path / 'schema.db'}").get_engine()
+
+    @pytest.fixture
+    def statements_engine(self, file_engine):
+        return file_engine
+
+    def test_unchanged_schema_skips_ddl(self, file_engine, statements):
+        """Тест проверяет, что при неизменной схеме ensure_tables выполняет только чтение отпечатка."""
+        table_manager = TableManager(file_engine)
+
+        assert table_manager.ensure_tables() is True
+        assert {"users", "reminders", "reminders_archive", "schema_fingerprint"} == \
+               set(inspect(file_engine).get_table_names())
+
+        statements.clear()
+        assert TableManager(file_engine).ensure_tables() is False
+        assert len(statements) == 1 and statements[0].startswith("SELECT")
+
+    def test_creates_missing_tables(self, file_engine, statements):
+        table_manager = TableManager(file_engine)
+        table_manager.create_tables(Users)
+        statements.clear()
+
+        assert table_manager.ensure_tables() is True
+
+        assert not [statement for statement in statements if "CREATE TABLE users" in statement]
+        assert len([statement for statement in statements if "sqlite_master" in statement]) == 1
+        assert sorted(inspect(file_engine).get_table_names()) == \
+               ["reminders", "reminders_archive", "schema_fingerprint", "users"]
+
+    def test_concurrent_workers(self, tmp_path):
+        """
+        Тест проверяет, что два процесса, одновременно запустившие ensure_tables на пустой базе, не мешают
+        друг другу: оба успевают проверить таблицы до того, как первый начнёт их создавать.
+        """
+        url = f"sqlite:///{tmp_path / 'schema.db'}"
+        engines = [DatabaseEngine(url).get_engine() for _ in range(2)]
+        barrier = threading.Barrier(len(engines), timeout=10)
+        for engine in engines:
+            waiting = [True]
+
+            def before_cursor_execute(conn, cursor, statement, *args, waiting=waiting):
+                if waiting and statement.lstrip().startswith("CREATE TABLE"):
+                    waiting.clear()
+                    barrier.wait()
+
+            event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+        with ThreadPoolExecutor(len(engines)) as executor:
+            results = list(executor.map(lambda engine: TableManager(engine).ensure_tables(), engines))
+
+        assert results == [True, True]
+        with engines[0].connect() as connection:
+            rows = connection.execute(schema_fingerprint_table.select()).all()
+        assert [row.fingerprint for row in rows] == [TableManager(engines[0]).schema_fingerprint()]
+        assert TableManager(engines[0]).ensure_tables() is False
+
+    def test_changed_existing_table_reported(self, file_engine, caplog):
+        """
+        Тест проверяет, что расхождение существующей таблицы с моделью попадает в журнал, а отпечаток
+        не сохраняется, пока схема не мигрирована.
+        """
+        with file_engine.begin() as connection:
+            connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, nickname VARCHAR(50))"))
+        table_manager = TableManager(file_engine)
+
+        with caplog.at_level(logging.WARNING, logger="src.data_base.table_manager"):
+            assert table_manager.ensure_tables() is True
+            assert table_manager.ensure_tables() is True
+
+        assert [record.args[0] for record in caplog.records] == ["users", "users"]
+        assert "reminders" in inspect(file_engine).get_table_names()
+
+    def test_changed_fingerprint(self, file_engine):
+        table_manager = TableManager(file_engine)
+        table_manager.ensure_tables()
+        with file_engine.begin() as connection:
+            connection.execute(update(schema_fingerprint_table).values(fingerprint="old"))
+
+        assert table_manager.ensure_tables() is True
+        assert table_manager.ensure_tables() is False
+
+    def test_fingerprint_depends_on_metadata(self, file_engine):
+        class OtherBase(DeclarativeBase):
+            pass
+
+        class Other(OtherBase):
+            __tablename__ = "other"
+            id = Column(Integer, primary_key=True)
+
+        table_manager = TableManager(file_engine)
+        fingerprint = table_manager.schema_fingerprint()
+        assert fingerprint == TableManager(file_engine).schema_fingerprint()
+
+        table_manager.base_model = OtherBase
+        assert table_manager.schema_fingerprint() != fingerprint
+
+    def test_drop_tables_clears_fingerprint(self, file_engine):
+        table_manager = TableManager(file_engine)
+        table_manager.ensure_tables()
+
+        table_manager.drop_tables(Reminders)
+
+        assert "schema_fingerprint" not in inspect(file_engine).get_table_names()
+        assert table_manager.ensure_tables() is True
+        assert "reminders" in inspect(file_engine).get_table_names()
@@ -0,0 +1,98 @@
+import io
+import json
+from datetime import timedelta
+
+import pytest
+
+from src.data_base.data_transfer import DataTransfer
+from src.data_base.model import Users, Reminders
+from src.data_base.service_model.base_service import BaseCRUDService
+from ..data.data_reminders import EVENT_DATE, parametrize_import_users_csv
+
+
+def _nicknames(db_service):
+    with db_service.session_scope(commit=False) as session:
+        return [row.nickname for row in BaseCRUDService(session, Users).read(columns=["nickname"], order_by=Users.id)]
+
+
+class TestImport:
+
+    @pytest.mark.parametrize("content, batch_size, expected_imported, expected_error_lines",
+                             parametrize_import_users_csv)
+    def test_import_csv(self, file_db_service, content, batch_size, expected_imported, expected_error_lines):
+        """
+        Тест проверяет загрузку пользователей из CSV: корректные строки загружаются,
+        а ошибки проверки и отказы базы возвращаются с номерами строк файла.
+        """
+        result = DataTransfer(file_db_service, batch_size=batch_size).import_csv(Users, io.StringIO(content))
+
+        assert result.imported == expected_imported == len(_nicknames(file_db_service))
+        assert [error.line for error in result.errors] == expected_error_lines
+
+    def test_import_jsonl(self, file_db_service, tmp_path):
+        with file_db_service.session_scope() as session:
+            BaseCRUDService(session, Users).create(nickname="user1", name="Иван", surname="Иванов")
+        path = tmp_path / "reminders.jsonl"
+        path.write_text("\n".join([
+            json.dumps({"user_id": 1, "task_description": "Звонок", "event_date": EVENT_DATE.isoformat(),
+                        "remind_before": 15}),
+            "",
+            "{не json",
+            json.dumps({"user_id": 1, "task_description": "Звонок", "event_date": "завтра", "remind_before": 15}),
+            json.dumps({"user_id": 1, "task_description": "Встреча", "event_date": EVENT_DATE.isoformat(),
+                        "remind_before": 1.5}),
+            json.dumps([1, 2]),
+        ]), encoding="utf-8")
+
+        result = DataTransfer(file_db_service).import_jsonl(Reminders, str(path))
+
+        assert result.imported == 1
+        assert [error.line for error in result.errors] == [3, 4, 5, 6]
+        with file_db_service.session_scope(commit=False) as session:
+            reminder = BaseCRUDService(session, Reminders).read()[0]
+            assert reminder.remind_at == EVENT_DATE - timedelta(minutes=15)
+
+    def test_invalid_arguments(self, file_db_service):
+        with pytest.raises(ValueError):
+            DataTransfer(file_db_service, batch_size=0)
+        with pytest.raises(ValueError):
+            DataTransfer(file_db_service).import_file(Users, io.StringIO(""), "xml")
+
+
+class TestExport:
+
+    @pytest.fixture
+    def users(self, file_db_service):
+        with file_db_service.session_scope() as session:
+            BaseCRUDService(session, Users).create_many(
+                [{"nickname": f"user{i}", "name": "AB"[i % 2], "surname": "Иванов"} for i in range(7)])
+        return file_db_service
+
+    @pytest.mark.parametrize("file_format", ["csv", "jsonl"])
+    def test_round_trip(self, users, tmp_path, make_file_db_service, file_format):
+        """Тест проверяет, что выгруженный файл загружается в пустую базу без потерь."""
+        path = str(tmp_path / f"users.{file_format}")
+        transfer = DataTransfer(users, batch_size=3)
+
+        assert transfer.export_file(Users, path, file_format) == 7
+
+        copy = make_file_db_service("copy.db")
+        result = DataTransfer(copy).import_file(Users, path, file_format)
+
+        assert (result.imported, result.errors) == (7, [])
+        with users.session_scope(commit=False) as session:
+            original = [tuple(row) for row in BaseCRUDService(session, Users).read(
+                columns=["id", "nickname", "created_at", "name"], order_by=Users.id)]
+        with copy.session_scope(commit=False) as session:
+            copied = [tuple(row) for row in BaseCRUDService(session, Users).read(
+                columns=["id", "nickname", "created_at", "name"], order_by=Users.id)]
+        assert copied == original
+
+    def test_filters_and_order(self, users):
+        target = io.StringIO()
+        exported = DataTransfer(users).export_jsonl(Users, target, filters=[Users.name == "A"],
+                                                     order_by=Users.nickname.desc())
+
+        rows = [json.loads(line) for line in target.getvalue().splitlines()]
+        assert exported == 4
+        assert [row["nickname"] for row in rows] == ["user6", "user4", "user2", "user0"]
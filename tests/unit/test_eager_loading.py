@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.orm import selectinload
+
+from src.data_base.model import Users, Reminders
+from src.data_base.service_model.async_base_service import AsyncBaseCRUDService
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.service_model.query_cache import QueryCache
+from .test_async_service import run_async
+from ..data.data_reminders import EVENT_DATE, parametrize_load, parametrize_invalid_load
+
+USERS = 10
+REMINDERS_PER_USER = 3
+
+
+@pytest.fixture
+def setup_tables(table_manager):
+    table_manager.drop_tables()
+    table_manager.create_tables()
+
+
+@pytest.fixture
+def user_ids(setup_tables, db_session):
+    ids = BaseCRUDService(db_session, Users).create_many(
+        [{"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(USERS)], return_ids=True)
+    BaseCRUDService(db_session, Reminders).create_many(
+        {"user_id": user_id, "task_description": f"Задача {k}", "event_date": EVENT_DATE + timedelta(hours=k),
+         "remind_before": 15}
+        for user_id in ids for k in range(REMINDERS_PER_USER))
+    return ids
+
+
+def _summary(users):
+    return [(user.nickname, [reminder.task_description for reminder in user.reminders]) for user in users]
+
+
+@pytest.mark.usefixtures("user_ids")
+class TestReadLoad:
+
+    @pytest.mark.parametrize("load, expected_statements", parametrize_load)
+    def test_no_extra_queries(self, db_session, statements, load, expected_statements):
+        users = BaseCRUDService(db_session, Users).read(order_by=Users.id, load=load)
+        summary = _summary(users)
+
+        assert len(statements) == expected_statements
+        assert summary == [(f"user{i}", [f"Задача {k}" for k in range(REMINDERS_PER_USER)]) for i in range(USERS)]
+
+    def test_lazy_load_is_n_plus_one(self, db_session, statements):
+        _summary(BaseCRUDService(db_session, Users).read(order_by=Users.id))
+        assert len(statements) == USERS + 1
+
+    def test_joined_with_limit(self, db_session):
+        users = BaseCRUDService(db_session, Users).read(order_by=Users.id, limit=3, offset=2,
+                                                        load={Users.reminders: "joined"})
+        assert [user.nickname for user in users] == ["user2", "user3", "user4"]
+        assert all(len(user.reminders) == REMINDERS_PER_USER for user in users)
+
+    def test_many_to_one_and_options(self, db_session, statements):
+        reminders = BaseCRUDService(db_session, Reminders).read(
+            filters=[Reminders.task_description == "Задача 0"], load=[selectinload(Reminders.user)])
+        nicknames = sorted(reminder.user.nickname for reminder in reminders)
+
+        assert len(statements) == 2
+        assert nicknames == sorted(f"user{i}" for i in range(USERS))
+
+    def test_bypasses_cache(self, db_session):
+        cache = QueryCache()
+        crud = BaseCRUDService(db_session, Users, cache=cache)
+        crud.read(load="reminders")
+        crud.read(load="reminders")
+
+        assert cache.stats()["size"] == 0
+
+    @pytest.mark.parametrize("load, error", parametrize_invalid_load)
+    def test_invalid_load(self, db_session, load, error):
+        with pytest.raises(error):
+            BaseCRUDService(db_session, Users).read(load=load)
+
+
+def test_async_read_load():
+    async def scenario(service):
+        async with service.session_scope() as session:
+            user = await AsyncBaseCRUDService(session, Users).create(nickname="user1", name="Иван", surname="Иванов")
+            await session.flush()
+            for k in range(2):
+                await AsyncBaseCRUDService(session, Reminders).create(
+                    user_id=user.id, task_description=f"Задача {k}", event_date=EVENT_DATE, remind_before=k)
+
+        async with service.session_scope(commit=False) as session:
+            users = await AsyncBaseCRUDService(session, Users).read(load={"reminders": "joined"})
+            return _summary(users)
+
+    assert run_async("sqlite+aiosqlite:///:memory:", scenario) == [("user1", ["Задача 1", "Задача 0"])]
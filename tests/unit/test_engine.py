@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import pool
+
+from src.data_base.configuration.config import DataBaseConfig
+from src.data_base.engine import DatabaseEngine, SQLITE_PERFORMANCE_PRAGMAS
+
+
+@pytest.fixture
+def file_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'engine.db'}"
+
+
+class TestDatabaseEnginePool:
+
+    def test_pool_options(self, file_url):
+        config = DataBaseConfig(url=file_url, pool_size=3, max_overflow=1, pool_timeout=1.5, pool_recycle=60,
+                                pool_pre_ping=True, pool_class="QueuePool")
+        engine = DatabaseEngine.from_config(config).get_engine(ensure_available=True)
+
+        assert isinstance(engine.pool, pool.QueuePool)
+        assert engine.pool.size() == 3
+        assert engine.pool._max_overflow == 1
+        assert engine.pool._timeout == 1.5
+        assert engine.pool._recycle == 60
+        assert engine.pool._pre_ping is True
+
+    def test_pool_class_by_name(self, file_url):
+        engine = DatabaseEngine(file_url, pool_class="NullPool").get_engine()
+        assert isinstance(engine.pool, pool.NullPool)
+
+    def test_unknown_pool_class(self, file_url):
+        with pytest.raises(ValueError):
+            DatabaseEngine(file_url, pool_class="NoSuchPool")
+
+    @pytest.mark.parametrize("warmup, expected", [(0, 0), (2, 2), (10, 4)])
+    def test_warm_up(self, file_url, warmup, expected):
+        """
+        Тест проверяет, что прогрев оставляет в пуле открытые соединения, но не больше pool_size.
+
+        :param warmup: Запрошенное количество соединений.
+        :param expected: Ожидаемое количество соединений в пуле.
+        """
+        engine = DatabaseEngine(file_url, pool_size=4, max_overflow=0, pool_warmup=warmup).get_engine()
+
+        assert engine.pool.checkedin() == expected
+        assert engine.pool.checkedout() == 0
+
+    def test_restart_keeps_pool_options(self, file_url):
+        database_engine = DatabaseEngine(file_url, pool_size=2, pool_warmup=2)
+        database_engine.restart_engine()
+
+        assert database_engine.engine.pool.size() == 2
+        assert database_engine.engine.pool.checkedin() == 2
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+class TestSqlitePragmas:
+
+    def test_performance_profile(self, file_url):
+        engine = DatabaseEngine(file_url, sqlite_pragmas=SQLITE_PERFORMANCE_PRAGMAS).get_engine()
+
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1
+        assert _pragma(engine, "busy_timeout") == SQLITE_PERFORMANCE_PRAGMAS["busy_timeout"]
+        assert _pragma(engine, "cache_size") == SQLITE_PERFORMANCE_PRAGMAS["cache_size"]
+        assert _pragma(engine, "temp_store") == 2
+
+    def test_without_profile(self, file_url):
+        engine = DatabaseEngine(file_url).get_engine()
+        assert _pragma(engine, "journal_mode") == "delete"
+
+    def test_profile_from_config(self, file_url):
+        config = DataBaseConfig(url=file_url, sqlite_performance=True, sqlite_synchronous="FULL",
+                                sqlite_busy_timeout=100)
+        engine = DatabaseEngine.from_config(config).get_engine()
+
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 2
+        assert _pragma(engine, "busy_timeout") == 100
+
+    @pytest.mark.parametrize("pragmas", [{"foreign_keys": 1}, {"journal_mode": "WAL; DROP TABLE users"}])
+    def test_invalid_pragmas(self, file_url, pragmas):
+        with pytest.raises(ValueError):
+            DatabaseEngine(file_url, sqlite_pragmas=pragmas)
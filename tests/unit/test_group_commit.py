@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.data_base.group_commit import GroupCommitWriter
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+
+
+def create_user(nickname):
+    def operation(session):
+        user = BaseCRUDService(session, Users).create(nickname=nickname, name="Иван", surname="Иванов")
+        session.flush()
+        return user
+    return operation
+
+
+def _nicknames(db_service):
+    with db_service.session_scope(commit=False) as session:
+        return sorted(user.nickname for user in BaseCRUDService(session, Users).read())
+
+
+class TestGroupCommitWriter:
+
+    def test_concurrent_writes(self, file_db_service):
+        """Тест проверяет, что записи из многих потоков объединяются в транзакции и каждый получает свой результат."""
+        with GroupCommitWriter(file_db_service, max_batch=20, max_delay=0.05) as writer:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                users = list(executor.map(lambda i: writer.write(create_user(f"user{i}")), range(100)))
+
+        assert [user.nickname for user in users] == [f"user{i}" for i in range(100)]
+        assert len({user.id for user in users}) == 100
+        assert len(_nicknames(file_db_service)) == 100
+        stats = writer.stats()
+        assert stats["operations"] == 100
+        assert 5 <= stats["batches"] < 100
+
+    def test_error_isolated(self, file_db_service):
+        """Тест проверяет, что ошибка одной операции достаётся только ей, а остальные операции пачки фиксируются."""
+        with GroupCommitWriter(file_db_service, max_batch=5, max_delay=1) as writer:
+            futures = [writer.submit(create_user(nickname)) for nickname in ("user0", "user1", "user0", "user2")]
+            failing = writer.submit(lambda session: 1 / 0)
+
+            assert [future.exception() is None for future in futures] == [True, True, False, True]
+            assert isinstance(futures[2].exception(), IntegrityError)
+            with pytest.raises(ZeroDivisionError):
+                failing.result()
+
+        assert _nicknames(file_db_service) == ["user0", "user1", "user2"]
+        assert writer.stats()["failed_batches"] == 1
+
+    def test_max_batch(self, file_db_service):
+        with GroupCommitWriter(file_db_service, max_batch=3, max_delay=0.2) as writer:
+            futures = [writer.submit(create_user(f"user{i}")) for i in range(7)]
+            for future in futures:
+                future.result()
+
+        assert writer.stats() == {"operations": 7, "batches": 3, "failed_batches": 0}
+
+    def test_write_async(self, file_db_service):
+        async def main(writer):
+            return await asyncio.gather(*(writer.write_async(create_user(f"user{i}")) for i in range(10)))
+
+        with GroupCommitWriter(file_db_service, max_delay=0.05) as writer:
+            users = asyncio.run(main(writer))
+
+        assert sorted(user.nickname for user in users) == _nicknames(file_db_service)
+        assert writer.stats()["batches"] < 10
+
+    def test_stop_drains_queue(self, file_db_service):
+        writer = GroupCommitWriter(file_db_service, max_batch=2, max_delay=0.2)
+        writer.start()
+        futures = [writer.submit(create_user(f"user{i}")) for i in range(5)]
+        writer.stop()
+
+        assert all(future.done() for future in futures)
+        assert len(_nicknames(file_db_service)) == 5
+        with pytest.raises(RuntimeError):
+            writer.submit(create_user("late"))
+
+    def test_start_twice(self, file_db_service):
+        with GroupCommitWriter(file_db_service) as writer:
+            with pytest.raises(RuntimeError):
+                writer.start()
+
+    @pytest.mark.parametrize("max_batch, max_delay", [(0, 0.01), (1, -1)])
+    def test_invalid_arguments(self, file_db_service, max_batch, max_delay):
+        with pytest.raises(ValueError):
+            GroupCommitWriter(file_db_service, max_batch=max_batch, max_delay=max_delay)
@@ -0,0 +1,158 @@
+import logging
+
+import pytest
+from sqlalchemy import insert
+
+from src.data_base.configuration.config import DataBaseConfig
+from src.data_base.data_base_service import DataBaseService
+from src.data_base.engine import DatabaseEngine
+from src.data_base.instrumentation import normalize_sql, LatencyHistogram, QueryInstrumentation
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.table_manager import TableManager
+
+
+@pytest.fixture
+def instrumented(tmp_path):
+    """Сервис на файловой SQLite с подключёнными замерами; таблицы создаются до подключения."""
+    config = DataBaseConfig(url=f"sqlite:///{tmp_path / 'metrics.db'}", instrumentation=True)
+    database_engine = DatabaseEngine.from_config(config)
+    TableManager(database_engine.engine).create_tables()
+    database_engine.instrumentation.reset()
+    return DataBaseService(config, database_engine.engine), database_engine
+
+
+def _by_operation(snapshot):
+    return {item["operation"]: item for item in snapshot["statements"] if item["operation"]}
+
+
+class TestNormalizeSql:
+
+    @pytest.mark.parametrize("statement, expected", [
+        ("SELECT *  FROM users\n WHERE id = 5", "SELECT * FROM users WHERE id = ?"),
+        ("SELECT * FROM users WHERE name = 'O''Neil' AND age > 3.5", "SELECT * FROM users WHERE name = ? AND age > ?"),
+        ("SELECT * FROM users WHERE id IN (?, ?, ?)", "SELECT * FROM users WHERE id IN (?)"),
+        ("SELECT * FROM users WHERE id IN (%(id_1_1)s, %(id_1_2)s)", "SELECT * FROM users WHERE id IN (?)"),
+        ("INSERT INTO users (a, b) VALUES (?, ?), (?, ?), (?, ?)", "INSERT INTO users (a, b) VALUES (?)"),
+        ("SELECT t1.id FROM t1 LIMIT ? OFFSET ?", "SELECT t1.id FROM t1 LIMIT ? OFFSET ?"),
+    ])
+    def test_normalize(self, statement, expected):
+        assert normalize_sql(statement) == expected
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for elapsed_ms in [0.05] * 50 + [3] * 49 + [700]:
+            histogram.record(elapsed_ms)
+
+        data = histogram.to_dict()
+        assert data["count"] == 100
+        assert data["p50_ms"] == 0.1
+        assert data["p99_ms"] == 5
+        assert data["max_ms"] == 700
+        assert data["buckets"]["le_1000"] == 1
+
+
+class TestQueryInstrumentation:
+
+    def test_groups_by_operation(self, instrumented):
+        service, database_engine = instrumented
+        with service.session_scope() as session:
+            crud = BaseCRUDService(session, Users)
+            crud.create_many([{"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(5)])
+            for i in range(3):
+                crud.read(filters=[Users.nickname == f"user{i}"])
+            crud.update([Users.nickname == "user1"], {"name": "Пётр"})
+            crud.delete(nickname="user2")
+
+        snapshot = database_engine.instrumentation.snapshot()
+        operations = _by_operation(snapshot)
+
+        assert set(operations) == {"Users.create", "Users.read", "Users.update", "Users.delete"}
+        assert operations["Users.read"]["count"] == 3
+        assert operations["Users.read"]["sql"].startswith("SELECT users.id")
+        assert snapshot["pool_checkout"]["count"] >= 1
+        assert snapshot["slow_queries"] == 0
+
+    def test_flush_inserts_labeled(self, instrumented):
+        """Тест проверяет, что INSERT объектов, добавленных через create, попадают в группу операции create."""
+        service, database_engine = instrumented
+        with service.session_scope() as session:
+            crud = BaseCRUDService(session, Users)
+            crud.create(nickname="user1", name="Иван", surname="Иванов")
+            session.flush()
+            crud.read()
+            crud.create(nickname="user2", name="Пётр", surname="Петров")
+
+        operations = _by_operation(database_engine.instrumentation.snapshot())
+
+        assert operations["Users.create"]["count"] == 2
+        assert operations["Users.create"]["sql"].startswith("INSERT INTO users")
+        assert operations["Users.read"]["count"] == 1
+
+    def test_flush_label_cleared(self, instrumented):
+        """Тест проверяет, что после flush с create метка не достаётся INSERT в обход сервиса в той же транзакции."""
+        service, database_engine = instrumented
+        with service.session_scope() as session:
+            BaseCRUDService(session, Users).create(nickname="user1", name="Иван", surname="Иванов")
+            session.flush()
+            session.execute(insert(Users).values(nickname="user2", name="Пётр", surname="Петров"))
+            session.add(Users(nickname="user3", name="Павел", surname="Павлов"))
+
+        inserts = {item["operation"]: item["count"] for item in database_engine.instrumentation.snapshot()["statements"]
+                   if item["sql"].startswith("INSERT")}
+
+        assert inserts == {"Users.create": 1, None: 2}
+
+    def test_pool_checkout(self, instrumented):
+        """Тест проверяет, что ожидание соединения замеряется при каждом получении соединения и после dispose."""
+        _, database_engine = instrumented
+        engine = database_engine.engine
+        for _ in range(2):
+            with engine.connect():
+                pass
+        engine.dispose()
+        with engine.connect():
+            pass
+
+        assert database_engine.instrumentation.snapshot()["pool_checkout"]["count"] == 3
+
+        database_engine.instrumentation.detach(engine)
+        with engine.connect():
+            pass
+        assert database_engine.instrumentation.snapshot()["pool_checkout"]["count"] == 3
+
+    def test_slow_query_log(self, tmp_path, caplog):
+        instrumentation = QueryInstrumentation(slow_query_threshold_ms=0)
+        database_engine = DatabaseEngine(f"sqlite:///{tmp_path / 'slow.db'}", instrumentation=instrumentation)
+
+        with caplog.at_level(logging.WARNING, logger="src.data_base.instrumentation"):
+            database_engine.test_connection()
+
+        assert instrumentation.snapshot()["slow_queries"] == 1
+        assert "SELECT 1" in caplog.text
+
+    def test_failed_statement_keeps_timings_consistent(self, instrumented):
+        service, database_engine = instrumented
+        with pytest.raises(Exception):
+            with service.session_scope() as session:
+                BaseCRUDService(session, Users).create_many([{"nickname": "", "name": "Иван", "surname": "Иванов"}])
+        with service.session_scope(commit=False) as session:
+            BaseCRUDService(session, Users).read()
+
+        assert _by_operation(database_engine.instrumentation.snapshot())["Users.read"]["count"] == 1
+
+    def test_restart_reattaches(self, instrumented):
+        _, database_engine = instrumented
+        database_engine.restart_engine()
+        database_engine.instrumentation.reset()
+        database_engine.test_connection()
+
+        snapshot = database_engine.instrumentation.snapshot()
+        assert [item["sql"] for item in snapshot["statements"]] == ["SELECT ?"]
+        assert snapshot["pool_checkout"]["count"] == 1
+
+    def test_disabled_by_default(self, tmp_path):
+        assert DatabaseEngine.from_config(DataBaseConfig(url=f"sqlite:///{tmp_path / 'off.db'}")).instrumentation is None
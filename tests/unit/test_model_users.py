@@ -1,8 +1,9 @@
+import dataclasses
 from dataclasses import field
 
 import pytest
 
-from sqlalchemy import text, asc, desc
+from sqlalchemy import text, asc, desc, func, event
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.testing.suite import PrecisionIntervalTest
 
@@ -10,7 +11,9 @@ from src.data_base.model import Users
 from src.data_base.service_model.base_service import BaseCRUDService
 from ..data.data_model_users import parametrize_create, parametrize_duplicate_name, parametrize_invalid_user_data, \
     parametrize_filter_single_field, parametrize_with_filter_multiple_fields, parametrize_with_sorted_single_field, \
-    parametrize_sorting_by_multiple_fields, parametrize_create_valid, parametrize_with_filter_sorted_limit
+    parametrize_sorting_by_multiple_fields, parametrize_create_valid, parametrize_with_filter_sorted_limit, \
+    parametrize_create_many, parametrize_read_page, parametrize_read_columns, parametrize_invalid_columns, \
+    parametrize_count, parametrize_upsert_many, parametrize_by_ids
 
 
 # Успешное создание записи. Создание нескольких объектов. +
@@ -19,13 +22,6 @@ from ..data.data_model_users import parametrize_create, parametrize_duplicate_na
 # Возврат созданного объекта. +
 # Обработку транзакций и откатов (rollback). +
 
-@pytest.fixture
-def setup_users_table(table_manager):
-    """Фикстура для создания таблицы Users на чистой базе."""
-    table_manager.drop_tables()
-    table_manager.create_tables(Users)
-
-
 @pytest.mark.usefixtures("setup_users_table")
 class TestUsersCRUDCreate:
 
@@ -95,6 +91,57 @@ class TestUsersCRUDCreate:
             db_session.rollback()
 
 
+@pytest.mark.usefixtures("setup_users_table")
+class TestUsersCRUDCreateMany:
+
+    @pytest.mark.parametrize("users_data, batch_size", parametrize_create_many)
+    def test_create_many(self, db_session, users_data, batch_size):
+        """
+        Тестирует массовое создание пользователей пачками.
+
+        :param users_data: Данные пользователей для создания.
+        :param batch_size: Размер пачки.
+        """
+        base_serv = BaseCRUDService(db_session, Users)
+        inserted_count = base_serv.create_many(users_data, batch_size=batch_size)
+
+        assert inserted_count == len(users_data)
+        saved_users = db_session.query(Users).order_by(Users.id).all()
+        assert [user.nickname for user in saved_users] == [user["nickname"] for user in users_data]
+        assert all(user.created_at is not None for user in saved_users), "Поле created_at должно быть сгенерировано"
+
+    @pytest.mark.parametrize("users_data, batch_size", parametrize_create_many)
+    def test_create_many_return_ids(self, db_session, users_data, batch_size):
+        """
+        Тестирует, что create_many возвращает первичные ключи в порядке переданных строк.
+
+        :param users_data: Данные пользователей для создания.
+        :param batch_size: Размер пачки.
+        """
+        base_serv = BaseCRUDService(db_session, Users)
+        ids = base_serv.create_many(iter(users_data), batch_size=batch_size, return_ids=True)
+
+        assert len(ids) == len(users_data)
+        for user_id, user_data in zip(ids, users_data):
+            assert db_session.get(Users, user_id).nickname == user_data["nickname"]
+
+    def test_create_many_empty(self, db_session):
+        base_serv = BaseCRUDService(db_session, Users)
+        assert base_serv.create_many([]) == 0
+        assert base_serv.create_many([], return_ids=True) == []
+
+    def test_create_many_invalid_batch_size(self, db_session):
+        base_serv = BaseCRUDService(db_session, Users)
+        with pytest.raises(ValueError):
+            base_serv.create_many([{"nickname": "user1", "name": "Иван", "surname": "Иванов"}], batch_size=0)
+
+    @pytest.mark.parametrize("users_data", parametrize_duplicate_name)
+    def test_create_many_duplicate_nickname(self, db_session, users_data):
+        base_serv = BaseCRUDService(db_session, Users)
+        with pytest.raises(IntegrityError):
+            base_serv.create_many(users_data)
+
+
 #  Чтение всех записей в таблице. +
 #  Чтение записей, когда в таблице нет данных. +
 #  Чтение записей по одному полю (фильтрация). +
@@ -264,4 +311,359 @@ class TestUsersCRUDRead:
             for user, expected_user in zip(users, expected_users):
                 assert user.nickname == expected_user["nickname"]
                 assert user.name == expected_user["name"]
-                assert user.surname == expected_user["surname"]
\ No newline at end of file
+                assert user.surname == expected_user["surname"]
+
+
+def _parse_order_by(order_spec):
+    """Преобразует строку вида "name asc, surname desc" в список условий сортировки."""
+    if order_spec is None:
+        return None
+    order_by = []
+    for item in order_spec.split(","):
+        field, *direction = item.split()
+        order_by.append((desc if direction == ["desc"] else asc)(getattr(Users, field)))
+    return order_by
+
+
+@pytest.mark.usefixtures("setup_users_table")
+class TestUsersCRUDReadPage:
+
+    @pytest.mark.parametrize("users_data, order_spec, page_size", parametrize_read_page)
+    def test_pages_match_offset_read(self, db_session, users_data, order_spec, page_size):
+        """
+        Тест проверяет, что последовательное чтение страниц по курсору даёт тот же порядок, что и чтение без страниц.
+
+        :param users_data: Данные пользователей для создания.
+        :param order_spec: Описание сортировки.
+        :param page_size: Размер страницы.
+        """
+        base_serv = _create_users(db_session, users_data)
+        order_by = _parse_order_by(order_spec)
+        expected = base_serv.read(order_by=(order_by or []) + [Users.id])
+
+        pages = []
+        cursor = None
+        while True:
+            page, cursor = base_serv.read_page(order_by=order_by, limit=page_size, cursor=cursor)
+            assert len(page) <= page_size
+            pages.append(page)
+            if cursor is None:
+                break
+
+        assert [user.id for page in pages for user in page] == [user.id for user in expected]
+        assert all(pages[:-1]), "Промежуточные страницы не должны быть пустыми"
+
+    def test_with_filters(self, db_session):
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "AB"[i % 2], "surname": "Иванов"} for i in range(9)
+        ])
+        page, cursor = base_serv.read_page(filters=[Users.name == "A"], order_by="nickname", limit=3)
+        page_2, cursor_2 = base_serv.read_page(filters=[Users.name == "A"], order_by="nickname", limit=3, cursor=cursor)
+
+        assert [user.nickname for user in page + page_2] == ["user0", "user2", "user4", "user6", "user8"]
+        assert cursor_2 is None
+
+    def test_cursor_for_other_order(self, db_session):
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(3)
+        ])
+        _, cursor = base_serv.read_page(order_by=Users.name, limit=1)
+
+        with pytest.raises(ValueError):
+            base_serv.read_page(order_by=Users.surname, limit=1, cursor=cursor)
+        with pytest.raises(ValueError):
+            base_serv.read_page(order_by=Users.name, limit=1, cursor="not a cursor")
+
+
+@pytest.mark.usefixtures("setup_users_table")
+class TestUsersCRUDIterRead:
+
+    @pytest.mark.parametrize("users_count, batch_size", [(0, 3), (7, 3), (9, 3), (5, 10)])
+    def test_batches(self, db_session, users_count, batch_size):
+        """
+        Тест проверяет, что iter_read возвращает все записи пачками не больше batch_size.
+
+        :param users_count: Количество пользователей в таблице.
+        :param batch_size: Размер пачки.
+        """
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(users_count)
+        ])
+
+        batches = list(base_serv.iter_read(order_by=Users.id, batch_size=batch_size))
+
+        assert all(0 < len(batch) <= batch_size for batch in batches)
+        assert [user.nickname for batch in batches for user in batch] == [f"user{i}" for i in range(users_count)]
+
+    def test_expunges_processed_batches(self, db_session):
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "AB"[i % 2], "surname": "Иванов"} for i in range(6)
+        ])
+        db_session.expunge_all()
+
+        previous_batch = []
+        for batch in base_serv.iter_read(filters=[Users.name == "A"], order_by="nickname", batch_size=2):
+            assert all(user in db_session for user in batch)
+            assert all(user not in db_session for user in previous_batch)
+            assert all(user.name == "A" for user in batch)
+            previous_batch = batch
+
+        assert len(db_session.identity_map) == 0
+
+    def test_invalid_batch_size(self, db_session):
+        base_serv = BaseCRUDService(db_session, Users)
+        with pytest.raises(ValueError):
+            next(base_serv.iter_read(batch_size=0))
+
+
+@pytest.mark.usefixtures("setup_users_table")
+class TestUsersCRUDReadColumns:
+
+    @pytest.mark.parametrize("columns, shape, expected_first", parametrize_read_columns)
+    def test_shapes(self, db_session, columns, shape, expected_first):
+        """
+        Тест проверяет выборку отдельных столбцов в виде Row, словарей и dataclass без объектов модели.
+
+        :param columns: Столбцы выборки.
+        :param shape: Вид строк.
+        :param expected_first: Ожидаемое представление первой строки.
+        """
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(3)
+        ])
+        db_session.expunge_all()
+
+        rows = base_serv.read(filters=[Users.name == "Иван"], order_by=Users.id, columns=columns, shape=shape)
+
+        assert len(rows) == 3
+        if shape == "dataclass":
+            assert dataclasses.asdict(rows[0]) == expected_first
+            assert not hasattr(rows[0], "__dict__")
+        else:
+            assert (tuple(rows[0]) if shape == "row" else rows[0]) == expected_first
+        assert len(db_session.identity_map) == 0
+
+    def test_model_attributes(self, db_session):
+        base_serv = _create_users(db_session, [{"nickname": "user0", "name": "Иван", "surname": "Иванов"}])
+
+        rows = base_serv.read(columns=[Users.id, Users.nickname])
+
+        assert rows[0].nickname == "user0"
+        assert rows[0]._mapping[Users.id] == rows[0].id
+
+    def test_dataclass_is_reused(self, db_session):
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(2)
+        ])
+
+        first = base_serv.read(columns=["id", "nickname"], shape="dataclass")
+        second = base_serv.read(columns=["id", "nickname"], shape="dataclass")
+
+        assert type(first[0]) is type(second[1])
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first[0].nickname = "other"
+
+    @pytest.mark.parametrize("columns, shape, error", parametrize_invalid_columns)
+    def test_invalid_arguments(self, db_session, columns, shape, error):
+        with pytest.raises(error):
+            BaseCRUDService(db_session, Users).read(columns=columns, shape=shape)
+
+    def test_load_with_columns(self, db_session):
+        with pytest.raises(ValueError):
+            BaseCRUDService(db_session, Users).read(columns=["id"], load="reminders")
+
+
+@pytest.mark.usefixtures("setup_users_table")
+class TestUsersCRUDAggregates:
+
+    @pytest.mark.parametrize("users_data, filter_fields, use_or, expected_count", parametrize_count)
+    def test_count_and_exists(self, db_session, users_data, filter_fields, use_or, expected_count):
+        """
+        Тест проверяет, что count и exists применяют фильтры так же, как read.
+
+        :param users_data: Данные пользователей.
+        :param filter_fields: Условия фильтрации {поле: значение}.
+        :param use_or: Объединять условия через "ИЛИ".
+        :param expected_count: Ожидаемое количество записей.
+        """
+        base_serv = _create_users(db_session, users_data)
+        filters = [getattr(Users, key) == value for key, value in filter_fields.items()] or None
+
+        assert base_serv.count(filters, use_or) == expected_count == len(base_serv.read(filters, use_or))
+        assert base_serv.exists(filters, use_or) is (expected_count > 0)
+
+    def test_aggregate(self, db_session):
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "ABC"[i % 3], "surname": "XY"[i % 2]} for i in range(7)
+        ])
+
+        by_name = base_serv.aggregate("name", shape="dict")
+        by_name_surname = base_serv.aggregate([Users.name, Users.surname], {"total": func.count(),
+                                                                            "last": func.max(Users.nickname)},
+                                              filters=[Users.name != "C"], order_by=[desc("total"), Users.name])
+
+        assert by_name == [{"name": "A", "count": 3}, {"name": "B", "count": 2}, {"name": "C", "count": 2}]
+        assert [tuple(row) for row in by_name_surname] == [
+            ("A", "X", 2, "user6"), ("A", "Y", 1, "user3"), ("B", "X", 1, "user4"), ("B", "Y", 1, "user1")]
+
+    @pytest.mark.parametrize("group_by, aggregates, error", [
+        ("missing", None, ValueError),
+        (func.lower(Users.name), None, TypeError),
+        ("name", {}, ValueError),
+        ("name", {"count": 1}, TypeError),
+        ([], None, ValueError),
+    ])
+    def test_aggregate_invalid_arguments(self, db_session, group_by, aggregates, error):
+        with pytest.raises(error):
+            BaseCRUDService(db_session, Users).aggregate(group_by, aggregates)
+
+
+@pytest.mark.usefixtures("setup_users_table")
+class TestUsersCRUDUpsert:
+
+    def test_upsert(self, db_session):
+        """Тест проверяет, что upsert вставляет новую запись и обновляет существующую по nickname."""
+        base_serv = _create_users(db_session, [{"nickname": "user1", "name": "Иван", "surname": "Иванов"}])
+        existing = base_serv.read()[0]
+        created_at = existing.created_at
+
+        updated = base_serv.upsert(nickname="user1", name="Пётр", surname="Петров")
+        inserted = base_serv.upsert(nickname="user2", name="Павел", surname="Павлов")
+
+        assert updated is existing
+        assert (updated.name, updated.surname, updated.created_at) == ("Пётр", "Петров", created_at)
+        assert inserted.id != existing.id
+        assert base_serv.count() == 2
+
+    def test_upsert_do_nothing(self, db_session):
+        base_serv = _create_users(db_session, [{"nickname": "user1", "name": "Иван", "surname": "Иванов"}])
+
+        assert base_serv.upsert(update_columns=[], nickname="user1", name="Пётр", surname="Петров") is None
+        assert base_serv.read(columns=["name"])[0].name == "Иван"
+
+    @pytest.mark.parametrize("existing, nicknames, batch_size, expected_inserts", parametrize_upsert_many)
+    def test_upsert_many(self, db_session, db_engine, existing, nicknames, batch_size, expected_inserts):
+        """
+        Тест проверяет upsert_many: один INSERT ... ON CONFLICT на пачку и ключи в порядке строк.
+
+        :param existing: Никнеймы пользователей, созданных заранее.
+        :param nicknames: Никнеймы строк upsert_many.
+        :param batch_size: Размер пачки.
+        :param expected_inserts: Ожидаемое количество запросов INSERT.
+        """
+        base_serv = _create_users(db_session, [{"nickname": nickname, "name": "Иван", "surname": "Иванов"}
+                                               for nickname in existing])
+        existing_ids = {user.nickname: user.id for user in base_serv.read()}
+
+        inserts = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT"):
+                inserts.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", listener)
+        try:
+            ids = base_serv.upsert_many([{"nickname": nickname, "name": "Пётр", "surname": "Петров"}
+                                         for nickname in reversed(nicknames)], batch_size=batch_size, return_ids=True)
+        finally:
+            event.remove(db_engine, "before_cursor_execute", listener)
+
+        users = {user.nickname: user for user in base_serv.read(columns=["id", "nickname", "name"])}
+        assert len(inserts) == expected_inserts
+        assert all("ON CONFLICT (nickname) DO UPDATE" in statement for statement in inserts)
+        assert ids == [users[nickname].id for nickname in reversed(nicknames)]
+        assert all(existing_ids[nickname] == users[nickname].id for nickname in existing)
+        assert {user.name for user in users.values()} == {"Пётр"}
+
+    def test_upsert_many_do_nothing(self, db_session):
+        base_serv = _create_users(db_session, [{"nickname": "user1", "name": "Иван", "surname": "Иванов"}])
+
+        ids = base_serv.upsert_many([{"nickname": f"user{i}", "name": "Пётр", "surname": "Петров"} for i in range(3)],
+                                    update_columns=[], return_ids=True)
+
+        assert ids[1] is None and None not in (ids[0], ids[2])
+        assert base_serv.upsert_many([{"nickname": "user1", "name": "Пётр", "surname": "Петров"}],
+                                     update_columns=[]) == 0
+        assert dict(base_serv.aggregate("name")) == {"Иван": 1, "Пётр": 2}
+
+    def test_upsert_many_update_columns(self, db_session):
+        base_serv = _create_users(db_session, [{"nickname": "user1", "name": "Иван", "surname": "Иванов"}])
+
+        base_serv.upsert_many([{"nickname": "user1", "name": "Пётр", "surname": "Петров"}],
+                              conflict_target=[Users.nickname], update_columns=["surname"])
+
+        assert tuple(base_serv.read(columns=["name", "surname"])[0]) == ("Иван", "Петров")
+
+    @pytest.mark.parametrize("rows, kwargs, error", [
+        ([{"name": "Пётр", "surname": "Петров"}], {}, ValueError),
+        ([{"nickname": "user1", "name": "Пётр", "surname": "Петров"}], {"update_columns": ["missing"]}, ValueError),
+        ([{"nickname": "user1", "name": "Пётр", "surname": "Петров"}], {"batch_size": 0}, ValueError),
+    ])
+    def test_upsert_many_invalid_arguments(self, db_session, rows, kwargs, error):
+        with pytest.raises(error):
+            BaseCRUDService(db_session, Users).upsert_many(rows, **kwargs)
+
+
+@pytest.mark.usefixtures("setup_users_table")
+class TestUsersCRUDByIds:
+
+    @pytest.mark.parametrize("users_count, indexes, chunk_size, synchronize_session, expected_chunks",
+                             parametrize_by_ids)
+    def test_delete_by_ids(self, db_session, statements, users_count, indexes, chunk_size, synchronize_session,
+                           expected_chunks):
+        """
+        Тест проверяет удаление по ключам пачками: точное количество удалённых записей с учётом повторов
+        и количество запросов DELETE.
+        """
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(users_count)
+        ])
+        users = base_serv.read(order_by=Users.id)
+        statements.clear()
+
+        deleted = base_serv.delete_by_ids([users[i].id for i in indexes], chunk_size=chunk_size,
+                                          synchronize_session=synchronize_session)
+
+        deletes = [statement for statement in statements if statement.startswith("DELETE")]
+        assert deleted == len(set(indexes))
+        assert len(deletes) == expected_chunks
+        assert base_serv.count() == users_count - len(set(indexes))
+        if synchronize_session:
+            assert all(users[i] not in db_session for i in indexes)
+
+    @pytest.mark.parametrize("users_count, indexes, chunk_size, synchronize_session, expected_chunks",
+                             parametrize_by_ids)
+    def test_update_by_ids(self, db_session, statements, users_count, indexes, chunk_size, synchronize_session,
+                           expected_chunks):
+        base_serv = _create_users(db_session, [
+            {"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(users_count)
+        ])
+        users = base_serv.read(order_by=Users.id)
+        statements.clear()
+
+        updated = base_serv.update_by_ids([users[i].id for i in indexes], {"name": "Пётр"}, chunk_size=chunk_size,
+                                          synchronize_session=synchronize_session)
+
+        updates = [statement for statement in statements if statement.startswith("UPDATE")]
+        selects = [statement for statement in statements if statement.startswith("SELECT")]
+        assert updated == len(set(indexes))
+        assert len(updates) == expected_chunks
+        assert base_serv.count([Users.name == "Пётр"]) == len(set(indexes))
+        if synchronize_session:
+            assert {users[i].name for i in indexes} <= {"Пётр"}
+        if synchronize_session == "evaluate":
+            assert not selects
+
+    @pytest.mark.parametrize("kwargs, error", [
+        ({"chunk_size": 0}, ValueError),
+        ({"synchronize_session": "auto"}, ValueError),
+        ({"updates": {}}, ValueError),
+        ({"updates": ["name"]}, TypeError),
+    ])
+    def test_invalid_arguments(self, db_session, kwargs, error):
+        base_serv = BaseCRUDService(db_session, Users)
+        with pytest.raises(error):
+            base_serv.update_by_ids([1], **{"updates": {"name": "Пётр"}, **kwargs})
+        if "updates" not in kwargs:
+            with pytest.raises(error):
+                base_serv.delete_by_ids([1], **kwargs)
@@ -0,0 +1,178 @@
+import time
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.sql.elements import ClauseElement
+
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.service_model.query_cache import QueryCache
+
+
+def _create_users(db_service, count, cache=None):
+    with db_service.session_scope() as session:
+        crud = BaseCRUDService(session, Users, cache=cache)
+        for i in range(count):
+            crud.create(nickname=f"user{i}", name="Иван", surname="Иванов")
+
+
+def _read(db_service, cache, **kwargs):
+    with db_service.session_scope(commit=False) as session:
+        users = BaseCRUDService(session, Users, cache=cache).read(**kwargs)
+        return [(user.id, user.nickname) for user in users]
+
+
+@pytest.mark.usefixtures("setup_users_table")
+class TestQueryCache:
+
+    def test_hit_skips_database(self, db_service, statements):
+        cache = QueryCache()
+        _create_users(db_service, 3)
+
+        first = _read(db_service, cache, filters=[Users.name == "Иван"], order_by=Users.id)
+        statements.clear()
+        second = _read(db_service, cache, filters=[Users.name == "Иван"], order_by=Users.id)
+
+        assert first == second
+        assert not [statement for statement in statements if statement.startswith("SELECT")]
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "expirations": 0, "invalidations": 0,
+                                 "size": 1}
+
+    def test_columns(self, db_service, statements):
+        cache = QueryCache()
+        _create_users(db_service, 3)
+
+        results = []
+        for shape in ("row", "dict", "row"):
+            with db_service.session_scope(commit=False) as session:
+                results.append(BaseCRUDService(session, Users, cache=cache).read(
+                    order_by=Users.id, columns=["id", "nickname"], shape=shape))
+
+        assert results[1] == [{"id": i + 1, "nickname": f"user{i}"} for i in range(3)]
+        assert results[0] == results[2]
+        assert cache.stats()["misses"] == 1
+        assert len([statement for statement in statements if statement.startswith("SELECT")]) == 1
+
+    def test_parameters_are_part_of_key(self, db_service):
+        cache = QueryCache()
+        _create_users(db_service, 3)
+
+        assert _read(db_service, cache, filters=[Users.nickname == "user1"]) == [(2, "user1")]
+        assert _read(db_service, cache, filters=[Users.nickname == "user2"]) == [(3, "user2")]
+        assert cache.stats()["misses"] == 2
+
+    def test_restored_instances_are_attached(self, db_service):
+        cache = QueryCache()
+        _create_users(db_service, 2)
+        _read(db_service, cache)
+
+        with db_service.session_scope() as session:
+            users = BaseCRUDService(session, Users, cache=cache).read()
+            assert all(user in session for user in users)
+            users[0].name = "Пётр"
+            user_id = users[0].id
+
+        assert cache.stats()["hits"] == 1
+        with db_service.session_scope(commit=False) as session:
+            assert session.get(Users, user_id).name == "Пётр"
+        with db_service.session_scope(commit=False) as session:
+            users = BaseCRUDService(session, Users, cache=cache).read()
+            assert {user.id: user.name for user in users}[user_id] == "Пётр"
+
+    @pytest.mark.parametrize("write", [
+        lambda crud: crud.create(nickname="new", name="Иван", surname="Иванов"),
+        lambda crud: crud.create_many([{"nickname": "new", "name": "Иван", "surname": "Иванов"}]),
+        lambda crud: crud.update([Users.nickname == "user0"], {"nickname": "new"}),
+        lambda crud: crud.delete(nickname="user0"),
+    ])
+    def test_writes_invalidate(self, file_db_service, write):
+        """
+        Тест проверяет, что запись через сервис сбрасывает кэш, в том числе результат, закэшированный
+        другой сессией до commit.
+        """
+        db_service = file_db_service
+        cache = QueryCache()
+        _create_users(db_service, 2)
+        before = _read(db_service, cache, order_by=Users.nickname)
+
+        with db_service.session_scope() as session:
+            write(BaseCRUDService(session, Users, cache=cache))
+            assert _read(db_service, cache, order_by=Users.nickname) == before
+
+        after = _read(db_service, cache, order_by=Users.nickname)
+        assert after != before
+        with db_service.session_scope(commit=False) as session:
+            assert after == [(user.id, user.nickname) for user in session.query(Users).order_by(Users.nickname)]
+
+    def test_watched_factory(self, file_db_service):
+        """
+        Тест проверяет, что после watch(session_local) изменения сессий без кэша (session.execute и flush)
+        тоже сбрасывают записи.
+        """
+        db_service = file_db_service
+        cache = QueryCache()
+        cache.watch(db_service.session_local)
+        _create_users(db_service, 2)
+        before = _read(db_service, cache, order_by=Users.id)
+
+        with db_service.session_scope() as session:
+            session.execute(update(Users).where(Users.id == 1).values(nickname="renamed"))
+        assert _read(db_service, cache, order_by=Users.id) == [(1, "renamed"), (2, "user1")]
+
+        with db_service.session_scope() as session:
+            session.get(Users, 2).nickname = "changed"
+        assert _read(db_service, cache, order_by=Users.id) == [(1, "renamed"), (2, "changed")]
+        assert before == [(1, "user0"), (2, "user1")]
+
+    def test_stale_put_skipped(self, db_service):
+        """Тест проверяет, что результат запроса, начатого до сброса таблицы, не сохраняется в кэш."""
+        cache = QueryCache()
+        generation = cache.generation(["users"])
+        cache.invalidate("users")
+
+        assert cache.put("key", ["users"], [], generation) is False
+        assert cache.get("key") is None
+        assert cache.put("key", ["users"], [], cache.generation(["users"])) is True
+        assert cache.put("other", ["reminders"], [], cache.generation(["reminders"])) is True
+
+    def test_hit_without_compile(self, db_service, monkeypatch):
+        """Тест проверяет, что ключ кэша вычисляется без компиляции SQL."""
+        cache = QueryCache()
+        _create_users(db_service, 2)
+        _read(db_service, cache, filters=[Users.nickname.in_(["user0", "user1"])])
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Запрос скомпилирован при попадании в кэш")
+
+        monkeypatch.setattr(ClauseElement, "compile", fail)
+        assert _read(db_service, cache, filters=[Users.nickname.in_(["user0", "user1"])]) == [(1, "user0"),
+                                                                                                (2, "user1")]
+        assert cache.stats()["hits"] == 1
+
+    def test_lru_eviction(self, db_service):
+        cache = QueryCache(maxsize=2)
+        _create_users(db_service, 3)
+
+        for i in (0, 1, 0, 2):
+            _read(db_service, cache, filters=[Users.nickname == f"user{i}"])
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["evictions"], stats["size"]) == (1, 1, 2)
+        _read(db_service, cache, filters=[Users.nickname == "user0"])
+        assert cache.stats()["hits"] == 2
+
+    def test_ttl(self, db_service):
+        cache = QueryCache(ttl=0.01)
+        _create_users(db_service, 1)
+
+        _read(db_service, cache)
+        time.sleep(0.02)
+        _read(db_service, cache)
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (0, 2, 1)
+
+    @pytest.mark.parametrize("maxsize, ttl", [(0, 1), (1, 0)])
+    def test_invalid_arguments(self, maxsize, ttl):
+        with pytest.raises(ValueError):
+            QueryCache(maxsize=maxsize, ttl=ttl)
@@ -0,0 +1,128 @@
+import multiprocessing
+from datetime import timedelta
+
+import pytest
+
+from src.data_base.configuration.config import DataBaseConfig
+from src.data_base.data_base_service import DataBaseService
+from src.data_base.engine import DatabaseEngine
+from src.data_base.model import Users, Reminders
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.service_model.reminders_service import RemindersService
+from src.data_base.table_manager import TableManager
+from ..data.data_reminders import EVENT_DATE
+
+NOW = EVENT_DATE
+
+
+def _file_service(url):
+    config = DataBaseConfig(url=url, sqlite_performance=True)
+    return DataBaseService(config, DatabaseEngine.from_config(config).get_engine())
+
+
+def _seed(service, count, remind_offset_minutes=-1):
+    with service.session_scope() as session:
+        user = BaseCRUDService(session, Users).create(nickname="user1", name="Иван", surname="Иванов")
+        session.flush()
+        RemindersService(session).create_many([
+            {"user_id": user.id, "task_description": f"Задача {i}",
+             "event_date": NOW + timedelta(minutes=remind_offset_minutes + 10), "remind_before": 10}
+            for i in range(count)
+        ])
+
+
+def _dispatch_worker(url, worker_id, batch_size):
+    """Обработчик рассылки для запуска в отдельном процессе: арендует и подтверждает напоминания, пока они есть."""
+    service = _file_service(url)
+    dispatched = []
+    while True:
+        with service.session_scope() as session:
+            claimed = [reminder.id for reminder in
+                       RemindersService(session).claim_due(worker_id, NOW, limit=batch_size)]
+        if not claimed:
+            return dispatched
+        with service.session_scope() as session:
+            assert RemindersService(session).ack(worker_id, claimed, NOW) == len(claimed)
+        dispatched.extend(claimed)
+
+
+@pytest.fixture
+def file_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'claims.db'}"
+    TableManager(DatabaseEngine(url).get_engine()).create_tables()
+    return url
+
+
+class TestReminderClaims:
+
+    def test_claim_is_exclusive(self, file_url):
+        service = _file_service(file_url)
+        _seed(service, 5)
+
+        with service.session_scope() as session:
+            first = RemindersService(session).claim_due("worker-1", NOW, limit=3)
+            assert all(reminder.leased_by == "worker-1" for reminder in first)
+            first = [reminder.id for reminder in first]
+        with service.session_scope() as session:
+            second = [reminder.id for reminder in RemindersService(session).claim_due("worker-2", NOW, limit=10)]
+
+        assert len(first) == 3
+        assert len(second) == 2
+        assert not set(first) & set(second)
+
+    def test_future_reminders_are_not_claimed(self, file_url):
+        service = _file_service(file_url)
+        _seed(service, 3, remind_offset_minutes=5)
+
+        with service.session_scope() as session:
+            assert RemindersService(session).claim_due("worker-1", NOW) == []
+
+    def test_expired_lease_is_reclaimed(self, file_url):
+        service = _file_service(file_url)
+        _seed(service, 2)
+
+        with service.session_scope() as session:
+            RemindersService(session).claim_due("worker-1", NOW, lease_seconds=30)
+        with service.session_scope() as session:
+            service_2 = RemindersService(session)
+            assert service_2.claim_due("worker-2", NOW + timedelta(seconds=10)) == []
+            reclaimed = [reminder.id for reminder in service_2.claim_due("worker-2", NOW + timedelta(seconds=31))]
+        with service.session_scope() as session:
+            assert RemindersService(session).ack("worker-1", reclaimed, NOW) == 0
+            assert RemindersService(session).ack("worker-2", reclaimed, NOW) == 2
+
+    def test_ack_and_release(self, file_url):
+        service = _file_service(file_url)
+        _seed(service, 4)
+
+        with service.session_scope() as session:
+            reminders_service = RemindersService(session)
+            ids = [reminder.id for reminder in reminders_service.claim_due("worker-1", NOW)]
+            assert reminders_service.ack("worker-1", ids[:2], NOW) == 2
+            assert reminders_service.release("worker-1", ids[2:]) == 2
+            assert reminders_service.release("worker-1", []) == 0
+
+        with service.session_scope() as session:
+            reclaimed = [reminder.id for reminder in RemindersService(session).claim_due("worker-2", NOW)]
+            dispatched = [reminder.id for reminder in
+                          BaseCRUDService(session, Reminders).read(filters=[Reminders.dispatched_at == NOW])]
+        assert reclaimed == ids[2:]
+        assert sorted(dispatched) == ids[:2]
+
+    @pytest.mark.parametrize("limit, lease_seconds", [(0, 60), (10, 0)])
+    def test_invalid_arguments(self, db_session, limit, lease_seconds):
+        with pytest.raises(ValueError):
+            RemindersService(db_session).claim_due("worker-1", NOW, limit=limit, lease_seconds=lease_seconds)
+
+    def test_multiple_processes(self, file_url):
+        """Тест проверяет, что несколько процессов-обработчиков отправляют каждое напоминание ровно один раз."""
+        reminders_count, workers = 120, 4
+        _seed(_file_service(file_url), reminders_count)
+
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers) as pool:
+            results = pool.starmap(_dispatch_worker, [(file_url, f"worker-{i}", 10) for i in range(workers)])
+
+        dispatched = [reminder_id for result in results for reminder_id in result]
+        assert len(dispatched) == reminders_count
+        assert len(set(dispatched)) == reminders_count
@@ -0,0 +1,145 @@
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.data_base.model import Users, Reminders, RemindersArchive
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.service_model.reminders_archiver import RemindersArchiver
+from src.data_base.service_model.reminders_service import RemindersService
+from ..data.data_reminders import EVENT_DATE, parametrize_archive
+
+
+def _create_reminders(db_service, ages_days: list[int]) -> None:
+    with db_service.session_scope() as session:
+        user = BaseCRUDService(session, Users).create(nickname="user1", name="Иван", surname="Иванов")
+        session.flush()
+        RemindersService(session).create_many(
+            {"user_id": user.id, "task_description": f"Задача {age}", "event_date": EVENT_DATE - timedelta(days=age),
+             "remind_before": 15}
+            for age in ages_days)
+
+
+class TestRemindersArchiver:
+
+    @pytest.mark.parametrize("ages_days, retention_days, batch_size, expected_archived, expected_batches",
+                             parametrize_archive)
+    def test_run_once(self, file_db_service, ages_days, retention_days, batch_size, expected_archived,
+                      expected_batches):
+        """
+        Тест проверяет, что run_once переносит в архив все напоминания старше retention отдельными пачками,
+        сохраняя id и значения столбцов.
+        """
+        _create_reminders(file_db_service, ages_days)
+        with file_db_service.session_scope(commit=False) as session:
+            before = {row.id: tuple(row) for row in RemindersService(session).read(columns=["id", "task_description",
+                                                                                          "event_date", "remind_at"])}
+
+        deletes = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("DELETE"):
+                deletes.append(statement)
+
+        event.listen(file_db_service.engine, "before_cursor_execute", listener)
+        try:
+            archiver = RemindersArchiver(file_db_service, timedelta(days=retention_days), batch_size=batch_size)
+            archived = archiver.run_once(EVENT_DATE)
+        finally:
+            event.remove(file_db_service.engine, "before_cursor_execute", listener)
+
+        cutoff = EVENT_DATE - timedelta(days=retention_days)
+        with file_db_service.session_scope(commit=False) as session:
+            remaining = RemindersService(session).read(columns=["event_date"])
+            archive = BaseCRUDService(session, RemindersArchive).read(
+                columns=["id", "task_description", "event_date", "remind_at", "archived_at"])
+
+        assert archived == expected_archived == len(archive)
+        assert len(deletes) == expected_batches
+        assert all(row.event_date >= cutoff for row in remaining)
+        assert all(before[row.id] == tuple(row)[:4] and row.archived_at == EVENT_DATE for row in archive)
+
+    def test_background_thread(self, file_db_service):
+        _create_reminders(file_db_service, [0, 10, 20])
+        archiver = RemindersArchiver(file_db_service, timedelta(days=1), batch_size=1, interval=0.05,
+                                     clock=lambda: EVENT_DATE)
+        archiver.start()
+        try:
+            with pytest.raises(RuntimeError):
+                archiver.start()
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                with file_db_service.session_scope(commit=False) as session:
+                    if BaseCRUDService(session, RemindersArchive).count() == 2:
+                        break
+                time.sleep(0.02)
+        finally:
+            archiver.stop()
+
+        with file_db_service.session_scope(commit=False) as session:
+            assert RemindersService(session).count() == 1
+        assert archiver.run_once(EVENT_DATE) == 0
+
+    def test_ids_not_reused(self, file_db_service):
+        """
+        Тест проверяет, что напоминание, созданное после архивации напоминания с наибольшим id,
+        получает новый id и тоже архивируется.
+        """
+        _create_reminders(file_db_service, [10, 20])
+        archiver = RemindersArchiver(file_db_service, timedelta(days=1))
+        assert archiver.run_once(EVENT_DATE) == 2
+
+        with file_db_service.session_scope() as session:
+            RemindersService(session).create(user_id=1, task_description="Новая задача",
+                                             event_date=EVENT_DATE - timedelta(days=5), remind_before=15)
+        assert archiver.run_once(EVENT_DATE) == 1
+
+        with file_db_service.session_scope(commit=False) as session:
+            ids = [row.id for row in BaseCRUDService(session, RemindersArchive).read(columns=["id"])]
+        assert sorted(ids) == [1, 2, 3]
+
+    @pytest.mark.parametrize("kwargs", [
+        {"retention": timedelta(days=-1)},
+        {"batch_size": 0},
+        {"interval": 0},
+    ])
+    def test_invalid_arguments(self, file_db_service, kwargs):
+        with pytest.raises(ValueError):
+            RemindersArchiver(file_db_service, **{"retention": timedelta(days=1), **kwargs})
+
+
+class TestReadHistory:
+
+    @pytest.fixture
+    def archived(self, file_db_service):
+        _create_reminders(file_db_service, [0, 1, 5, 6])
+        RemindersArchiver(file_db_service, timedelta(days=3)).run_once(EVENT_DATE)
+        return file_db_service
+
+    def test_include_archived(self, archived):
+        with archived.session_scope(commit=False) as session:
+            service = RemindersService(session)
+            history = service.read_history(order_by=Reminders.event_date.desc(), shape="dict")
+            active = service.read_history(include_archived=False, order_by=Reminders.event_date.desc())
+
+        assert [(row["task_description"], row["archived"]) for row in history] == [
+            ("Задача 0", False), ("Задача 1", False), ("Задача 5", True), ("Задача 6", True)]
+        assert [row.task_description for row in active] == ["Задача 0", "Задача 1"]
+
+    def test_filters_apply_to_archive(self, archived):
+        with archived.session_scope(commit=False) as session:
+            rows = RemindersService(session).read_history(
+                filters=[Reminders.task_description.in_(["Задача 1", "Задача 6"]),
+                         Reminders.event_date < EVENT_DATE - timedelta(days=2)],
+                use_or=True, order_by="event_date", limit=2, offset=1)
+
+        assert [(row.task_description, row.archived) for row in rows] == [("Задача 5", True), ("Задача 1", False)]
+
+    def test_invalid_arguments(self, archived):
+        with archived.session_scope(commit=False) as session:
+            service = RemindersService(session)
+            with pytest.raises(ValueError):
+                service.read_history(shape="json")
+            with pytest.raises(TypeError):
+                service.read_history(filters="event_date")
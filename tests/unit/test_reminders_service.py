@@ -0,0 +1,195 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import text
+
+from src.data_base.model import Users, Reminders
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.service_model.reminders_service import RemindersService
+from ..data.data_reminders import EVENT_DATE, parametrize_update_remind_at, parametrize_fetch_due
+
+
+@pytest.fixture
+def setup_tables(table_manager):
+    table_manager.drop_tables()
+    table_manager.create_tables()
+
+
+@pytest.fixture
+def user_id(setup_tables, db_session):
+    user = BaseCRUDService(db_session, Users).create(nickname="user1", name="Иван", surname="Иванов")
+    db_session.flush()
+    return user.id
+
+
+class TestRemindAt:
+
+    def test_create(self, db_session, user_id):
+        reminder = RemindersService(db_session).create(user_id=user_id, task_description="Звонок",
+                                                       event_date=EVENT_DATE, remind_before=15)
+        db_session.flush()
+        assert reminder.remind_at == EVENT_DATE - timedelta(minutes=15)
+
+    def test_create_many(self, db_session, user_id):
+        service = RemindersService(db_session)
+        ids = service.create_many([
+            {"user_id": user_id, "task_description": f"Задача {i}", "event_date": EVENT_DATE, "remind_before": i}
+            for i in range(5)
+        ], batch_size=2, return_ids=True)
+
+        reminders = service.read(filters=[Reminders.id.in_(ids)], order_by=Reminders.id)
+        assert [reminder.remind_at for reminder in reminders] == [EVENT_DATE - timedelta(minutes=i) for i in range(5)]
+
+    def test_attribute_change(self, db_session, user_id):
+        reminder = RemindersService(db_session).create(user_id=user_id, task_description="Звонок",
+                                                       event_date=EVENT_DATE, remind_before=15)
+        db_session.flush()
+        reminder.remind_before = 45
+        db_session.flush()
+        db_session.expire(reminder)
+        assert reminder.remind_at == EVENT_DATE - timedelta(minutes=45)
+
+    @pytest.mark.parametrize("updates, expected_remind_at", parametrize_update_remind_at)
+    def test_update(self, db_session, user_id, updates, expected_remind_at):
+        service = RemindersService(db_session)
+        service.create_many([
+            {"user_id": user_id, "task_description": "Звонок", "event_date": EVENT_DATE, "remind_before": 60}
+            for _ in range(3)
+        ])
+
+        assert service.update([Reminders.user_id == user_id], updates) == 3
+        db_session.flush()
+        db_session.expire_all()
+
+        assert [reminder.remind_at for reminder in service.read()] == [expected_remind_at] * 3
+
+    def test_upsert_many(self, db_session, user_id):
+        service = RemindersService(db_session)
+        ids = service.create_many([
+            {"user_id": user_id, "task_description": "Звонок", "event_date": EVENT_DATE, "remind_before": 60}
+            for _ in range(2)
+        ], return_ids=True)
+
+        service.upsert_many([
+            {"id": ids[0], "user_id": user_id, "task_description": "Звонок", "event_date": EVENT_DATE,
+             "remind_before": 10},
+            {"id": ids[1] + 1, "user_id": user_id, "task_description": "Новое", "event_date": EVENT_DATE,
+             "remind_before": 20},
+        ])
+
+        rows = service.read(columns=["remind_before", "remind_at"], order_by=Reminders.id)
+        assert [tuple(row) for row in rows] == [(minutes, EVENT_DATE - timedelta(minutes=minutes))
+                                                for minutes in (10, 60, 20)]
+        with pytest.raises(ValueError):
+            service.upsert_many([{"id": ids[0], "remind_before": 5}], update_columns=["remind_before"])
+
+    def test_update_with_sql_expression(self, db_session, user_id):
+        with pytest.raises(TypeError):
+            RemindersService(db_session).update([Reminders.user_id == user_id],
+                                                {"remind_before": Reminders.remind_before + 5})
+
+
+class TestFetchDue:
+
+    @pytest.mark.parametrize("offsets, limit, expected_offsets", parametrize_fetch_due)
+    def test_fetch_due(self, db_session, user_id, offsets, limit, expected_offsets):
+        """
+        Тест проверяет, что fetch_due возвращает наступившие напоминания от самых ранних с учётом limit.
+
+        :param offsets: Смещения remind_at созданных напоминаний от now в минутах.
+        :param limit: Максимальное количество напоминаний.
+        :param expected_offsets: Ожидаемые смещения возвращённых напоминаний.
+        """
+        service = RemindersService(db_session)
+        service.create_many([
+            {"user_id": user_id, "task_description": f"Задача {offset}",
+             "event_date": EVENT_DATE + timedelta(minutes=offset + 10), "remind_before": 10}
+            for offset in offsets
+        ])
+
+        due = service.fetch_due(EVENT_DATE, limit=limit)
+
+        assert [reminder.remind_at for reminder in due] == [
+            EVENT_DATE + timedelta(minutes=offset) for offset in expected_offsets
+        ]
+
+    def test_skips_dispatched(self, db_session, user_id):
+        service = RemindersService(db_session)
+        service.create_many([
+            {"user_id": user_id, "task_description": f"Задача {i}", "event_date": EVENT_DATE, "remind_before": 10}
+            for i in range(3)
+        ])
+        dispatched = service.fetch_due(EVENT_DATE, limit=1)[0]
+        dispatched.dispatched_at = EVENT_DATE
+        db_session.flush()
+
+        assert [reminder.id for reminder in service.fetch_due(EVENT_DATE)] == [
+            reminder.id for reminder in service.read(order_by=Reminders.id) if reminder is not dispatched]
+
+    def test_cursor(self, db_session, user_id):
+        """Тест проверяет, что курсор (remind_at, id) листает наступившие напоминания без повторов и пропусков."""
+        service = RemindersService(db_session)
+        service.create_many([
+            {"user_id": user_id, "task_description": f"Задача {i}",
+             "event_date": EVENT_DATE + timedelta(minutes=i // 2), "remind_before": 10}
+            for i in range(5)
+        ])
+        expected = [reminder.id for reminder in service.fetch_due(EVENT_DATE, limit=10)]
+
+        pages, after = [], None
+        while page := service.fetch_due(EVENT_DATE, limit=2, after=after):
+            pages.append([reminder.id for reminder in page])
+            after = page[-1].remind_at, page[-1].id
+
+        assert len(expected) == 5
+        assert pages == [expected[:2], expected[2:4], expected[4:]]
+
+    def test_uses_index(self, db_session, user_id):
+        plan = db_session.execute(text("EXPLAIN QUERY PLAN SELECT * FROM reminders WHERE remind_at <= :now "
+                                       "AND dispatched_at IS NULL ORDER BY remind_at, id LIMIT 10"),
+                                  {"now": EVENT_DATE}).all()
+        details = [row[-1] for row in plan]
+
+        assert details == ["SEARCH reminders USING INDEX ix_reminders_pending_remind_at (remind_at<?)"]
+
+    def test_invalid_limit(self, db_session, user_id):
+        with pytest.raises(ValueError):
+            RemindersService(db_session).fetch_due(EVENT_DATE, limit=0)
+
+
+class TestCounts:
+
+    @pytest.fixture
+    def user_ids(self, user_id, db_session):
+        other = BaseCRUDService(db_session, Users).create(nickname="user2", name="Пётр", surname="Петров")
+        db_session.flush()
+        # user_id: 3 напоминания в первый день и 1 во второй, other: 2 во второй день.
+        hours = {user_id: [0, 5, 23, 24], other.id: [30, 47]}
+        RemindersService(db_session).create_many(
+            {"user_id": owner, "task_description": "Задача", "event_date": EVENT_DATE.replace(hour=0) + timedelta(hours=h),
+             "remind_before": 10}
+            for owner, offsets in hours.items() for h in offsets)
+        return user_id, other.id
+
+    def test_count_by_user(self, db_session, user_ids):
+        first, second = user_ids
+        service = RemindersService(db_session)
+
+        assert service.count_by_user() == {first: 4, second: 2}
+        assert service.count_by_user([second, 999]) == {second: 2}
+        assert service.count(filters=[Reminders.user_id == first]) == 4
+        assert service.exists(filters=[Reminders.user_id == 999]) is False
+
+    def test_count_by_day(self, db_session, user_ids):
+        first, _ = user_ids
+        service = RemindersService(db_session)
+        day = EVENT_DATE.date()
+
+        assert service.count_by_day(EVENT_DATE.replace(hour=0), EVENT_DATE.replace(hour=0) + timedelta(days=3)) \
+               == {day: 3, day + timedelta(days=1): 3}
+        assert service.count_by_day(EVENT_DATE.replace(hour=0), EVENT_DATE.replace(hour=0) + timedelta(days=1),
+                                    user_id=first) == {day: 3}
+
+    def test_count_by_day_invalid_range(self, db_session, user_id):
+        with pytest.raises(ValueError):
+            RemindersService(db_session).count_by_day(EVENT_DATE, EVENT_DATE)
@@ -0,0 +1,88 @@
+from collections import Counter
+
+import pytest
+
+from src.data_base.configuration.config import DataBaseConfig
+from src.data_base.data_base_service import DataBaseService
+from src.data_base.engine import DatabaseEngine
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+from src.data_base.table_manager import TableManager
+
+
+def _database(tmp_path, name):
+    """Создаёт файловую SQLite с таблицами и пользователем-меткой, по которому видно, какая база ответила."""
+    url = f"sqlite:///{tmp_path / name}.db"
+    engine = DatabaseEngine(url).get_engine()
+    TableManager(engine).create_tables()
+    with DataBaseService(DataBaseConfig(url=url), engine).session_scope() as session:
+        BaseCRUDService(session, Users).create(nickname=name, name="Иван", surname="Иванов")
+    return url
+
+
+def _served_by(service, read_only=True):
+    with service.session_scope(commit=False, read_only=read_only) as session:
+        return BaseCRUDService(session, Users).read()[0].nickname
+
+
+@pytest.fixture
+def primary_url(tmp_path):
+    return _database(tmp_path, "primary")
+
+
+@pytest.fixture
+def replica_urls(tmp_path):
+    return [_database(tmp_path, "replica1"), _database(tmp_path, "replica2")]
+
+
+class TestReplicaRouting:
+
+    def test_round_robin(self, primary_url, replica_urls):
+        config = DataBaseConfig(url=primary_url, replica_urls=replica_urls)
+        service = DataBaseService(config, DatabaseEngine(primary_url).get_engine())
+
+        served = [_served_by(service) for _ in range(6)]
+
+        assert Counter(served) == {"replica1": 3, "replica2": 3}
+        assert served[0] != served[1]
+
+    def test_writes_and_default_scope_use_primary(self, primary_url, replica_urls):
+        config = DataBaseConfig(url=primary_url, replica_urls=replica_urls)
+        service = DataBaseService(config, DatabaseEngine(primary_url).get_engine())
+
+        assert _served_by(service, read_only=False) == "primary"
+
+    def test_least_busy(self, primary_url, replica_urls):
+        config = DataBaseConfig(url=primary_url, replica_urls=replica_urls, replica_strategy="least_busy")
+        service = DataBaseService(config, DatabaseEngine(primary_url).get_engine())
+
+        with service.read_scope() as session:
+            busy = BaseCRUDService(session, Users).read()[0].nickname
+            assert all(_served_by(service) != busy for _ in range(3))
+
+    def test_unhealthy_replica_is_skipped(self, tmp_path, primary_url, replica_urls):
+        missing_url = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+        config = DataBaseConfig(url=primary_url, replica_urls=[missing_url, replica_urls[0]])
+        service = DataBaseService(config, DatabaseEngine(primary_url).get_engine())
+
+        assert {_served_by(service) for _ in range(4)} == {"replica1"}
+        assert service.replica_router.healthy_replicas() == service.replica_router.replicas[1:]
+
+    def test_fallback_to_primary(self, tmp_path, primary_url):
+        missing_url = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+        config = DataBaseConfig(url=primary_url, replica_urls=[missing_url])
+        service = DataBaseService(config, DatabaseEngine(primary_url).get_engine())
+
+        assert _served_by(service) == "primary"
+
+    def test_replica_returns_after_retry_interval(self, primary_url, replica_urls):
+        config = DataBaseConfig(url=primary_url, replica_urls=replica_urls[:1], replica_retry_interval=0)
+        service = DataBaseService(config, DatabaseEngine(primary_url).get_engine())
+        service.replica_router.mark_unhealthy(service.replica_router.replicas[0])
+
+        assert _served_by(service) == "replica1"
+
+    def test_unknown_strategy(self, primary_url):
+        config = DataBaseConfig(url=primary_url, replica_strategy="random")
+        with pytest.raises(RuntimeError):
+            DataBaseService(config, DatabaseEngine(primary_url).get_engine())
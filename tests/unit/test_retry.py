@@ -0,0 +1,152 @@
+import random
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, IntegrityError
+
+from src.data_base.configuration.config import DataBaseConfig
+from src.data_base.model import Users
+from src.data_base.retry import RetryPolicy, is_retryable
+from src.data_base.service_model.base_service import BaseCRUDService
+
+
+class PostgresError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def _locked():
+    return OperationalError("INSERT INTO users ...", {}, sqlite3.OperationalError("database is locked"))
+
+
+@pytest.fixture
+def file_db_config(tmp_path):
+    """Файловая SQLite с коротким busy_timeout, чтобы блокировка сразу давала "database is locked"."""
+    return DataBaseConfig(url=f"sqlite:///{tmp_path / 'retry.db'}", sqlite_busy_timeout=1,
+                          retry_max_attempts=50, retry_base_delay=0.005, retry_max_delay=0.02)
+
+
+class TestRetryPolicy:
+
+    def test_delay(self):
+        policy = RetryPolicy(base_delay=0.01, max_delay=0.05, multiplier=2, jitter=False)
+        assert [policy.delay(retry) for retry in range(1, 6)] == pytest.approx([0.01, 0.02, 0.04, 0.05, 0.05])
+
+    def test_jitter(self):
+        policy = RetryPolicy(base_delay=0.01, max_delay=1, multiplier=2)
+        rng = random.Random(0)
+        delays = [policy.delay(3, rng) for _ in range(100)]
+        assert all(0 <= delay <= 0.04 for delay in delays)
+        assert len(set(delays)) == 100
+
+    def test_from_config(self):
+        config = DataBaseConfig(url="sqlite:///:memory:", retry_max_attempts=3, retry_jitter=False)
+        assert RetryPolicy.from_config(config) == RetryPolicy(max_attempts=3, jitter=False)
+
+    @pytest.mark.parametrize("kwargs", [{"max_attempts": 0}, {"base_delay": -1}, {"max_delay": -1},
+                                        {"multiplier": 0.5}])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            RetryPolicy(**kwargs)
+
+
+class TestIsRetryable:
+
+    @pytest.mark.parametrize("exception, dialect_name, expected", [
+        (_locked(), "sqlite", True),
+        (OperationalError("", {}, sqlite3.OperationalError("no such table: users")), "sqlite", False),
+        (IntegrityError("", {}, sqlite3.IntegrityError("UNIQUE constraint failed")), "sqlite", False),
+        (OperationalError("", {}, PostgresError("40001")), "postgresql", True),
+        (OperationalError("", {}, PostgresError("40P01")), "postgresql", True),
+        (IntegrityError("", {}, PostgresError("23505")), "postgresql", False),
+        (_locked(), "mysql", False),
+        (sqlite3.OperationalError("database is locked"), "sqlite", False),
+    ])
+    def test_classification(self, exception, dialect_name, expected):
+        assert is_retryable(exception, dialect_name) is expected
+
+    def test_sqlite_error_code(self, tmp_path):
+        """Тест проверяет классификацию настоящей ошибки SQLITE_BUSY по коду, а не по тексту."""
+        path = str(tmp_path / "busy.db")
+        holder = sqlite3.connect(path)
+        holder.execute("CREATE TABLE t (a)")
+        holder.commit()
+        holder.execute("BEGIN IMMEDIATE")
+        with pytest.raises(sqlite3.OperationalError) as error:
+            sqlite3.connect(path, timeout=0).execute("INSERT INTO t VALUES (1)")
+        holder.rollback()
+
+        assert error.value.sqlite_errorname == "SQLITE_BUSY"
+        assert is_retryable(OperationalError("", {}, error.value), "sqlite")
+
+
+class TestRunInTransaction:
+
+    def test_retries_until_success(self, db_service):
+        attempts = []
+        before = db_service.retry_stats()
+
+        def work(session):
+            attempts.append(session)
+            if len(attempts) < 3:
+                raise _locked()
+            return "ok"
+
+        assert db_service.run_in_transaction(work, RetryPolicy(base_delay=0)) == "ok"
+        assert len(set(map(id, attempts))) == 3
+        after = db_service.retry_stats()
+        assert after["transactions"] - before["transactions"] == 1
+        assert after["retries"] - before["retries"] == 2
+
+    @pytest.mark.parametrize("error, expected_attempts, expected_exhausted", [
+        (_locked(), 3, 1),
+        (IntegrityError("", {}, sqlite3.IntegrityError("UNIQUE constraint failed")), 1, 0),
+        (ValueError("ошибка"), 1, 0),
+    ])
+    def test_gives_up(self, db_service, error, expected_attempts, expected_exhausted):
+        attempts = []
+        before = db_service.retry_stats()
+
+        def work(session):
+            attempts.append(session)
+            raise error
+
+        with pytest.raises(type(error)):
+            db_service.run_in_transaction(work, RetryPolicy(max_attempts=3, base_delay=0))
+        assert len(attempts) == expected_attempts
+        assert db_service.retry_stats()["exhausted"] - before["exhausted"] == expected_exhausted
+
+    def test_lock_conflict(self, file_db_service):
+        """
+        Тест проверяет, что транзакция, упёршаяся в блокировку записи другой транзакцией, повторяется
+        и фиксируется после её снятия, причём изменения неудачных попыток не дублируются.
+        """
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with file_db_service.engine.connect() as connection:
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+                locked.set()
+                release.wait()
+                connection.exec_driver_sql("ROLLBACK")
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait()
+        threading.Timer(0.1, release.set).start()
+
+        def work(session):
+            BaseCRUDService(session, Users).create(nickname="user0", name="Иван", surname="Иванов")
+            session.flush()
+            return session.execute(text("SELECT count(*) FROM users")).scalar()
+
+        assert file_db_service.run_in_transaction(work) == 1
+        holder.join()
+
+        assert file_db_service.retry_stats()["retries"] > 0
+        with file_db_service.session_scope(commit=False) as session:
+            assert BaseCRUDService(session, Users).count() == 1
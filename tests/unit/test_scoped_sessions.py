@@ -0,0 +1,126 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.data_base.configuration.config import DataBaseConfig
+from src.data_base.model import Users
+from src.data_base.service_model.base_service import BaseCRUDService
+
+
+@pytest.fixture
+def file_db_config(tmp_path):
+    """Файловая SQLite с ожиданием блокировки: сессии потоков пишут в базу одновременно."""
+    return DataBaseConfig(url=f"sqlite:///{tmp_path / 'scoped.db'}", sqlite_busy_timeout=30000)
+
+
+def _count_users(db_service):
+    with db_service.session_scope(commit=False) as session:
+        return BaseCRUDService(session, Users).count()
+
+
+class TestScopedSessions:
+
+    def test_thread_pool(self, file_db_service):
+        """
+        Тест нагружает BaseCRUDService из пула потоков: внутри запроса все обращения получают одну сессию,
+        и сессия никогда не используется двумя потоками одновременно.
+        """
+        owners = {}
+        lock = threading.Lock()
+
+        def handle_request(i):
+            with file_db_service.request_scope() as session:
+                with lock:
+                    assert owners.setdefault(id(session), threading.get_ident()) == threading.get_ident()
+                crud = BaseCRUDService(file_db_service.current_session(), Users)
+                crud.create(nickname=f"user{i}", name="Иван", surname="Иванов")
+                file_db_service.current_session().flush()
+                assert file_db_service.current_session() is session
+                assert crud.exists([Users.nickname == f"user{i}"])
+                with lock:
+                    del owners[id(session)]
+            return id(session)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(handle_request, range(200)))
+
+        assert owners == {}
+        assert _count_users(file_db_service) == 200
+
+    def test_sessions_per_thread(self, file_db_service):
+        barrier = threading.Barrier(4)
+
+        def session_of_thread(_):
+            session = file_db_service.current_session()
+            barrier.wait()
+            assert file_db_service.current_session() is session
+            file_db_service.end_request()
+            return session
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = list(executor.map(session_of_thread, range(4)))
+
+        assert len(set(map(id, sessions))) == 4
+
+    def test_end_request(self, file_db_service):
+        """Тест проверяет, что end_request фиксирует успешный запрос, откатывает неудачный и удаляет сессию."""
+        session = file_db_service.begin_request()
+        BaseCRUDService(session, Users).create(nickname="user0", name="Иван", surname="Иванов")
+        file_db_service.end_request()
+        assert file_db_service.current_session() is not session
+
+        BaseCRUDService(file_db_service.current_session(), Users).create(nickname="user1", name="Иван",
+                                                                         surname="Иванов")
+        file_db_service.end_request(ValueError("ошибка обработчика"))
+
+        with pytest.raises(ValueError):
+            with file_db_service.request_scope():
+                BaseCRUDService(file_db_service.current_session(), Users).create(
+                    nickname="user2", name="Иван", surname="Иванов")
+                raise ValueError("ошибка обработчика")
+
+        assert _count_users(file_db_service) == 1
+        file_db_service.end_request()
+        file_db_service.end_request()
+
+    def test_failed_commit_removes_session(self, file_db_service):
+        with file_db_service.request_scope():
+            BaseCRUDService(file_db_service.current_session(), Users).create(nickname="user0", name="Иван",
+                                                                             surname="Иванов")
+
+        session = file_db_service.begin_request()
+        BaseCRUDService(session, Users).create(nickname="user0", name="Иван", surname="Иванов")
+        with pytest.raises(Exception):
+            file_db_service.end_request()
+
+        assert not file_db_service.scoped_session.registry.has()
+        assert _count_users(file_db_service) == 1
+
+    def test_begin_request_discards_leftover(self, file_db_service):
+        leftover = file_db_service.current_session()
+        BaseCRUDService(leftover, Users).create(nickname="user0", name="Иван", surname="Иванов")
+
+        with file_db_service.request_scope(commit=True) as session:
+            assert session is not leftover
+
+        assert _count_users(file_db_service) == 0
+
+    def test_scopefunc(self, make_file_db_service):
+        """Тест проверяет, что scopefunc задаёт область сессии: разные запросы одного потока получают разные сессии."""
+        request_id = contextvars.ContextVar("request_id", default=None)
+        db_service = make_file_db_service(scopefunc=request_id.get)
+
+        request_id.set(1)
+        first = db_service.current_session()
+        request_id.set(2)
+        second = db_service.current_session()
+        request_id.set(1)
+
+        assert first is not second
+        assert db_service.current_session() is first
+        db_service.end_request()
+        request_id.set(2)
+        db_service.end_request()
+        assert not db_service.scoped_session.registry.has()
@@ -0,0 +1,236 @@
+import time
+
+import pytest
+from sqlalchemy import event
+
+from src.data_base.model import Users, Reminders
+from src.data_base.service_model.entity_cache import EntityCache
+from src.data_base.service_model.users_service import UsersService
+
+
+def _create_users(db_service, count):
+    with db_service.session_scope() as session:
+        UsersService(session).create_many(
+            [{"nickname": f"user{i}", "name": "Иван", "surname": "Иванов"} for i in range(count)])
+
+
+def _names(db_service, entity_cache, user_ids):
+    with db_service.session_scope(commit=False) as session:
+        users = UsersService(session, entity_cache=entity_cache).get_many(user_ids)
+        return {user_id: user.name for user_id, user in users.items()}
+
+
+@pytest.mark.usefixtures("setup_users_table")
+class TestUsersEntityCache:
+
+    def test_hit_skips_database(self, db_service, statements):
+        cache = EntityCache(Users)
+        _create_users(db_service, 2)
+
+        with db_service.session_scope(commit=False) as session:
+            user = UsersService(session, entity_cache=cache).get(1)
+        statements.clear()
+        with db_service.session_scope(commit=False) as session:
+            service = UsersService(session, entity_cache=cache)
+            by_id = service.get(1)
+            by_nickname = service.get_by_nickname("user0")
+
+            assert by_id is by_nickname
+            assert by_id in session
+            assert (by_id.id, by_id.nickname) == (user.id, user.nickname)
+        assert statements == []
+        assert cache.stats()["hits"] == 2
+
+    def test_misses_batched(self, db_service, statements):
+        """Тест проверяет, что промахи пакетного поиска загружаются одним запросом IN, а отсутствующие пропускаются."""
+        cache = EntityCache(Users)
+        _create_users(db_service, 5)
+        with db_service.session_scope(commit=False) as session:
+            UsersService(session, entity_cache=cache).get_many_by_nickname(["user0", "user1"])
+        statements.clear()
+
+        with db_service.session_scope(commit=False) as session:
+            users = UsersService(session, entity_cache=cache).get_many_by_nickname(
+                ["user0", "user1", "user2", "user3", "user2", "missing"])
+
+        assert sorted(users) == ["user0", "user1", "user2", "user3"]
+        assert all(user.nickname == nickname for nickname, user in users.items())
+        assert len(statements) == 1 and " IN " in statements[0]
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (2, 5, 4)
+        assert stats["hit_rate"] == pytest.approx(2 / 7)
+
+    def test_chunks(self, db_service, statements):
+        _create_users(db_service, 5)
+        statements.clear()
+
+        with db_service.session_scope(commit=False) as session:
+            users = UsersService(session).get_many(range(1, 7), chunk_size=2)
+
+        assert sorted(users) == [1, 2, 3, 4, 5]
+        assert len(statements) == 3
+
+    @pytest.mark.parametrize("write", [
+        lambda service: service.update([Users.nickname == "user0"], {"name": "Пётр"}),
+        lambda service: service.update_by_ids([1], {"name": "Пётр"}),
+        lambda service: service.upsert(nickname="user0", name="Пётр", surname="Иванов"),
+        lambda service: service.upsert_many([{"nickname": "user0", "name": "Пётр", "surname": "Иванов"}]),
+        lambda service: service.upsert(id=1, nickname="user0", name="Пётр", surname="Иванов",
+                                       conflict_target=["id"]),
+        lambda service: service.delete(nickname="user0"),
+        lambda service: service.delete_by_ids(iter([1])),
+    ])
+    def test_writes_invalidate(self, file_db_service, write):
+        """
+        Тест проверяет, что изменение через сервис сбрасывает запись кэша, в том числе закэшированную
+        другой сессией до commit.
+        """
+        db_service = file_db_service
+        cache = EntityCache(Users)
+        _create_users(db_service, 2)
+        before = _names(db_service, cache, [1, 2])
+
+        with db_service.session_scope() as session:
+            write(UsersService(session, entity_cache=cache))
+            assert _names(db_service, cache, [1, 2]) == before
+
+        after = _names(db_service, cache, [1, 2])
+        assert after != before
+        assert after.get(2) == before[2]
+        with db_service.session_scope(commit=False) as session:
+            assert after == {user.id: user.name for user in session.query(Users).filter(Users.id.in_([1, 2]))}
+
+    def test_nickname_change(self, db_service):
+        cache = EntityCache(Users)
+        _create_users(db_service, 1)
+        _names(db_service, cache, [1])
+
+        with db_service.session_scope() as session:
+            UsersService(session, entity_cache=cache).update([Users.id == 1], {"nickname": "renamed"})
+
+        with db_service.session_scope(commit=False) as session:
+            service = UsersService(session, entity_cache=cache)
+            assert service.get_by_nickname("user0") is None
+            assert service.get_by_nickname("renamed").id == 1
+
+    def test_object_changes_invalidate(self, file_db_service):
+        """Тест проверяет, что commit изменённого или удалённого объекта пользователя сбрасывает записи кэша."""
+        db_service = file_db_service
+        cache = EntityCache(Users)
+        _create_users(db_service, 2)
+        _names(db_service, cache, [1, 2])
+
+        with db_service.session_scope() as session:
+            service = UsersService(session, entity_cache=cache)
+            user = service.get_by_nickname("user0")
+            user.name, user.nickname = "Пётр", "renamed"
+            session.delete(service.get(2))
+
+        with db_service.session_scope(commit=False) as session:
+            service = UsersService(session, entity_cache=cache)
+            assert service.get(1).name == "Пётр"
+            assert service.get_by_nickname("user0") is None
+            assert service.get_by_nickname("renamed").id == 1
+            assert service.get(2) is None
+
+    def test_lookup_keyed_by_database_value(self, db_service):
+        """
+        Тест проверяет, что пользователь, чей объект в сессии отличается от базы, находится по значению в базе,
+        а его несохранённое состояние не попадает в кэш.
+        """
+        cache = EntityCache(Users)
+        _create_users(db_service, 1)
+
+        with db_service.session_scope(commit=False) as session:
+            service = UsersService(session, entity_cache=cache)
+            user = service.get(1)
+            user.nickname = "renamed"
+            cache.clear()
+
+            assert service.get_by_nickname("user0") is user
+            assert cache.stats()["size"] == 0
+
+    @pytest.mark.parametrize("key, value", [("id", 1), ("nickname", "user0")])
+    def test_invalidated_during_query_not_cached(self, db_service, db_engine, statements, key, value):
+        """
+        Тест проверяет, что снимок, прочитанный до сброса записи другой сессией, не сохраняется в кэш
+        и следующий поиск идёт в базу.
+        """
+        cache = EntityCache(Users)
+        _create_users(db_service, 1)
+
+        def invalidate(conn, cursor, statement, parameters, context, executemany):
+            cache.invalidate(key, [value])
+
+        event.listen(db_engine, "after_cursor_execute", invalidate)
+        try:
+            _names(db_service, cache, [1])
+        finally:
+            event.remove(db_engine, "after_cursor_execute", invalidate)
+        statements.clear()
+
+        assert _names(db_service, cache, [1]) == {1: "Иван"}
+        assert cache.stats()["size"] == 1
+        assert len(statements) == 1
+        assert _names(db_service, cache, [1]) == {1: "Иван"}
+        assert len(statements) == 1
+
+    def test_stale_put_with_forgotten_invalidations(self):
+        """Тест проверяет, что снимок отбрасывается и после того, как его сброс вытеснен более новыми."""
+        cache = EntityCache(Users, maxsize=1)
+        snapshot = {"id": 1, "nickname": "user0", "name": "Иван", "surname": "Иванов"}
+        generation = cache.generation()
+        cache.invalidate("id", [1])
+        cache.invalidate("id", [2])
+
+        assert cache.put(snapshot, generation) is False
+        assert cache.put(snapshot, cache.generation()) is True
+
+    def test_own_writes_bypass_cache(self, db_service):
+        """Тест проверяет, что после изменения через сервис сессия до commit читает пользователей из базы."""
+        cache = EntityCache(Users)
+        _create_users(db_service, 2)
+        _names(db_service, cache, [1, 2])
+
+        with db_service.session_scope() as session:
+            service = UsersService(session, entity_cache=cache)
+            service.update_by_ids([1], {"name": "Пётр"}, synchronize_session=False)
+            assert service.get(2).name == "Иван"
+            assert cache.stats()["hits"] == 0
+            assert cache.stats()["size"] == 1
+
+    def test_lru_eviction(self, db_service):
+        cache = EntityCache(Users, maxsize=2)
+        _create_users(db_service, 3)
+
+        for user_id in (1, 2, 1, 3):
+            _names(db_service, cache, [user_id])
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["evictions"], stats["size"]) == (1, 1, 2)
+        with db_service.session_scope(commit=False) as session:
+            UsersService(session, entity_cache=cache).get_by_nickname("user0")
+        assert cache.stats()["hits"] == 2
+
+    def test_ttl(self, db_service):
+        cache = EntityCache(Users, ttl=0.01)
+        _create_users(db_service, 1)
+
+        _names(db_service, cache, [1])
+        time.sleep(0.02)
+        _names(db_service, cache, [1])
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (0, 2, 1)
+
+    @pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"ttl": 0}])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            EntityCache(Users, **kwargs)
+
+    def test_cache_of_other_model(self, db_service):
+        with db_service.session_scope(commit=False) as session:
+            with pytest.raises(ValueError):
+                UsersService(session, entity_cache=EntityCache(Reminders))
+            with pytest.raises(ValueError):
+                UsersService(session).get_many([1], chunk_size=0)